@@ -1,13 +1,30 @@
 import os
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# "async" serves the contest routes from an AsyncSession on asyncpg (or
+# aiosqlite for a SQLite URL) instead of blocking sessions on the threadpool
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync")
+# Connections each engine keeps open, and how many more it may open under load
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
 
-engine = create_engine(DATABASE_URL)
+
+def _pool_args(url: str) -> dict:
+    url = make_url(url)
+    # In-memory SQLite gets a pool that takes no sizing arguments
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {"pool_size": DATABASE_POOL_SIZE, "max_overflow": DATABASE_MAX_OVERFLOW}
+
+
+engine = create_engine(DATABASE_URL, **_pool_args(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -18,3 +35,44 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _async_url(url: str):
+    """DATABASE_URL for the async driver, and the connect_args it needs."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite"), {}
+    # asyncpg takes TLS as ``ssl`` and rejects libpq-only query parameters
+    # such as the sslmode/channel_binding in Neon connection strings
+    connect_args = {}
+    if "sslmode" in url.query:
+        connect_args["ssl"] = url.query["sslmode"]
+    url = url.difference_update_query(["sslmode", "channel_binding"])
+    return url.set(drivername="postgresql+asyncpg"), connect_args
+
+
+# The sync engine above still serves migrations, the other routers and the
+# background workers; this one only exists in async mode, so sync
+# deployments don't need the async drivers installed
+async_engine = None
+AsyncSessionLocal = None
+if DATABASE_MODE == "async":
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _url, _connect_args = _async_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        _url, connect_args=_connect_args, **_pool_args(DATABASE_URL)
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def dialect_insert(db: Session):
+    """The ``insert`` construct with ON CONFLICT support for the session's database."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
@@ -1,16 +1,46 @@
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 
-from app.database import Base, engine
-from app.middleware import AuthMiddleware
-from app.routers import auth, contests
+from app import metrics
+from app.database import DATABASE_MODE, Base, SessionLocal, async_engine, engine
+from app.middleware import AuthMiddleware, MetricsMiddleware
+from app.migrations import run_migrations
+from app.routers import admin, auth, contests, contests_async, problems
+from app.services.contest_generator import CATALOG_WATCH_INTERVAL, contest_generator
+from app.services.llm_cache import LLMCache
+from app.services.reflections import reflection_pipeline
+from app.services.reward_jobs import reward_queue
 
 Base.metadata.create_all(bind=engine)
+# Indexes, constraints and fixes for tables create_all won't alter
+run_migrations(engine)
 
-app = FastAPI(title="Circle of Inevitability API")
+# Share cached LLM titles/traits across workers and restarts
+contest_generator.llm_cache = LLMCache(session_factory=SessionLocal)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the sampling/search indexes up front rather than on the first
+    # request, and pick up a regenerated catalog without restarting the worker
+    contest_generator.holder.warm_in_background()
+    contest_generator.holder.start_watching(CATALOG_WATCH_INTERVAL)
+    contest_generator.prefill_pools()
+    # Reward jobs accepted by a previous process that never finished
+    reward_queue.resume_pending()
+    yield
+    contest_generator.holder.stop_watching()
+    reward_queue.shutdown()
+    reflection_pipeline.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+app = FastAPI(title="Circle of Inevitability API", lifespan=lifespan)
 
 # CORS middleware - must be added before AuthMiddleware
 # Build origins list from environment variable + local development URLs
@@ -39,9 +69,14 @@ app.add_middleware(
 )
 
 app.add_middleware(AuthMiddleware)
+# Outermost, so request latency includes auth
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router)
-app.include_router(contests.router)
+# Same routes either way; async mode serves them from an AsyncSession
+app.include_router(contests_async.router if DATABASE_MODE == "async" else contests.router)
+app.include_router(problems.router)
+app.include_router(admin.router)
 
 
 @app.get("/auth", response_class=HTMLResponse)
@@ -292,3 +327,14 @@ def auth_page():
 @app.get("/")
 def root():
     return {"message": "Welcome to Circle of Inevitability API"}
+
+
+# Gated on the admin token like /api/admin (send it as X-Admin-Token, e.g.
+# from the scrape config's http_headers); disabled when ADMIN_TOKEN is unset
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(admin.require_admin)],
+)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,8 +1,17 @@
+import time
+
 from fastapi import Request
 from fastapi.responses import JSONResponse, RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.auth import verify_token
+from app.metrics import Histogram
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "Request latency, including middleware, by route template",
+    ["method", "route", "status"],
+)
 
 
 class AuthMiddleware(BaseHTTPMiddleware):
@@ -15,6 +24,8 @@ class AuthMiddleware(BaseHTTPMiddleware):
             "/docs",
             "/openapi.json",
             "/redoc",
+            "/api/admin",  # token-checked by the admin router
+            "/metrics",  # token-checked like the admin router
         ]
 
     async def dispatch(self, request: Request, call_next):
@@ -55,3 +66,20 @@ class AuthMiddleware(BaseHTTPMiddleware):
 
         request.state.user_id = payload.get("sub")
         return await call_next(request)
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Records request latency per route template for /metrics."""
+
+    async def dispatch(self, request: Request, call_next):
+        t0 = time.perf_counter()
+        response = await call_next(request)
+        # The route template, not the raw path, to keep label cardinality bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - t0,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(response.status_code),
+        )
+        return response
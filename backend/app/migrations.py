@@ -0,0 +1,189 @@
+"""
+Schema migrations.
+
+``Base.metadata.create_all`` creates missing tables but never touches
+existing ones, so indexes, constraints and data fixes for tables that
+already hold data live here. Each migration runs once per database, in
+version order, in its own transaction, and is recorded in
+schema_migrations. Migrations are written to be safe on a database
+create_all has just built from the current models (``IF NOT EXISTS``), so
+fresh and long-lived databases end up with the same schema.
+
+To add one, write a function taking a Connection and append it to
+MIGRATIONS with the next version number. Never renumber or edit a
+migration that has shipped.
+"""
+
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models import SchemaMigration
+from app.services.user_stats import rebuild_user_stats, user_id_batches
+
+# Arbitrary key for the PostgreSQL advisory lock that stops two workers
+# starting at once from running the same migration
+MIGRATION_LOCK_KEY = 4_120_017
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _merge_duplicates(
+    conn: Connection, table: str, key: str, sums: List[str], maxes: List[str]
+) -> None:
+    """Fold rows sharing ``key`` into the oldest one so it can be made unique."""
+    group = " AND ".join(f"d.{col} = {table}.{col}" for col in key.split(", "))
+    assignments = [
+        f"{col} = (SELECT SUM(COALESCE(d.{col}, 0)) FROM {table} d WHERE {group})"
+        for col in sums
+    ] + [f"{col} = (SELECT MAX(d.{col}) FROM {table} d WHERE {group})" for col in maxes]
+    conn.execute(text(
+        f"UPDATE {table} SET {', '.join(assignments)} WHERE id IN "
+        f"(SELECT MIN(id) FROM {table} GROUP BY {key} HAVING COUNT(*) > 1)"
+    ))
+    conn.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {key})"
+    ))
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    # Active-contest lookups and history/list queries
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contests_user_id_status "
+        "ON contests (user_id, status)"
+    ))
+    # Loading a contest's problems, and mark-solved's (contest, problem) lookup
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contest_problems_contest_id_problem_id "
+        "ON contest_problems (contest_id, problem_id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_weak_topics_user_id_is_active "
+        "ON weak_topics (user_id, is_active)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_problem_reflections_contest_problem_id "
+        "ON problem_reflections (contest_problem_id)"
+    ))
+
+    # The unique indexes double as the per-user indexes and are the
+    # conflict targets of mark-solved's upserts; the old select-then-insert
+    # code could race into duplicates, which are merged first
+    _merge_duplicates(
+        conn,
+        "user_topic_ratings",
+        "user_id, topic",
+        sums=["problems_solved", "problems_attempted"],
+        maxes=["rating", "updated_at"],
+    )
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_topic_ratings_user_id_topic "
+        "ON user_topic_ratings (user_id, topic)"
+    ))
+    _merge_duplicates(
+        conn,
+        "problem_history",
+        "user_id, problem_id",
+        sums=["times_attempted", "times_solved"],
+        maxes=["last_attempted_at"],
+    )
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_problem_history_user_id_problem_id "
+        "ON problem_history (user_id, problem_id)"
+    ))
+
+
+def _one_active_contest_per_user(conn: Connection) -> None:
+    # Double-clicked /generate requests could each pass the old existence
+    # check; keep the newest active contest and abandon the rest
+    conn.execute(text(
+        "UPDATE contests SET status = 'ABANDONED', ended_at = started_at, rating_change = 0 "
+        "WHERE status = 'ACTIVE' AND id NOT IN "
+        "(SELECT MAX(id) FROM contests WHERE status = 'ACTIVE' GROUP BY user_id)"
+    ))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_contests_user_id_active "
+        "ON contests (user_id) WHERE status = 'ACTIVE'"
+    ))
+
+
+def _contest_pagination_indexes(conn: Connection) -> None:
+    # Let /history and the contest list walk a user's contests in page order
+    # and stop after one page, instead of sorting them all
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contests_user_id_ended_at_id "
+        "ON contests (user_id, ended_at, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contests_user_id_started_at_id "
+        "ON contests (user_id, started_at, id)"
+    ))
+
+
+def _user_stats_rollup(conn: Connection) -> None:
+    # create_all has already created the table; fill it for existing users
+    db = Session(bind=conn)
+    for user_ids in user_id_batches(db):
+        rebuild_user_stats(db, user_ids)
+    db.close()
+
+
+def _reflection_generation_attempts(conn: Connection) -> None:
+    # SQLite has no ADD COLUMN IF NOT EXISTS, and create_all has already
+    # added the column on a fresh database
+    columns = {c["name"] for c in inspect(conn).get_columns("problem_reflections")}
+    if "generation_attempts" not in columns:
+        conn.execute(text(
+            "ALTER TABLE problem_reflections "
+            "ADD COLUMN generation_attempts INTEGER NOT NULL DEFAULT 0"
+        ))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "hot_path_indexes", _hot_path_indexes),
+    Migration(2, "one_active_contest_per_user", _one_active_contest_per_user),
+    Migration(3, "contest_pagination_indexes", _contest_pagination_indexes),
+    Migration(4, "user_stats_rollup", _user_stats_rollup),
+    Migration(5, "reflection_generation_attempts", _reflection_generation_attempts),
+]
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied."""
+    SchemaMigration.__table__.create(bind=engine, checkfirst=True)
+    applied: List[int] = []
+    with engine.connect() as lock_conn:
+        postgres = engine.dialect.name == "postgresql"
+        if postgres:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            with engine.connect() as conn:
+                done = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+            for migration in sorted(MIGRATIONS):
+                if migration.version in done:
+                    continue
+                with engine.begin() as conn:
+                    migration.upgrade(conn)
+                    conn.execute(
+                        SchemaMigration.__table__.insert().values(
+                            version=migration.version,
+                            name=migration.name,
+                            applied_at=datetime.utcnow(),
+                        )
+                    )
+                print(f"Applied migration {migration.version:04d} {migration.name}")
+                applied.append(migration.version)
+        finally:
+            if postgres:
+                lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+                )
+                lock_conn.commit()
+    return applied
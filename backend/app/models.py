@@ -7,9 +7,12 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -51,10 +54,26 @@ class User(Base):
     problem_history = relationship(
         "ProblemHistory", back_populates="user", lazy="dynamic"
     )
+    seen_set = relationship("UserSeenSet", back_populates="user", uselist=False)
+    stats = relationship("UserStats", back_populates="user", uselist=False)
 
 
 class Contest(Base):
     __tablename__ = "contests"
+    __table_args__ = (
+        Index("ix_contests_user_id_status", "user_id", "status"),
+        # Keyset pagination of /history and the contest list, newest first
+        Index("ix_contests_user_id_ended_at_id", "user_id", "ended_at", "id"),
+        Index("ix_contests_user_id_started_at_id", "user_id", "started_at", "id"),
+        # At most one ACTIVE contest per user; /generate relies on it
+        Index(
+            "uq_contests_user_id_active",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+            sqlite_where=text("status = 'ACTIVE'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -75,11 +94,15 @@ class Contest(Base):
     total_time_seconds = Column(Integer, default=0)
 
     user = relationship("User", back_populates="contests")
-    problems = relationship("ContestProblem", back_populates="contest", lazy="joined")
+    # Loaded per query (joinedload, selectinload or noload) by the routes
+    problems = relationship("ContestProblem", back_populates="contest")
 
 
 class ContestProblem(Base):
     __tablename__ = "contest_problems"
+    __table_args__ = (
+        Index("ix_contest_problems_contest_id_problem_id", "contest_id", "problem_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     contest_id = Column(Integer, ForeignKey("contests.id"), nullable=False)
@@ -109,6 +132,9 @@ class ContestProblem(Base):
 
 class UserTopicRating(Base):
     __tablename__ = "user_topic_ratings"
+    __table_args__ = (
+        Index("uq_user_topic_ratings_user_id_topic", "user_id", "topic", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -124,6 +150,7 @@ class UserTopicRating(Base):
 
 class WeakTopic(Base):
     __tablename__ = "weak_topics"
+    __table_args__ = (Index("ix_weak_topics_user_id_is_active", "user_id", "is_active"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -143,6 +170,9 @@ class WeakTopic(Base):
 
 class ProblemHistory(Base):
     __tablename__ = "problem_history"
+    __table_args__ = (
+        Index("uq_problem_history_user_id_problem_id", "user_id", "problem_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -155,12 +185,55 @@ class ProblemHistory(Base):
     user = relationship("User", back_populates="problem_history")
 
 
+class UserSeenSet(Base):
+    """
+    Bitmap over problem catalog ordinals mirroring the user's problem_history.
+
+    Ordinals are only stable for one catalog build, so the bitmap is rebuilt
+    from problem_history whenever ``catalog_version`` no longer matches.
+    """
+
+    __tablename__ = "user_seen_sets"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True)
+    catalog_version = Column(String(64), nullable=False)
+    bitmap = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = relationship("User", back_populates="seen_set")
+
+
+class UserStats(Base):
+    """
+    Per-user rollup behind /profile and the /history totals, kept in step
+    with the contest tables by the routes that change them (see
+    app.services.user_stats) and rebuildable from them at any time.
+
+    ``topic_stats`` is a JSON object of problems solved per topic;
+    ``finished_*`` cover completed and abandoned contests only.
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, autoincrement=False)
+    total_contests = Column(Integer, nullable=False, default=0)
+    finished_contests = Column(Integer, nullable=False, default=0)
+    successful_contests = Column(Integer, nullable=False, default=0)
+    finished_problems_solved = Column(Integer, nullable=False, default=0)
+    active_contest_id = Column(Integer, nullable=True)
+    topic_stats = Column(Text, nullable=False, default="{}")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = relationship("User", back_populates="stats")
+
+
 class ProblemReflection(Base):
     __tablename__ = "problem_reflections"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     contest_problem_id = Column(
-        Integer, ForeignKey("contest_problems.id"), nullable=False
+        Integer, ForeignKey("contest_problems.id"), nullable=False, index=True
     )
     editorial_text = Column(Text, nullable=True)
     editorial_url = Column(String(500), nullable=True)
@@ -172,5 +245,77 @@ class ProblemReflection(Base):
     model_used = Column(String(100), nullable=True)
     generated_at = Column(DateTime, default=datetime.utcnow)
     generation_error = Column(Text, nullable=True)
+    # Failed attempts in a row; retries back off on this and generated_at
+    generation_attempts = Column(Integer, nullable=False, default=0)
 
     contest_problem = relationship("ContestProblem", back_populates="reflection")
+
+
+class ProblemBrief(Base):
+    """
+    Problem-level half of a reflection, shared by every user who gets the
+    problem (see app.services.reflections): the fetched editorial and the
+    model's summary of the intended approach.
+    """
+
+    __tablename__ = "problem_briefs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    problem_id = Column(String(100), nullable=False, unique=True, index=True)
+    editorial_text = Column(Text, nullable=True)
+    editorial_url = Column(String(500), nullable=True)
+    key_insight = Column(Text, nullable=True)
+    master_approach = Column(Text, nullable=True)
+    model_used = Column(String(100), nullable=True)
+    generated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class LLMCacheEntry(Base):
+    """
+    Shared tier of the LLM response cache (see app.services.llm_cache).
+
+    ``key`` is a hash of the request kind and the normalized stats signature
+    the prompt was built from; ``value`` is the raw model text.
+    """
+
+    __tablename__ = "llm_cache"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    key = Column(String(64), nullable=False, unique=True, index=True)
+    kind = Column(String(20), nullable=False)
+    value = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class RewardJob(Base):
+    """
+    Background trait/title generation for one completed contest (see
+    app.services.reward_jobs). ``status`` is pending, ready or failed;
+    ``traits`` holds a JSON list once the job is ready.
+    """
+
+    __tablename__ = "reward_jobs"
+
+    id = Column(String(32), primary_key=True)
+    contest_id = Column(
+        Integer, ForeignKey("contests.id"), nullable=False, unique=True, index=True
+    )
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    level = Column(Integer, nullable=False)
+    solved_count = Column(Integer, nullable=False)
+    traits = Column(Text, nullable=True)
+    title = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class SchemaMigration(Base):
+    """A migration from app.migrations that has been applied to this database."""
+
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
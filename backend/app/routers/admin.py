@@ -0,0 +1,74 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.schemas import (
+    CatalogReloadResponse,
+    LLMCacheStatsResponse,
+    LLMCircuitResponse,
+)
+from app.services.contest_generator import contest_generator
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+# Admin routes are skipped by AuthMiddleware and gated on this shared token
+# instead; they are disabled entirely when it is unset.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.post(
+    "/catalog/reload",
+    response_model=CatalogReloadResponse,
+    dependencies=[Depends(require_admin)],
+)
+def reload_catalog(response: Response, background: bool = False):
+    """
+    Reload the problem catalog in this worker and swap it in atomically.
+
+    Other workers pick the new artifact up through their mtime watcher.
+    With ``background=true`` the rebuild runs on a separate thread and the
+    currently served catalog is reported with a 202.
+    """
+    if background:
+        contest_generator.holder.reload_in_background()
+        response.status_code = 202
+        catalog = contest_generator.catalog
+        return CatalogReloadResponse(
+            reloaded=False, version=catalog.version, problems=len(catalog)
+        )
+
+    try:
+        catalog = contest_generator.holder.reload().catalog
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"Catalog reload failed: {e}")
+    return CatalogReloadResponse(
+        reloaded=True, version=catalog.version, problems=len(catalog)
+    )
+
+
+@router.get(
+    "/llm-cache",
+    response_model=LLMCacheStatsResponse,
+    dependencies=[Depends(require_admin)],
+)
+def llm_cache_stats():
+    """Hit/miss counters of this worker's LLM response cache."""
+    return LLMCacheStatsResponse(**contest_generator.llm_cache.stats())
+
+
+@router.get(
+    "/llm-circuit",
+    response_model=LLMCircuitResponse,
+    dependencies=[Depends(require_admin)],
+)
+def llm_circuit_state():
+    """State and rolling error rate / p95 latency of this worker's Gemini breaker."""
+    return LLMCircuitResponse(**contest_generator.llm.breaker.stats())
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.auth import create_access_token, hash_password, verify_password
 from app.database import get_db
-from app.models import User
+from app.models import User, UserStats
 from app.schemas import TokenResponse, UserCreate, UserLogin, UserResponse
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -60,6 +60,8 @@ def create_user(
     )
 
     db.add(new_user)
+    db.flush()
+    db.add(UserStats(user_id=new_user.id))
     db.commit()
     db.refresh(new_user)
 
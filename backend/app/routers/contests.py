@@ -1,17 +1,24 @@
+import base64
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query as ORMQuery, Session, joinedload, noload, selectinload
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models import (
     Contest,
     ContestProblem,
     ContestStatus,
-    ProblemHistory,
+    ProblemReflection,
+    RewardJob,
     SubmissionStatus,
     User,
+    UserStats,
     UserTopicRating,
+    WeakTopic,
 )
 from app.schemas import (
     CompleteContestResponse,
@@ -19,15 +26,36 @@ from app.schemas import (
     ContestHistoryResponse,
     ContestListResponse,
     ContestProblemOut,
+    ContestReflectionsResponse,
+    ContestRewardsResponse,
+    ContestSummaryOut,
     MarkQuestionSolvedRequest,
     MarkQuestionSolvedResponse,
+    ProblemReflectionOut,
     UserProfileResponse,
 )
-from app.services.contest_generator import ContestGenerator
+from app.services.contest_generator import contest_generator
+from app.services.progress import mark_solved
+from app.services.reflections import reflection_pipeline, retry_due
+from app.services.reward_jobs import PENDING, job_traits, reward_queue
+from app.services.seen_set import load_seen_set, record_seen
+from app.services.user_stats import (
+    FINISHED_CONTEST,
+    load_user_stats,
+    record_contest_finished,
+    record_contest_started,
+    topic_stats,
+)
 
 router = APIRouter(prefix="/api/contests", tags=["contests"])
 
-contest_generator = ContestGenerator()
+# Default and largest page sizes for /history and the contest list
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Partial unique index allowing one ACTIVE contest per user (see models.Contest)
+ACTIVE_CONTEST_INDEX = "uq_contests_user_id_active"
+ACTIVE_CONTEST_EXISTS = "You already have an active contest. Complete or abandon it first."
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -106,51 +134,159 @@ def _build_contest_detail(contest: Contest) -> ContestDetailResponse:
     )
 
 
-def _get_active_contest_for_user(db: Session, user_id: int) -> Contest | None:
-    return (
-        db.query(Contest)
-        .filter(Contest.user_id == user_id, Contest.status == ContestStatus.ACTIVE)
-        .first()
+def _build_contest_summary(contest: Contest) -> ContestSummaryOut:
+    """Like _build_contest_detail, from the contest row alone (no questions)."""
+    rating_after = (
+        contest.rating_at_start + (contest.rating_change or 0)
+        if contest.rating_change is not None
+        else None
+    )
+    return ContestSummaryOut(
+        contestId=contest.id,
+        title=contest.title or f"Contest #{contest.id}",
+        status=contest.status.value.lower()
+        if isinstance(contest.status, ContestStatus)
+        else str(contest.status).lower(),
+        solvedCount=contest.problems_solved or 0,
+        totalQuestions=contest.num_problems or 0,
+        ratingBefore=contest.rating_at_start,
+        ratingAfter=rating_after,
+        createdAt=contest.started_at,
+        completedAt=contest.ended_at,
     )
 
 
-# ── Auth dependency ──────────────────────────────────────────────────────────
-
+def _encode_cursor(at: datetime, contest_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{at.isoformat()}|{contest_id}".encode()).decode()
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
-    user_id = getattr(request.state, "user_id", None)
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
 
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
     try:
-        uid = int(user_id)
-    except (ValueError, TypeError):
-        raise HTTPException(status_code=401, detail="Invalid user id in token")
+        at, _, contest_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return datetime.fromisoformat(at), int(contest_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    user = db.query(User).filter(User.id == uid).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+def _keyset_page(
+    query: ORMQuery, sort_column, cursor: str | None, limit: int
+) -> tuple[list[Contest], str | None]:
+    """
+    One newest-first page of ``query`` ordered by ``(sort_column, id)``, and
+    the cursor for the next page. Pages continue from the last row seen
+    rather than an OFFSET, so deep pages cost the same as the first and
+    contests finished meanwhile don't shift them.
+    """
+    if cursor:
+        at, contest_id = _decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, Contest.id) < tuple_(at, contest_id))
+    contests = (
+        query.options(noload(Contest.problems))
+        .order_by(sort_column.desc(), Contest.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    if len(contests) <= limit:
+        return contests, None
+    contests = contests[:limit]
+    last = contests[-1]
+    return contests, _encode_cursor(getattr(last, sort_column.key), last.id)
 
 
-# ── Routes ───────────────────────────────────────────────────────────────────
+def _get_active_contest_for_user(
+    db: Session, user_id: int, problems=noload
+) -> Contest | None:
+    """
+    The user's active contest. ``problems`` is the loader for its
+    contest_problems: the default noload suits routes that only change the
+    contest row; pass joinedload to read them in the same query.
+    """
+    return (
+        db.query(Contest)
+        .options(problems(Contest.problems))
+        .filter(Contest.user_id == user_id, Contest.status == ContestStatus.ACTIVE)
+        .first()
+    )
 
 
-@router.get("/generate", response_model=ContestDetailResponse)
-def generate_contest(
-    request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    # Check for an existing active contest
-    active = _get_active_contest_for_user(db, current_user.id)
-    if active:
+def _raise_not_solvable(db: Session, user_id: int, problem_id: str) -> None:
+    """Raise the error explaining why ``mark_solved`` found nothing to mark."""
+    row = (
+        db.query(ContestProblem.status)
+        .join(Contest, Contest.id == ContestProblem.contest_id)
+        .filter(
+            Contest.user_id == user_id,
+            Contest.status == ContestStatus.ACTIVE,
+            ContestProblem.problem_id == problem_id,
+        )
+        .first()
+    )
+    if row is None:
+        active = (
+            db.query(Contest.id)
+            .filter(Contest.user_id == user_id, Contest.status == ContestStatus.ACTIVE)
+            .first()
+        )
+        if active is None:
+            raise HTTPException(status_code=400, detail="No active contest found")
+        raise HTTPException(
+            status_code=404, detail="Question not found in this contest"
+        )
+    raise HTTPException(status_code=400, detail="Question already marked as solved")
+
+
+def _apply_late_title(contest_id: int, title: str) -> None:
+    """Replace a contest's fallback title with an LLM title that missed the deadline."""
+    db = SessionLocal()
+    try:
+        db.query(Contest).filter(Contest.id == contest_id).update({Contest.title: title})
+        db.commit()
+    except Exception as e:
+        print(f"Error applying late title to contest {contest_id}: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _parse_source_mix(sources: str) -> dict[str, int]:
+    """Parse ``codeforces:2,atcoder:1`` into ``{"codeforces": 2, "atcoder": 1}``."""
+    mix: dict[str, int] = {}
+    for part in sources.split(","):
+        source, _, count = part.strip().partition(":")
+        if not source or not count.isdigit():
+            raise HTTPException(
+                status_code=400,
+                detail="sources must look like 'codeforces:2,atcoder:1'",
+            )
+        mix[source.lower()] = int(count)
+    return mix
+
+
+def _prepare_generation(
+    db: Session, current_user: User, strategy: str, sources: str | None
+) -> dict:
+    """
+    The first half of /generate: gather the keyword arguments for
+    ``contest_generator.generate_contest``. Only reads, bar the seen set's
+    occasional rebuild; the transaction is committed before returning so
+    none stays open while problems are sampled and the title is awaited.
+    """
+    source_mix = _parse_source_mix(sources) if sources else None
+    if source_mix and strategy != "diverse":
         raise HTTPException(
-            status_code=400,
-            detail="You already have an active contest. Complete or abandon it first.",
+            status_code=400, detail="sources requires strategy=diverse"
         )
 
+    # Turn the common case away before a title is drawn; the unique index
+    # checked in _save_generated_contest still decides concurrent requests
+    active = (
+        db.query(Contest.id)
+        .filter(Contest.user_id == current_user.id, Contest.status == ContestStatus.ACTIVE)
+        .first()
+    )
+    if active is not None:
+        raise HTTPException(status_code=400, detail=ACTIVE_CONTEST_EXISTS)
+
     user_rating = current_user.rating or 0
 
     # Build a tag-stats dict from the user_topic_ratings table
@@ -161,12 +297,60 @@ def generate_contest(
     )
     user_stats = {tr.topic: tr.problems_solved or 0 for tr in topic_rows}
 
-    contest_data = contest_generator.generate_contest(
+    # Normally a pooled title; otherwise overlap the LLM title call with the
+    # rest of the request, which only gets until TITLE_DEADLINE_SECONDS from
+    # here before a fallback title is used
+    title = contest_generator.start_title(user_stats, level=_user_level(user_rating))
+
+    weak_topics = [
+        wt.topic
+        for wt in db.query(WeakTopic.topic)
+        .filter(WeakTopic.user_id == current_user.id, WeakTopic.is_active.is_(True))
+        .order_by(WeakTopic.detected_at)
+        .all()
+    ]
+
+    # Pin one catalog snapshot: the seen set's ordinals are only valid against it
+    snapshot = contest_generator.snapshot
+    seen = load_seen_set(db, current_user.id, snapshot.catalog)
+
+    generate_args = dict(
         user_id=str(current_user.id),
         user_rating=user_rating,
         user_stats=user_stats,
+        weak_topics=weak_topics,
+        seen=seen,
+        strategy=strategy,
+        source_mix=source_mix,
+        snapshot=snapshot,
+        title=title,
     )
+    db.commit()
+    return generate_args
+
+
+def _is_active_contest_conflict(e: IntegrityError) -> bool:
+    """Whether ``e`` is uq_contests_user_id_active rejecting a second active contest."""
+    # psycopg2 reports the violated index on .diag; asyncpg's error, wrapped
+    # by SQLAlchemy's adapter, carries it as .constraint_name
+    for err in (e.orig, e.orig.__cause__):
+        name = getattr(getattr(err, "diag", None), "constraint_name", None) or getattr(
+            err, "constraint_name", None
+        )
+        if name:
+            return name == ACTIVE_CONTEST_INDEX
+    # SQLite names the indexed column instead; that index is the only
+    # unique one on contests.user_id
+    return "UNIQUE constraint failed: contests.user_id" in str(e.orig)
+
 
+def _save_generated_contest(
+    db: Session, user_id: int, contest_data: dict
+) -> ContestDetailResponse:
+    """
+    The second half of /generate: insert the contest and its problems and
+    commit, in one short transaction.
+    """
     questions = contest_data["questions"]
 
     # Determine target difficulty (average internal_rating of selected problems)
@@ -174,20 +358,28 @@ def generate_contest(
     if questions:
         avg_diff = sum(q.get("internal_rating", 0) for q in questions) // len(questions)
 
+    # The partial unique index on contests(user_id) WHERE status = 'ACTIVE'
+    # rejects a second active contest, including one from a concurrent
+    # double-click that got past the check in _prepare_generation
     new_contest = Contest(
-        user_id=current_user.id,
+        user_id=user_id,
         title=contest_data["title"],
         status=ContestStatus.ACTIVE,
-        rating_at_start=user_rating,
-        rating_change=0,
         num_problems=len(questions),
         target_difficulty=avg_diff,
+        rating_at_start=contest_data["ratingBefore"],
+        rating_change=0,
         problems_solved=0,
         total_time_seconds=0,
     )
-
     db.add(new_contest)
-    db.flush()  # get new_contest.id
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        if not _is_active_contest_conflict(e):
+            raise
+        raise HTTPException(status_code=400, detail=ACTIVE_CONTEST_EXISTS)
 
     # Create a ContestProblem row for every question
     for q in questions:
@@ -196,131 +388,102 @@ def generate_contest(
             problem_id=q["id"],
             problem_name=q.get("name", "Unknown"),
             problem_url=q.get("url"),
-            topic=(q.get("tags") or ["general"])[0],
+            topic=q.get("topic") or (q.get("tags") or ["general"])[0],
             difficulty=q.get("internal_rating", 0),
             source=q.get("source", "unknown"),
-            is_weak_topic_problem=False,
+            is_weak_topic_problem=q.get("is_weak_topic_problem", False),
             status=SubmissionStatus.PENDING,
         )
         db.add(cp)
 
+    contest_id = new_contest.id
+    record_contest_started(db, user_id, contest_id)
     db.commit()
-    db.refresh(new_contest)
+    # Read back like /active: the contest and its problems in one query
+    new_contest = (
+        db.query(Contest)
+        .options(joinedload(Contest.problems))
+        .filter(Contest.id == contest_id)
+        .one()
+    )
+
+    pending_title = contest_data["pendingTitle"]
+    if pending_title is not None:
+        pending_title.on_ready(lambda t: _apply_late_title(contest_id, t))
 
     return _build_contest_detail(new_contest)
 
 
-@router.post("/mark-solved", response_model=MarkQuestionSolvedResponse)
-def mark_question_solved(
-    request_data: MarkQuestionSolvedRequest,
-    request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    active = _get_active_contest_for_user(db, current_user.id)
-    if not active:
-        raise HTTPException(status_code=400, detail="No active contest found")
+# ── Auth dependency ──────────────────────────────────────────────────────────
 
-    if active.status != ContestStatus.ACTIVE:
-        raise HTTPException(status_code=400, detail="Contest is not active")
 
-    # Find the matching contest_problem row
-    cp = (
-        db.query(ContestProblem)
-        .filter(
-            ContestProblem.contest_id == active.id,
-            ContestProblem.problem_id == request_data.questionId,
-        )
-        .first()
-    )
+async def get_current_user_id(request: Request) -> int:
+    """
+    The authenticated user's id, for routes that don't need the User row.
+    No I/O, so it runs on the event loop rather than taking a threadpool slot.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Not authenticated")
 
-    if not cp:
-        raise HTTPException(
-            status_code=404, detail="Question not found in this contest"
-        )
+    try:
+        return int(user_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=401, detail="Invalid user id in token")
 
-    if cp.status == SubmissionStatus.SOLVED:
-        raise HTTPException(status_code=400, detail="Question already marked as solved")
 
-    # Mark solved
-    cp.status = SubmissionStatus.SOLVED
-    cp.submitted_at = datetime.utcnow()
-    cp.attempts = (cp.attempts or 0) + 1
+def get_current_user(
+    uid: int = Depends(get_current_user_id), db: Session = Depends(get_db)
+) -> User:
+    user = db.query(User).filter(User.id == uid).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-    db.flush()  # flush so the recount query below sees the updated status
+    return user
 
-    # Recount solved problems on the contest
-    solved_count = (
-        db.query(ContestProblem)
-        .filter(
-            ContestProblem.contest_id == active.id,
-            ContestProblem.status == SubmissionStatus.SOLVED,
-        )
-        .count()
-    )
-    active.problems_solved = solved_count
 
-    # Update per-topic stats in user_topic_ratings
-    topic = cp.topic
-    topic_row = (
-        db.query(UserTopicRating)
-        .filter(
-            UserTopicRating.user_id == current_user.id,
-            UserTopicRating.topic == topic,
-        )
-        .first()
-    )
-    if topic_row:
-        topic_row.problems_solved = (topic_row.problems_solved or 0) + 1
-        topic_row.updated_at = datetime.utcnow()
-    else:
-        topic_row = UserTopicRating(
-            user_id=current_user.id,
-            topic=topic,
-            rating=0,
-            problems_solved=1,
-            problems_attempted=1,
-        )
-        db.add(topic_row)
+# ── Routes ───────────────────────────────────────────────────────────────────
 
-    # Update problem_history
-    ph = (
-        db.query(ProblemHistory)
-        .filter(
-            ProblemHistory.user_id == current_user.id,
-            ProblemHistory.problem_id == cp.problem_id,
-        )
-        .first()
-    )
-    if ph:
-        ph.times_solved = (ph.times_solved or 0) + 1
-        ph.times_attempted = (ph.times_attempted or 0) + 1
-        ph.last_attempted_at = datetime.utcnow()
-    else:
-        ph = ProblemHistory(
-            user_id=current_user.id,
-            problem_id=cp.problem_id,
-            times_solved=1,
-            times_attempted=1,
-        )
-        db.add(ph)
 
-    # Update user aggregate counters
-    current_user.total_problems_solved = (current_user.total_problems_solved or 0) + 1
-    current_user.total_problems_attempted = (
-        current_user.total_problems_attempted or 0
-    ) + 1
-    current_user.updated_at = datetime.utcnow()
+@router.get("/generate", response_model=ContestDetailResponse)
+def generate_contest(
+    request: Request,
+    strategy: Literal["uniform", "weighted", "diverse"] = "uniform",
+    sources: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Read before _prepare_generation commits and expires the row
+    user_id = current_user.id
+    generate_args = _prepare_generation(db, current_user, strategy, sources)
+    contest_data = contest_generator.generate_contest(**generate_args)
+    return _save_generated_contest(db, user_id, contest_data)
+
+
+@router.post("/mark-solved", response_model=MarkQuestionSolvedResponse)
+def mark_question_solved(
+    request_data: MarkQuestionSolvedRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    solved = mark_solved(db, user_id, request_data.questionId)
+    if solved is None:
+        db.rollback()
+        _raise_not_solvable(db, user_id, request_data.questionId)
+
+    if solved.first_solve:
+        record_seen(db, user_id, contest_generator.catalog, solved.problem_id)
 
     db.commit()
 
     return MarkQuestionSolvedResponse(
         success=True,
-        questionId=cp.problem_id,
+        questionId=solved.problem_id,
         solved=True,
-        solvedCount=solved_count,
-        totalQuestions=active.num_problems or 0,
-        tagsUpdated=[topic] if topic else [],
+        solvedCount=solved.solved_count,
+        totalQuestions=solved.total_questions,
+        tagsUpdated=[solved.topic] if solved.topic else [],
     )
 
 
@@ -363,33 +526,36 @@ def complete_contest(
 
     level_after = _user_level(rating_after)
 
-    # Generate traits / title when successful (cosmetic, never stored in DB)
-    new_traits: list[str] = []
-    new_title: str | None = None
-
+    # Traits / title for a successful run are cosmetic and can take an LLM
+    # call, so they're generated in the background after this commits
+    job = None
     if is_successful:
-        topic_rows = (
-            db.query(UserTopicRating)
-            .filter(UserTopicRating.user_id == current_user.id)
-            .all()
-        )
-        user_stats = {tr.topic: tr.problems_solved or 0 for tr in topic_rows}
-
-        new_traits, new_title = contest_generator.generate_traits_and_title(
-            user_stats=user_stats,
-            current_level=level_after,
-            current_traits=[],
+        job = RewardJob(
+            id=reward_queue.new_job_id(),
+            contest_id=active.id,
+            user_id=current_user.id,
+            status=PENDING,
+            level=level_after,
             solved_count=solved_count,
         )
-
+        db.add(job)
+
+    # Read before the commit expires ``active``; its problems aren't loaded
+    contest_id, status = active.id, active.status.value.lower()
+    contest_problem_ids = [
+        cp_id
+        for cp_id, in db.query(ContestProblem.id).filter(ContestProblem.contest_id == contest_id)
+    ]
+    record_contest_finished(db, current_user.id, solved_count, is_successful)
     db.commit()
+    if job is not None:
+        reward_queue.enqueue(job.id)
+    reflection_pipeline.enqueue(contest_problem_ids)
 
     return CompleteContestResponse(
         success=True,
-        contestId=active.id,
-        status=active.status.value.lower()
-        if isinstance(active.status, ContestStatus)
-        else str(active.status).lower(),
+        contestId=contest_id,
+        status=status,
         solvedCount=solved_count,
         totalQuestions=total_questions,
         ratingBefore=rating_before,
@@ -397,8 +563,94 @@ def complete_contest(
         ratingChange=rating_change,
         levelBefore=level_before,
         levelAfter=level_after,
-        newTraits=new_traits,
-        newTitle=new_title,
+        rewardsJobId=job.id if job is not None else None,
+        rewardsStatus=PENDING if job is not None else "none",
+    )
+
+
+@router.get("/{contest_id}/rewards", response_model=ContestRewardsResponse)
+def get_contest_rewards(
+    contest_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    job = (
+        db.query(RewardJob)
+        .filter(
+            RewardJob.contest_id == contest_id,
+            RewardJob.user_id == current_user.id,
+        )
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="No rewards for this contest")
+
+    return ContestRewardsResponse(
+        contestId=contest_id,
+        jobId=job.id,
+        status=job.status,
+        newTraits=job_traits(job),
+        newTitle=job.title,
+    )
+
+
+@router.get("/{contest_id}/reflections", response_model=ContestReflectionsResponse)
+def get_contest_reflections(
+    contest_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    contest = (
+        db.query(Contest)
+        .options(selectinload(Contest.problems))
+        .filter(Contest.id == contest_id, Contest.user_id == current_user.id)
+        .first()
+    )
+    if not contest:
+        raise HTTPException(status_code=404, detail="Contest not found")
+    if contest.status != ContestStatus.COMPLETED:
+        raise HTTPException(
+            status_code=400, detail="Reflections are written once a contest is completed"
+        )
+
+    by_problem = {
+        r.contest_problem_id: r
+        for r in db.query(ProblemReflection).filter(
+            ProblemReflection.contest_problem_id.in_([cp.id for cp in contest.problems])
+        )
+    }
+
+    reflections: list[ProblemReflectionOut] = []
+    retry: list[int] = []
+    now = datetime.utcnow()
+    for cp in contest.problems:
+        r = by_problem.get(cp.id)
+        if r is None or (r.generation_error and retry_due(r, now)):
+            # Covers jobs lost to a restart as well as failed ones, which
+            # back off between attempts
+            retry.append(cp.id)
+        if r is None:
+            reflections.append(ProblemReflectionOut(questionId=cp.problem_id, status="pending"))
+            continue
+        reflections.append(
+            ProblemReflectionOut(
+                questionId=cp.problem_id,
+                status="failed" if r.generation_error else "ready",
+                pivotSentence=r.pivot_sentence,
+                tips=r.tips,
+                whatToImprove=r.what_to_improve,
+                masterApproach=r.master_approach,
+                editorialUrl=r.editorial_url,
+            )
+        )
+    reflection_pipeline.enqueue(retry)
+
+    return ContestReflectionsResponse(
+        contestId=contest.id,
+        status="ready" if all(r.status == "ready" for r in reflections) else "pending",
+        reflections=reflections,
     )
 
 
@@ -419,12 +671,14 @@ def abandon_contest(
     current_user.total_contests = (current_user.total_contests or 0) + 1
     current_user.updated_at = datetime.utcnow()
 
+    contest_id = active.id
+    record_contest_finished(db, current_user.id, active.problems_solved or 0, False)
     db.commit()
 
     return {
         "success": True,
         "message": "Contest abandoned",
-        "contestId": active.id,
+        "contestId": contest_id,
     }
 
 
@@ -434,7 +688,7 @@ def get_active_contest(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    active = _get_active_contest_for_user(db, current_user.id)
+    active = _get_active_contest_for_user(db, current_user.id, joinedload)
     if not active:
         raise HTTPException(status_code=404, detail="No active contest found")
 
@@ -444,104 +698,91 @@ def get_active_contest(
 @router.get("/history", response_model=ContestHistoryResponse)
 def get_contest_history(
     request: Request,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
 ):
-    contests = (
-        db.query(Contest)
-        .filter(
-            Contest.user_id == current_user.id,
-            Contest.status.in_([ContestStatus.COMPLETED, ContestStatus.ABANDONED]),
-        )
-        .order_by(Contest.ended_at.desc())
-        .all()
-    )
+    finished = db.query(Contest).filter(Contest.user_id == user_id, FINISHED_CONTEST)
+    contests, next_cursor = _keyset_page(finished, Contest.ended_at, cursor, limit)
 
-    details = [_build_contest_detail(c) for c in contests]
-    total_solved = sum(d.solvedCount for d in details)
-    successful = sum(
-        1
-        for d in details
-        if d.status == "completed" and d.solvedCount == d.totalQuestions
-    )
+    # Totals over the whole history from the user's rollup row
+    user_stats = load_user_stats(db, user_id)
 
     return ContestHistoryResponse(
-        history=details,
-        total=len(details),
-        totalSolved=total_solved,
-        successfulContests=successful,
+        history=[_build_contest_summary(c) for c in contests],
+        total=user_stats.finished_contests,
+        totalSolved=user_stats.finished_problems_solved,
+        successfulContests=user_stats.successful_contests,
+        nextCursor=next_cursor,
     )
 
 
 @router.get("/", response_model=ContestListResponse)
 def get_user_contests(
     request: Request,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    contests = (
-        db.query(Contest)
-        .filter(Contest.user_id == current_user.id)
-        .order_by(Contest.started_at.desc())
-        .all()
+    mine = db.query(Contest).filter(Contest.user_id == current_user.id)
+    contests, next_cursor = _keyset_page(mine, Contest.started_at, cursor, limit)
+    total = db.query(Contest.id).filter(Contest.user_id == current_user.id).count()
+
+    return ContestListResponse(
+        contests=[_build_contest_summary(c) for c in contests],
+        total=total,
+        nextCursor=next_cursor,
     )
 
-    details = [_build_contest_detail(c) for c in contests]
-    return ContestListResponse(contests=details, total=len(details))
-
 
 @router.get("/profile", response_model=UserProfileResponse)
 def get_user_profile(
     request: Request,
+    include_active: bool = True,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
 ):
-    # Active contest
-    active = _get_active_contest_for_user(db, current_user.id)
-    active_detail = _build_contest_detail(active) if active else None
-
-    # Aggregate counts
-    total_contests = (
-        db.query(Contest).filter(Contest.user_id == current_user.id).count()
-    )
-    successful_contests = (
-        db.query(Contest)
-        .filter(
-            Contest.user_id == current_user.id,
-            Contest.status == ContestStatus.COMPLETED,
-            Contest.problems_solved == Contest.num_problems,
-        )
-        .count()
-    )
-
-    # Per-topic stats dict
-    topic_rows = (
-        db.query(UserTopicRating)
-        .filter(UserTopicRating.user_id == current_user.id)
-        .all()
+    # The user and their user_stats rollup in one primary-key read
+    row = (
+        db.query(User, UserStats)
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+        .filter(User.id == user_id)
+        .first()
     )
-    stats = {tr.topic: tr.problems_solved or 0 for tr in topic_rows}
-
-    # Derived fields
-    level = _user_level(current_user.rating or 0)
-    title = _user_title(level)
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+    user, user_stats = row
+    if user_stats is None:
+        user_stats = load_user_stats(db, user_id)
 
+    stats = topic_stats(user_stats)
+    level = _user_level(user.rating or 0)
     # Traits: top topics the user has solved problems in
-    sorted_topics = sorted(stats.items(), key=lambda x: -x[1])
-    traits = [t for t, _ in sorted_topics[:5]] if sorted_topics else []
+    sorted_topics = sorted(stats.items(), key=lambda x: (-x[1], x[0]))
+    traits = [t for t, _ in sorted_topics[:5]]
+
+    # The full active contest costs a second query; clients that only need
+    # activeContestId (the bundled frontend reads the rest from /active) skip
+    # it with include_active=false
+    active_detail = None
+    if include_active and user_stats.active_contest_id is not None:
+        active = _get_active_contest_for_user(db, user_id, joinedload)
+        active_detail = _build_contest_detail(active) if active else None
 
     return UserProfileResponse(
-        userId=current_user.id,
-        username=current_user.username,
-        rating=current_user.rating or 0,
+        userId=user.id,
+        username=user.username,
+        rating=user.rating or 0,
         level=level,
-        title=title,
+        title=_user_title(level),
         stats=stats,
         traits=traits,
-        totalQuestionsSolved=current_user.total_problems_solved or 0,
-        totalContests=total_contests,
-        successfulContests=successful_contests,
-        activeContestId=active.id if active else None,
+        totalQuestionsSolved=user.total_problems_solved or 0,
+        totalContests=user_stats.total_contests,
+        successfulContests=user_stats.successful_contests,
+        activeContestId=user_stats.active_contest_id,
         activeContest=active_detail,
     )
 
@@ -555,6 +796,7 @@ def get_contest(
 ):
     contest = (
         db.query(Contest)
+        .options(selectinload(Contest.problems))
         .filter(Contest.id == contest_id, Contest.user_id == current_user.id)
         .first()
     )
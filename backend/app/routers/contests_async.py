@@ -0,0 +1,228 @@
+"""
+The contest routes on an AsyncSession, mounted instead of
+app.routers.contests when DATABASE_MODE=async.
+
+Each route awaits its database work on the event loop, so a slow round
+trip holds a coroutine rather than one of the threadpool's threads. The
+route bodies are the ones in app.routers.contests, run through
+``AsyncSession.run_sync``: that hands them the session's sync facade, and
+every statement they issue is awaited on the async driver underneath.
+Work that blocks without touching the database (sampling problems,
+waiting on the LLM title) goes to the threadpool as before.
+"""
+
+from typing import Callable, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.database import get_async_db
+from app.models import User
+from app.routers import contests
+from app.routers.contests import MAX_PAGE_SIZE, PAGE_SIZE, get_current_user_id
+from app.schemas import (
+    CompleteContestResponse,
+    ContestDetailResponse,
+    ContestHistoryResponse,
+    ContestListResponse,
+    ContestReflectionsResponse,
+    ContestRewardsResponse,
+    MarkQuestionSolvedRequest,
+    MarkQuestionSolvedResponse,
+    UserProfileResponse,
+)
+from app.services.contest_generator import contest_generator
+
+router = APIRouter(prefix="/api/contests", tags=["contests"])
+
+
+async def _run(db: AsyncSession, route: Callable, **kwargs):
+    """Run a sync route from app.routers.contests on ``db``."""
+    return await db.run_sync(lambda session: route(db=session, **kwargs))
+
+
+# ── Auth dependency ──────────────────────────────────────────────────────────
+
+
+async def get_current_user(
+    uid: int = Depends(get_current_user_id), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    user = await db.get(User, uid)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return user
+
+
+# ── Routes ───────────────────────────────────────────────────────────────────
+
+
+@router.get("/generate", response_model=ContestDetailResponse)
+async def generate_contest(
+    request: Request,
+    strategy: Literal["uniform", "weighted", "diverse"] = "uniform",
+    sources: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Read before _prepare_generation commits and expires the row
+    user_id = current_user.id
+    generate_args = await db.run_sync(
+        contests._prepare_generation, current_user, strategy, sources
+    )
+    # Sampling is CPU work and can wait up to TITLE_DEADLINE_SECONDS on the
+    # LLM title, so it stays off the event loop
+    contest_data = await run_in_threadpool(
+        contest_generator.generate_contest, **generate_args
+    )
+    return await db.run_sync(contests._save_generated_contest, user_id, contest_data)
+
+
+@router.post("/mark-solved", response_model=MarkQuestionSolvedResponse)
+async def mark_question_solved(
+    request_data: MarkQuestionSolvedRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await _run(
+        db,
+        contests.mark_question_solved,
+        request_data=request_data,
+        request=request,
+        user_id=user_id,
+    )
+
+
+@router.post("/complete", response_model=CompleteContestResponse)
+async def complete_contest(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await _run(
+        db, contests.complete_contest, request=request, current_user=current_user
+    )
+
+
+@router.get("/{contest_id}/rewards", response_model=ContestRewardsResponse)
+async def get_contest_rewards(
+    contest_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await _run(
+        db,
+        contests.get_contest_rewards,
+        contest_id=contest_id,
+        request=request,
+        current_user=current_user,
+    )
+
+
+@router.get("/{contest_id}/reflections", response_model=ContestReflectionsResponse)
+async def get_contest_reflections(
+    contest_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await _run(
+        db,
+        contests.get_contest_reflections,
+        contest_id=contest_id,
+        request=request,
+        current_user=current_user,
+    )
+
+
+@router.post("/abandon")
+async def abandon_contest(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await _run(
+        db, contests.abandon_contest, request=request, current_user=current_user
+    )
+
+
+@router.get("/active", response_model=ContestDetailResponse)
+async def get_active_contest(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await _run(
+        db, contests.get_active_contest, request=request, current_user=current_user
+    )
+
+
+@router.get("/history", response_model=ContestHistoryResponse)
+async def get_contest_history(
+    request: Request,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await _run(
+        db,
+        contests.get_contest_history,
+        request=request,
+        limit=limit,
+        cursor=cursor,
+        user_id=user_id,
+    )
+
+
+@router.get("/", response_model=ContestListResponse)
+async def get_user_contests(
+    request: Request,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await _run(
+        db,
+        contests.get_user_contests,
+        request=request,
+        limit=limit,
+        cursor=cursor,
+        current_user=current_user,
+    )
+
+
+@router.get("/profile", response_model=UserProfileResponse)
+async def get_user_profile(
+    request: Request,
+    include_active: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await _run(
+        db,
+        contests.get_user_profile,
+        request=request,
+        include_active=include_active,
+        user_id=user_id,
+    )
+
+
+@router.get("/{contest_id}", response_model=ContestDetailResponse)
+async def get_contest(
+    contest_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await _run(
+        db,
+        contests.get_contest,
+        contest_id=contest_id,
+        request=request,
+        current_user=current_user,
+    )
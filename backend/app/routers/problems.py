@@ -0,0 +1,65 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from app.schemas import ProblemListResponse, TagCount, TagListResponse
+from app.services.contest_generator import contest_generator
+from app.services.problem_catalog import MAX_RATING
+from app.services.problem_search import MIN_QUERY_LENGTH, InvalidCursor
+
+router = APIRouter(prefix="/api/problems", tags=["problems"])
+
+# The tag vocabulary only changes when the catalog is regenerated
+TAGS_CACHE_CONTROL = "public, max-age=3600"
+
+
+@router.get("", response_model=ProblemListResponse)
+def list_problems(
+    min_rating: int = Query(0, ge=0, le=MAX_RATING),
+    max_rating: int = Query(MAX_RATING, ge=0, le=MAX_RATING),
+    source: str | None = None,
+    tag: str | None = None,
+    q: str | None = Query(None, min_length=MIN_QUERY_LENGTH),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+):
+    """
+    Browse the catalog in rating order. Filters combine with AND; pass the
+    returned ``next_cursor`` back as ``cursor`` for the following page.
+    """
+    snapshot = contest_generator.snapshot
+    try:
+        ordinals, total, next_cursor = snapshot.search_index.search(
+            min_rating,
+            max_rating,
+            source=source.lower() if source else None,
+            tag=tag,
+            query=q,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ProblemListResponse(
+        problems=[snapshot.catalog.problem(o) for o in ordinals],
+        total=total,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/tags", response_model=TagListResponse)
+def get_tags(request: Request, response: Response):
+    catalog = contest_generator.catalog
+    etag = catalog.tags_etag
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": TAGS_CACHE_CONTROL},
+        )
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = TAGS_CACHE_CONTROL
+    return TagListResponse(
+        tags=[TagCount(tag=t, count=catalog.tag_count(t)) for t in catalog.tags],
+        total=len(catalog.tags),
+    )
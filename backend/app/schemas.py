@@ -53,6 +53,22 @@ class ProblemResponse(BaseModel):
     extra: Optional[Dict[str, Any]] = None
 
 
+class ProblemListResponse(BaseModel):
+    problems: List[ProblemResponse]
+    total: int  # matches across all pages
+    next_cursor: Optional[str] = None
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class TagListResponse(BaseModel):
+    tags: List[TagCount]
+    total: int
+
+
 # ── Contest Problem (per-problem row in the DB) ─────────────────────────────
 
 
@@ -107,9 +123,28 @@ class ContestDetailResponse(BaseModel):
         from_attributes = True
 
 
+class ContestSummaryOut(BaseModel):
+    """
+    A contest without its questions, for the paginated list and history
+    endpoints; the full detail is at /api/contests/{id}.
+    """
+
+    contestId: int
+    title: Optional[str] = None
+    status: str
+    solvedCount: int = 0
+    totalQuestions: int = 0
+    ratingBefore: int
+    ratingAfter: Optional[int] = None
+    createdAt: Optional[datetime] = None
+    completedAt: Optional[datetime] = None
+
+
 class ContestListResponse(BaseModel):
-    contests: List[ContestDetailResponse]
+    contests: List[ContestSummaryOut]
     total: int
+    # Pass back as ``cursor`` for the next page; None on the last page
+    nextCursor: Optional[str] = None
 
 
 # ── Mark-solved ──────────────────────────────────────────────────────────────
@@ -146,6 +181,35 @@ class CompleteContestResponse(BaseModel):
     ratingChange: int
     levelBefore: int
     levelAfter: int
+    # Traits/title are generated in the background; poll
+    # /api/contests/{contestId}/rewards while rewardsStatus is "pending"
+    newTraits: List[str] = []
+    newTitle: Optional[str] = None
+    rewardsJobId: Optional[str] = None
+    rewardsStatus: str = "none"
+
+
+class ProblemReflectionOut(BaseModel):
+    questionId: str
+    status: str  # "pending", "ready" or "failed"
+    pivotSentence: Optional[str] = None
+    tips: Optional[str] = None
+    whatToImprove: Optional[str] = None
+    masterApproach: Optional[str] = None
+    editorialUrl: Optional[str] = None
+
+
+class ContestReflectionsResponse(BaseModel):
+    contestId: int
+    # "ready" once every question's reflection has been written
+    status: str
+    reflections: List[ProblemReflectionOut] = []
+
+
+class ContestRewardsResponse(BaseModel):
+    contestId: int
+    jobId: str
+    status: str
     newTraits: List[str] = []
     newTitle: Optional[str] = None
 
@@ -154,10 +218,12 @@ class CompleteContestResponse(BaseModel):
 
 
 class ContestHistoryResponse(BaseModel):
-    history: List[ContestDetailResponse]
+    history: List[ContestSummaryOut]
+    # Totals cover the whole history, not just this page
     total: int
     totalSolved: int
     successfulContests: int
+    nextCursor: Optional[str] = None
 
 
 # ── User Profile (used by AuthContext.refreshUser) ───────────────────────────
@@ -179,3 +245,31 @@ class UserProfileResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# ── Admin ────────────────────────────────────────────────────────────────────
+
+
+class CatalogReloadResponse(BaseModel):
+    reloaded: bool
+    version: str
+    problems: int
+
+
+class LLMCacheStatsResponse(BaseModel):
+    memory_hits: int
+    db_hits: int
+    misses: int
+    writes: int
+    entries_in_memory: int
+    hit_rate: float
+
+
+class LLMCircuitResponse(BaseModel):
+    state: str
+    calls_in_window: int
+    error_rate: float
+    latency_checked_calls: int
+    p95_latency_seconds: float
+    retry_in_seconds: Optional[float] = None
+    rejected: int
@@ -0,0 +1,158 @@
+import os
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from app.services.problem_catalog import ProblemCatalog
+from app.services.problem_search import ProblemSearchIndex
+from app.services.sampling import DiversitySelector, WeightedSampler
+
+
+class CatalogSnapshot:
+    """
+    One published catalog together with the sampling indexes built over it.
+
+    Ordinals, seen-set bitmaps and sampler cells are only meaningful against
+    a single catalog, so a request should take one snapshot up front and use
+    it throughout instead of re-reading the holder.
+    """
+
+    def __init__(self, catalog: ProblemCatalog):
+        self.catalog = catalog
+        self._indexes: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _index(self, name: str, build: Callable[[ProblemCatalog], object]):
+        index = self._indexes.get(name)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(name)
+                if index is None:
+                    index = self._indexes[name] = build(self.catalog)
+        return index
+
+    @property
+    def weighted_sampler(self) -> WeightedSampler:
+        return self._index("weighted_sampler", WeightedSampler)
+
+    @property
+    def diversity_selector(self) -> DiversitySelector:
+        return self._index("diversity_selector", DiversitySelector)
+
+    @property
+    def search_index(self) -> ProblemSearchIndex:
+        return self._index("search_index", ProblemSearchIndex)
+
+    def warm(self) -> "CatalogSnapshot":
+        """Build every lazy index now, so the first request after a swap doesn't."""
+        self.weighted_sampler
+        self.diversity_selector
+        self.search_index
+        return self
+
+
+class CatalogHolder:
+    """
+    Versioned, hot-swappable reference to the current CatalogSnapshot.
+
+    ``reload()`` loads the catalog and builds its indexes off to the side,
+    then publishes the finished snapshot with a single reference assignment;
+    requests that already hold the previous snapshot finish on it. With
+    ``start_watching()`` a daemon thread polls the mtimes of ``watch_paths``
+    and reloads when any of them changes, which is how every worker picks
+    up a regenerated catalog without a restart.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], ProblemCatalog],
+        watch_paths: Sequence[str] = (),
+        catalog: Optional[ProblemCatalog] = None,
+    ):
+        self.loader = loader
+        self.watch_paths = tuple(watch_paths)
+        self._mtimes = self._current_mtimes()
+        self._snapshot = CatalogSnapshot(catalog if catalog is not None else loader())
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def publish(self, catalog: ProblemCatalog, warm: bool = True) -> CatalogSnapshot:
+        """Swap in ``catalog`` (indexes built first unless ``warm`` is false)."""
+        snapshot = CatalogSnapshot(catalog)
+        if warm:
+            snapshot.warm()
+        self._snapshot = snapshot
+        return snapshot
+
+    def reload(self) -> CatalogSnapshot:
+        """Load the catalog again and publish it; concurrent calls are serialized."""
+        with self._reload_lock:
+            mtimes = self._current_mtimes()
+            catalog = self.loader()
+            if len(catalog) == 0 and len(self._snapshot.catalog) > 0:
+                # Most likely the artifact is missing or mid-rewrite
+                raise ValueError("Refusing to replace the catalog with an empty one")
+            snapshot = self.publish(catalog)
+            self._mtimes = mtimes
+            return snapshot
+
+    def warm_in_background(self) -> threading.Thread:
+        """Build the current snapshot's indexes without blocking startup."""
+        thread = threading.Thread(
+            target=self._snapshot.warm, name="catalog-warm", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def reload_in_background(self) -> threading.Thread:
+        thread = threading.Thread(
+            target=self._reload_logged, name="catalog-reload", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def changed_on_disk(self) -> bool:
+        return self._current_mtimes() != self._mtimes
+
+    def start_watching(self, interval: float) -> None:
+        """Poll ``watch_paths`` every ``interval`` seconds and reload on change."""
+        if self._watcher is not None or interval <= 0 or not self.watch_paths:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="catalog-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            if self.changed_on_disk():
+                self._reload_logged()
+
+    def _reload_logged(self) -> None:
+        """``reload()`` for the background threads, which have no caller to raise to."""
+        try:
+            snapshot = self.reload()
+            print(
+                f"Reloaded problem catalog: {len(snapshot.catalog)} problems, "
+                f"version {snapshot.catalog.version}"
+            )
+        except Exception as e:
+            # Keep serving the previous snapshot; retry on the next change
+            print(f"Error reloading problem catalog: {e}")
+            self._mtimes = self._current_mtimes()
+
+    def _current_mtimes(self) -> Tuple[Optional[float], ...]:
+        return tuple(
+            os.path.getmtime(p) if os.path.exists(p) else None for p in self.watch_paths
+        )
@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from app.metrics import Counter, Gauge
+
+T = TypeVar("T")
+
+# Outcomes older than this drop out of the error-rate / latency figures
+BREAKER_WINDOW_SECONDS = float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "60"))
+# Calls needed in the window before the breaker will trip at all
+BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "10"))
+# Trip when this share of windowed calls failed...
+BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+# ...or when the windowed p95 latency of latency-checked calls is at least
+# this many seconds
+BREAKER_P95_SECONDS = float(os.getenv("LLM_BREAKER_P95_SECONDS", "5"))
+# Consecutive failures that trip the breaker whatever the window says, so a
+# hard outage trips it even when traffic is too light to reach min calls
+BREAKER_CONSECUTIVE_FAILURES = int(os.getenv("LLM_BREAKER_CONSECUTIVE_FAILURES", "5"))
+# How long an open breaker rejects calls before letting a probe through
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+# Most outcomes kept, however busy the window
+BREAKER_MAX_SAMPLES = 500
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_TRANSITIONS = Counter(
+    "llm_breaker_transitions_total",
+    "Circuit breaker state changes, by the state entered",
+    ["breaker", "state"],
+)
+BREAKER_REJECTED = Counter(
+    "llm_breaker_rejected_total",
+    "Calls failed fast because the circuit was open",
+    ["breaker"],
+)
+BREAKER_STATE = Gauge(
+    "llm_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["breaker"],
+)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while a dependency is erroring or too slow.
+
+    Every call's outcome and latency go into a rolling window. Once it has
+    BREAKER_MIN_CALLS calls, the breaker opens if the error rate or the p95
+    latency crosses its threshold; BREAKER_CONSECUTIVE_FAILURES failures in
+    a row open it regardless. Calls made with ``check_latency=False`` (work
+    that is slow by design, such as batch generation) count towards the
+    error rate but not the latency figures, so they can't trip the breaker
+    for latency-sensitive callers. While open, ``call`` raises
+    CircuitOpenError without touching the dependency, so callers drop
+    straight to their fallback. After the cooldown one probe call is let
+    through (half-open): a fast success closes the circuit with a fresh
+    window, anything else re-opens it for another cooldown.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = BREAKER_WINDOW_SECONDS,
+        min_calls: int = BREAKER_MIN_CALLS,
+        error_rate: float = BREAKER_ERROR_RATE,
+        p95_seconds: float = BREAKER_P95_SECONDS,
+        cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS,
+        consecutive_failures: int = BREAKER_CONSECUTIVE_FAILURES,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate
+        self.p95_threshold = p95_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.consecutive_failures = consecutive_failures
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._failure_streak = 0
+        # (finished_at, ok, latency_seconds or None if not checked), oldest first
+        self._outcomes: deque = deque(maxlen=BREAKER_MAX_SAMPLES)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(_STATE_VALUES[CLOSED], breaker=name)
+
+    def call(self, fn: Callable[[], T], check_latency: bool = True) -> T:
+        probe = self._admit()
+        t0 = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self._record(probe, False, time.monotonic() - t0, check_latency)
+            raise
+        self._record(probe, True, time.monotonic() - t0, check_latency)
+        return result
+
+    def allows_calls(self) -> bool:
+        """Whether ``call`` would let a call through right now (admits nothing)."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() >= self.opened_at + self.cooldown_seconds
+            if self.state == HALF_OPEN:
+                return not self._probe_in_flight
+            return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            calls, error_rate, timed_calls, p95 = self._window_stats()
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.opened_at + self.cooldown_seconds - now)
+            return {
+                "state": self.state,
+                "calls_in_window": calls,
+                "error_rate": round(error_rate, 4),
+                "latency_checked_calls": timed_calls,
+                "p95_latency_seconds": round(p95, 4),
+                "retry_in_seconds": round(retry_in, 3) if retry_in is not None else None,
+                "rejected": self.rejected,
+            }
+
+    def _admit(self) -> bool:
+        """Return whether this call is the half-open probe; raise if rejected."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() < self.opened_at + self.cooldown_seconds:
+                    raise self._rejection()
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probe_in_flight:
+                    raise self._rejection()
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def _rejection(self) -> CircuitOpenError:
+        self.rejected += 1
+        BREAKER_REJECTED.inc(breaker=self.name)
+        return CircuitOpenError(f"{self.name} circuit is open")
+
+    def _record(self, probe: bool, ok: bool, latency: float, check_latency: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if probe:
+                self._probe_in_flight = False
+                if ok and (not check_latency or latency < self.p95_threshold):
+                    self._outcomes.clear()
+                    self._failure_streak = 0
+                    self._transition(CLOSED)
+                else:
+                    self._open(now)
+                return
+            self._outcomes.append((now, ok, latency if check_latency else None))
+            self._failure_streak = 0 if ok else self._failure_streak + 1
+            if self.state != CLOSED:
+                return
+            self._expire(now)
+            calls, error_rate, timed_calls, p95 = self._window_stats()
+            if (
+                self._failure_streak >= self.consecutive_failures
+                or (calls >= self.min_calls and error_rate >= self.error_rate_threshold)
+                or (timed_calls >= self.min_calls and p95 >= self.p95_threshold)
+            ):
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.opened_at = now
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        BREAKER_TRANSITIONS.inc(breaker=self.name, state=state)
+        BREAKER_STATE.set(_STATE_VALUES[state], breaker=self.name)
+        print(f"{self.name} circuit breaker is now {state}")
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+
+    def _window_stats(self) -> Tuple[int, float, int, float]:
+        """Calls, error rate, latency-checked calls and their p95 latency."""
+        calls = len(self._outcomes)
+        if not calls:
+            return 0, 0.0, 0, 0.0
+        errors = sum(1 for _, ok, _ in self._outcomes if not ok)
+        latencies = sorted(
+            latency for _, _, latency in self._outcomes if latency is not None
+        )
+        timed = len(latencies)
+        p95 = latencies[min(timed - 1, int(timed * 0.95))] if timed else 0.0
+        return calls, errors / calls, timed, p95
@@ -1,23 +1,99 @@
 import os
 import json
 import random
-from typing import List, Dict, Optional, Tuple
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 
+from app.services.catalog_holder import CatalogHolder, CatalogSnapshot
+from app.services.llm_cache import LLMCache, stats_signature
+from app.services.llm_client import LLM_FALLBACKS, LLMClient
+from app.services.llm_pool import LEVEL_BAND_SIZE, LLMPool, level_band
+from app.services.problem_catalog import ProblemCatalog, SeenSet
+from app.services.sampling import DiversitySelector, WeightedSampler, topic_weights
+
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = "gemini-2.5-flash-preview-05-20"
+# Override the Gemini endpoint, e.g. with scripts/stub_llm_server.py for offline testing
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL")
+# Upper bound on a single LLM HTTP call, in milliseconds
+LLM_REQUEST_TIMEOUT_MS = 15000
+# Threads for background LLM calls (titles that outlive their request deadline)
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "8"))
+# Threads for the title/traits pool refills, kept apart from the ones above so
+# a burst of refills can't queue a request's title past its deadline
+LLM_POOL_WORKERS = int(os.getenv("LLM_POOL_WORKERS", "4"))
+# How long /generate waits for the LLM title before answering with a fallback;
+# a title that arrives later is patched onto the contest row
+TITLE_DEADLINE_SECONDS = float(os.getenv("TITLE_DEADLINE_SECONDS", "0.8"))
 PROBLEMS_FILE = os.path.join(os.path.dirname(__file__), "../../output/standardized_problems.json")
+CATALOG_FILE = os.path.join(os.path.dirname(__file__), "../../output/standardized_problems.bin")
+# Seconds between checks for a regenerated catalog on disk; 0 disables hot reload
+CATALOG_WATCH_INTERVAL = float(os.getenv("CATALOG_WATCH_INTERVAL", "30"))
+
+# Weak-topic targeting: problems per active weak topic, within +/- window of the user's rating
+WEAK_TOPIC_PROBLEMS = 2
+WEAK_TOPIC_RATING_WINDOW = 5
+
+# "uniform" samples the rating window evenly; "weighted" favours topics by user stats;
+# "diverse" never repeats a pattern_id and can honour a per-source mix
+SAMPLING_STRATEGIES = ("uniform", "weighted", "diverse")
 
 
 class ContestGenerator:
-    def __init__(self):
-        self.problems = self._load_problems()
+    def __init__(self, problems: Optional[List[Dict]] = None):
+        self.holder = CatalogHolder(
+            self._load_catalog,
+            watch_paths=(CATALOG_FILE, PROBLEMS_FILE),
+            catalog=(
+                ProblemCatalog.from_problems(problems) if problems is not None else None
+            ),
+        )
+        # Memory-only until app.main attaches the shared DB tier
+        self.llm_cache = LLMCache()
+        # Pre-generated titles and trait sets per level band, refilled in the
+        # background so the request path normally never waits on the model
+        self.title_pool = LLMPool("title", self._llm_title_batch, _pool_executor)
+        self.traits_pool = LLMPool("traits", self._llm_traits_batch, _pool_executor)
         self.client = None
         if GEMINI_API_KEY and GEMINI_API_KEY != "your_gemini_api_key_here":
-            self.client = genai.Client(api_key=GEMINI_API_KEY)
+            self.client = genai.Client(
+                api_key=GEMINI_API_KEY,
+                http_options=types.HttpOptions(
+                    base_url=GEMINI_BASE_URL, timeout=LLM_REQUEST_TIMEOUT_MS
+                ),
+            )
+        self.title_pool.enabled = self.traits_pool.enabled = self.client is not None
+        # Every model call goes through this for the breaker and metrics
+        self.llm = LLMClient(self.client, GEMINI_MODEL)
+
+    def generate_text(
+        self,
+        prompt: str,
+        max_output_tokens: int,
+        temperature: float,
+        purpose: str = "text",
+    ) -> str:
+        """Raw model text for ``prompt``; raises when no client is configured."""
+        return self.llm.generate(prompt, purpose, max_output_tokens, temperature)
+
+    def _load_catalog(self) -> ProblemCatalog:
+        # Prefer the mmap-able artifact unless the JSON has been regenerated since
+        if os.path.exists(CATALOG_FILE) and (
+            not os.path.exists(PROBLEMS_FILE)
+            or os.path.getmtime(CATALOG_FILE) >= os.path.getmtime(PROBLEMS_FILE)
+        ):
+            try:
+                return ProblemCatalog.open(CATALOG_FILE)
+            except (OSError, ValueError) as e:
+                print(f"Error opening catalog artifact, falling back to JSON: {e}")
+        return ProblemCatalog.from_problems(self._load_problems())
 
     def _load_problems(self) -> List[Dict]:
         try:
@@ -27,36 +103,201 @@ class ContestGenerator:
         except FileNotFoundError:
             return []
 
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        # Take this once per request: a reload may publish a new one at any time
+        return self.holder.snapshot
+
+    @property
+    def catalog(self) -> ProblemCatalog:
+        return self.holder.snapshot.catalog
+
+    @property
+    def weighted_sampler(self) -> WeightedSampler:
+        return self.holder.snapshot.weighted_sampler
+
+    @property
+    def diversity_selector(self) -> DiversitySelector:
+        return self.holder.snapshot.diversity_selector
+
     def get_problems_in_rating_range(
         self, min_rating: int, max_rating: int
     ) -> List[Dict]:
-        return [
-            p
-            for p in self.problems
-            if min_rating <= p.get("internal_rating", 0) <= max_rating
-        ]
+        catalog = self.catalog
+        start, end = catalog.rating_range(min_rating, max_rating)
+        return catalog.problems_between(start, end)
 
     def select_random_questions(
         self, user_rating: int, count: int = 4
     ) -> List[Dict]:
+        snapshot = self.snapshot
+        return [
+            snapshot.catalog.problem(i)
+            for i in self._select_random_ordinals(snapshot, user_rating, count)
+        ]
+
+    def _select_random_ordinals(
+        self,
+        snapshot: CatalogSnapshot,
+        user_rating: int,
+        count: int,
+        exclude: Iterable[int] = (),
+        seen: Optional[SeenSet] = None,
+        strategy: str = "uniform",
+        weights: Optional[Dict[str, float]] = None,
+        source_mix: Optional[Dict[str, int]] = None,
+    ) -> List[int]:
+        if count <= 0:
+            return []
+        exclude = set(exclude)
         min_rating = user_rating
         max_rating = user_rating + 10
 
-        eligible_problems = self.get_problems_in_rating_range(min_rating, max_rating)
+        def unseen_in(start: int, end: int) -> int:
+            return end - start - (seen.count_in(start, end) if seen else 0)
+
+        # Only ordinal bounds are computed here; no candidate list is built
+        catalog = snapshot.catalog
+        start, end = catalog.rating_range(min_rating, max_rating)
+
+        if unseen_in(start, end) < count + len(exclude):
+            min_rating, max_rating = max(1, min_rating - 5), max_rating + 5
+            start, end = catalog.rating_range(min_rating, max_rating)
+
+        def skip(o: int) -> bool:
+            return o in exclude or (seen is not None and o in seen)
+
+        if strategy == "diverse":
+            # The selector relaxes its own constraints, repeats included,
+            # rather than topping up with a draw that ignores them
+            return snapshot.diversity_selector.select(
+                min_rating,
+                max_rating,
+                count,
+                skip,
+                taken=sorted(exclude),
+                source_mix=source_mix,
+                relaxed_skip=lambda o: o in exclude,
+            )
 
-        if len(eligible_problems) < count:
-            eligible_problems = self.get_problems_in_rating_range(
-                max(1, min_rating - 5), max_rating + 5
+        picked: List[int] = []
+        if strategy == "weighted":
+            picked = snapshot.weighted_sampler.sample(
+                min_rating, max_rating, weights or {}, count, skip
+            )
+        picked += _sample_ordinals(
+            range(start, end),
+            count - len(picked),
+            lambda o: skip(o) or o in picked,
+        )
+        if len(picked) < count:
+            # Everything near the user's rating has been played; allow repeats
+            picked += _sample_ordinals(
+                range(start, end),
+                count - len(picked),
+                lambda o: o in exclude or o in picked,
             )
+        return picked
 
-        if len(eligible_problems) < count:
-            return eligible_problems
+    def _select_weak_topic_ordinals(
+        self,
+        snapshot: CatalogSnapshot,
+        weak_topics: List[str],
+        user_rating: int,
+        count: int,
+        seen: Optional[SeenSet] = None,
+        strategy: str = "uniform",
+        source_mix: Optional[Dict[str, int]] = None,
+    ) -> Dict[int, str]:
+        """
+        Map ordinal -> weak topic for problems drawn from each topic's postings.
+        Under "diverse" the picks follow the contest's pattern and source rules.
+        """
+        picked: Dict[int, str] = {}
+        for topic in weak_topics:
+            if len(picked) >= count:
+                break
+            candidates = snapshot.catalog.topic_in_rating_range(
+                topic,
+                user_rating - WEAK_TOPIC_RATING_WINDOW,
+                user_rating + WEAK_TOPIC_RATING_WINDOW,
+            )
+            wanted = min(WEAK_TOPIC_PROBLEMS, count - len(picked))
+
+            def skip(o: int) -> bool:
+                return seen is not None and o in seen
+
+            if strategy == "diverse":
+                ordinals = snapshot.diversity_selector.select_from(
+                    candidates,
+                    wanted,
+                    count,
+                    skip,
+                    taken=list(picked),
+                    source_mix=source_mix,
+                )
+            else:
+                ordinals = _sample_ordinals(
+                    candidates, wanted, lambda o: o in picked or skip(o)
+                )
+            for ordinal in ordinals:
+                picked[ordinal] = topic
+        return picked
+
+    def prefill_pools(self) -> None:
+        """Queue background refills of every title/traits pool band."""
+        self.title_pool.prefill()
+        self.traits_pool.prefill()
+
+    def generate_title(self, user_stats: Dict[str, int], level: int = 1) -> str:
+        return (
+            self.title_pool.draw(level_band(level))
+            or self._llm_title(user_stats)
+            or self._generate_fallback_title()
+        )
+
+    def start_title(self, user_stats: Dict[str, int], level: int = 1) -> "PendingTitle":
+        """
+        Get a title for a new contest: from the level band's pool when it has
+        one, otherwise by starting an LLM call in the background (see
+        PendingTitle).
+        """
+        deadline = time.monotonic() + TITLE_DEADLINE_SECONDS
+        pooled = self.title_pool.draw(level_band(level))
+        if pooled:
+            return PendingTitle.resolved(pooled, deadline)
+        if not self.client:
+            return PendingTitle(None, deadline)
+        return PendingTitle(_llm_executor.submit(self._llm_title, user_stats), deadline)
+
+    def _llm_title_batch(self, band: int, count: int) -> List[str]:
+        """One model call producing ``count`` titles for the level band's pool."""
+        if not self.client:
+            return []
+        low = band * LEVEL_BAND_SIZE
+        prompt = f"""Generate {count} distinct, creative, epic titles for boss missions/contests in a competitive programming game.
+The players are around level {low}-{low + LEVEL_BAND_SIZE - 1}.
 
-        return random.sample(eligible_problems, count)
+Make each sound like an epic quest or boss battle. Keep each short (3-6 words).
+Return ONLY a JSON array of {count} strings, no markdown, no explanation."""
 
-    def generate_title(self, user_stats: Dict[str, int]) -> str:
+        text = self.generate_text(
+            prompt, max_output_tokens=20 * count + 50, temperature=1.0, purpose="title_batch"
+        )
+        titles = json.loads(strip_code_fence(text))
+        return [
+            t.strip().strip('"').strip("'")
+            for t in titles
+            if isinstance(t, str) and t.strip()
+        ]
+
+    def _llm_title(self, user_stats: Dict[str, int]) -> Optional[str]:
+        key = stats_signature("title", user_stats)
+        cached = self.llm_cache.get(key)
+        if cached:
+            return cached
         if not self.client:
-            return self._generate_fallback_title()
+            return None
 
         try:
             stats_summary = ", ".join(
@@ -71,19 +312,19 @@ class ContestGenerator:
             Make it sound like an epic quest or boss battle. Keep it short (3-6 words).
             Just return the title, nothing else. No quotes, no explanation."""
 
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash-preview-05-20",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    max_output_tokens=50,
-                    temperature=0.9,
-                ),
+            text = self.generate_text(
+                prompt, max_output_tokens=50, temperature=0.9, purpose="title"
             )
-            return response.text.strip().strip('"').strip("'")
-        except Exception:
-            return self._generate_fallback_title()
+            title = text.strip().strip('"').strip("'")
+            if title:
+                self.llm_cache.put(key, "title", title)
+            return title or None
+        except Exception as e:
+            print(f"Error generating title: {e}")
+            return None
 
     def _generate_fallback_title(self) -> str:
+        LLM_FALLBACKS.inc(purpose="title")
         prefixes = [
             "The Shadow",
             "Trial of the",
@@ -109,15 +350,74 @@ class ContestGenerator:
         return f"{random.choice(prefixes)} {random.choice(themes)}"
 
     def generate_contest(
-        self, user_id: str, user_rating: int, user_stats: Dict[str, int]
+        self,
+        user_id: str,
+        user_rating: int,
+        user_stats: Dict[str, int],
+        weak_topics: Optional[List[str]] = None,
+        seen: Optional[SeenSet] = None,
+        strategy: str = "uniform",
+        source_mix: Optional[Dict[str, int]] = None,
+        count: int = 4,
+        snapshot: Optional[CatalogSnapshot] = None,
+        title: Optional["PendingTitle"] = None,
     ) -> Dict:
-        questions = self.select_random_questions(user_rating, count=4)
-        title = self.generate_title(user_stats)
+        """
+        Build a contest for the user. Pass the ``snapshot`` that ``seen`` was
+        loaded against so a concurrent catalog reload can't mix ordinals.
+
+        ``title`` is a PendingTitle started earlier in the request (one is
+        started here otherwise). If it misses its deadline the contest gets
+        a fallback title and ``pendingTitle`` is set so the caller can patch
+        the real one in when it arrives.
+        """
+        # Validate before a title call is started on the model's behalf
+        if strategy not in SAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy: {strategy}")
+        # Same level formula as the contests router
+        title = title or self.start_title(user_stats, level=user_rating // 10 + 1)
+        weights = (
+            topic_weights(user_stats, weak_topics or [])
+            if strategy == "weighted"
+            else None
+        )
+
+        snapshot = snapshot or self.snapshot
+        weak_picks = self._select_weak_topic_ordinals(
+            snapshot,
+            weak_topics or [],
+            user_rating,
+            count,
+            seen=seen,
+            strategy=strategy,
+            source_mix=source_mix,
+        )
+        ordinals = list(weak_picks) + self._select_random_ordinals(
+            snapshot,
+            user_rating,
+            count - len(weak_picks),
+            exclude=weak_picks,
+            seen=seen,
+            strategy=strategy,
+            weights=weights,
+            source_mix=source_mix,
+        )
+
+        questions = []
+        for ordinal in ordinals:
+            question = snapshot.catalog.problem(ordinal)
+            if ordinal in weak_picks:
+                question["topic"] = weak_picks[ordinal]
+                question["is_weak_topic_problem"] = True
+            questions.append(question)
+
+        llm_title = title.result()
 
         question_states = {q["id"]: 0 for q in questions}
 
         return {
-            "title": title,
+            "title": llm_title or self._generate_fallback_title(),
+            "pendingTitle": title if llm_title is None and title.future else None,
             "questions": questions,
             "questionStates": question_states,
             "ratingBefore": user_rating,
@@ -131,19 +431,61 @@ class ContestGenerator:
         current_traits: List[str],
         solved_count: int,
     ) -> Tuple[List[str], Optional[str]]:
-        if not self.client:
-            return self._generate_fallback_traits_and_title(current_level, solved_count)
-
+        # A pooled reward set that only repeats traits the user already has
+        # is discarded; give up on the pool after a few of those
+        band = level_band(current_level)
+        for _ in range(3):
+            pooled = self.traits_pool.draw(band)
+            if pooled is None:
+                break
+            unique_traits = [t for t in pooled["traits"] if t not in current_traits]
+            if unique_traits:
+                return unique_traits[:2], pooled["title"]
+
+        # Keyed on bucketed stats, not current traits: duplicates of traits the
+        # user already has are filtered out below either way
+        key = stats_signature(
+            "traits", user_stats, level=current_level, solved_count=solved_count
+        )
         try:
-            stats_summary = ", ".join(
-                [f"{tag}: {count}" for tag, count in sorted(user_stats.items(), key=lambda x: -x[1])[:10]]
+            cached = self.llm_cache.get(key)
+            if cached is None and not self.client:
+                return self._generate_fallback_traits_and_title(current_level, solved_count)
+
+            response_text = cached or self._llm_traits_text(
+                user_stats, current_level, current_traits, solved_count
             )
-            if not stats_summary:
-                stats_summary = "Beginner with limited experience"
+            result = json.loads(response_text)
+            if cached is None:
+                self.llm_cache.put(key, "traits", response_text)
 
-            existing_traits = ", ".join(current_traits) if current_traits else "None yet"
+            new_traits = result.get("traits", [])
+            new_title = result.get("title")
 
-            prompt = f"""You are generating character progression for a competitive programming game player.
+            unique_traits = [t for t in new_traits if t not in current_traits]
+
+            return unique_traits[:2], new_title
+
+        except Exception as e:
+            print(f"Error generating traits: {e}")
+            return self._generate_fallback_traits_and_title(current_level, solved_count)
+
+    def _llm_traits_text(
+        self,
+        user_stats: Dict[str, int],
+        current_level: int,
+        current_traits: List[str],
+        solved_count: int,
+    ) -> str:
+        stats_summary = ", ".join(
+            [f"{tag}: {count}" for tag, count in sorted(user_stats.items(), key=lambda x: -x[1])[:10]]
+        )
+        if not stats_summary:
+            stats_summary = "Beginner with limited experience"
+
+        existing_traits = ", ".join(current_traits) if current_traits else "None yet"
+
+        prompt = f"""You are generating character progression for a competitive programming game player.
 
 Player Stats:
 - Level: {current_level}
@@ -161,37 +503,41 @@ Return ONLY valid JSON in this exact format, no markdown, no explanation:
 If no new title is warranted, use null for title.
 Make traits unique and not duplicate existing ones."""
 
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash-preview-05-20",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    max_output_tokens=150,
-                    temperature=0.8,
-                ),
-            )
+        text = self.generate_text(
+            prompt, max_output_tokens=150, temperature=0.8, purpose="traits"
+        )
 
-            response_text = response.text.strip()
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
+        return strip_code_fence(text)
 
-            result = json.loads(response_text)
-            new_traits = result.get("traits", [])
-            new_title = result.get("title")
+    def _llm_traits_batch(self, band: int, count: int) -> List[Dict]:
+        """One model call producing ``count`` trait sets for the band's pool."""
+        if not self.client:
+            return []
+        low = band * LEVEL_BAND_SIZE
+        prompt = f"""You are generating character progression rewards for competitive programming game players.
+The players are around level {low}-{low + LEVEL_BAND_SIZE - 1}.
 
-            unique_traits = [t for t in new_traits if t not in current_traits]
+Generate {count} distinct reward sets, each with 1-2 traits and optionally a title.
+Traits should be short, epic-sounding attributes (e.g., "Binary Sage", "Loop Breaker", "Greedy Tactician").
+Titles should be epic character titles; use null for the title in about half the sets.
 
-            return unique_traits[:2], new_title
+Return ONLY a JSON array of {count} objects in this exact format, no markdown, no explanation:
+[{{"traits": ["trait1", "trait2"], "title": "Epic Title Here"}}]"""
 
-        except Exception as e:
-            print(f"Error generating traits: {e}")
-            return self._generate_fallback_traits_and_title(current_level, solved_count)
+        text = self.generate_text(
+            prompt, max_output_tokens=40 * count + 50, temperature=1.0, purpose="traits_batch"
+        )
+        reward_sets = json.loads(strip_code_fence(text))
+        return [
+            {"traits": r["traits"], "title": r.get("title")}
+            for r in reward_sets
+            if isinstance(r, dict) and isinstance(r.get("traits"), list) and r["traits"]
+        ]
 
     def _generate_fallback_traits_and_title(
         self, current_level: int, solved_count: int
     ) -> Tuple[List[str], Optional[str]]:
+        LLM_FALLBACKS.inc(purpose="traits")
         trait_pool = [
             "Algorithm Adept",
             "Code Warrior",
@@ -232,14 +578,97 @@ Make traits unique and not duplicate existing ones."""
 
         return new_traits, new_title
 
-    @staticmethod
-    def get_all_tags() -> List[str]:
+    def get_all_tags(self) -> List[str]:
+        return self.catalog.tags
+
+
+class PendingTitle:
+    """
+    An LLM contest title being generated on the background pool.
+
+    ``result()`` never blocks past the deadline fixed when generation
+    started; callers fall back to a canned title and can use ``on_ready``
+    to receive the real one if it turns up later.
+    """
+
+    def __init__(self, future: Optional[Future], deadline: float):
+        self.future = future
+        self.deadline = deadline
+
+    @classmethod
+    def resolved(cls, title: str, deadline: float) -> "PendingTitle":
+        future: Future = Future()
+        future.set_result(title)
+        return cls(future, deadline)
+
+    def result(self) -> Optional[str]:
+        if self.future is None:
+            return None
         try:
-            with open(PROBLEMS_FILE, "r") as f:
-                data = json.load(f)
-                tags = set()
-                for problem in data.get("problems", []):
-                    tags.update(problem.get("tags", []))
-                return sorted(list(tags))
-        except FileNotFoundError:
-            return []
+            return self.future.result(timeout=max(0.0, self.deadline - time.monotonic()))
+        except FutureTimeoutError:
+            return None
+
+    def on_ready(self, callback: Callable[[str], None]) -> None:
+        """Call ``callback(title)`` once the LLM produces a title (never on failure)."""
+
+        def done(future: Future) -> None:
+            title = None if future.cancelled() else future.result()
+            if title:
+                callback(title)
+
+        if self.future is not None:
+            self.future.add_done_callback(done)
+
+
+def strip_code_fence(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("```")[1]
+        if text.startswith("json"):
+            text = text[4:]
+        text = text.strip()
+    return text
+
+
+_llm_executor = ThreadPoolExecutor(max_workers=LLM_MAX_WORKERS, thread_name_prefix="llm")
+_pool_executor = ThreadPoolExecutor(
+    max_workers=LLM_POOL_WORKERS, thread_name_prefix="llm-pool"
+)
+
+
+def _sample_ordinals(
+    candidates: Sequence[int], k: int, skip: Callable[[int], bool]
+) -> List[int]:
+    """
+    Draw up to ``k`` distinct candidates for which ``skip`` is false.
+
+    Random probing handles the usual case where most candidates are eligible;
+    if probing stalls, a single pass over the (rating-bounded) candidates
+    finishes the draw.
+    """
+    picked: List[int] = []
+    n = len(candidates)
+    if k <= 0 or n == 0:
+        return picked
+
+    tried = set()
+    for _ in range(4 * k + 8):
+        if len(picked) == k or len(tried) == n:
+            return picked
+        i = random.randrange(n)
+        if i in tried:
+            continue
+        tried.add(i)
+        if not skip(candidates[i]):
+            picked.append(candidates[i])
+
+    if len(picked) < k:
+        rest = [
+            c for j, c in enumerate(candidates) if j not in tried and not skip(c)
+        ]
+        picked += random.sample(rest, min(k - len(picked), len(rest)))
+    return picked
+
+
+contest_generator = ContestGenerator()
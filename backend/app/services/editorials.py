@@ -0,0 +1,83 @@
+import os
+import re
+from typing import Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+
+# Editorial text handed to the model is cut to this many characters
+EDITORIAL_MAX_CHARS = 6000
+EDITORIAL_TIMEOUT_SECONDS = 10
+
+CODEFORCES_PROBLEM_URL = re.compile(
+    r"codeforces\.com/(?:problemset/problem|contest)/(\d+)/(?:problem/)?([A-Za-z]\d?)"
+)
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:146.0) Gecko/20100101 Firefox/146.0"
+
+
+def fetch_editorial(problem_url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Best-effort ``(editorial_text, editorial_url)`` for a problem.
+
+    Only Codeforces is supported: the contest page's first blog link is
+    taken as the tutorial, and the section for the problem's letter is
+    extracted when it can be found. CODEFORCES_COOKIES is sent if set (see
+    scripts/fetch_codeforces_editorial.py). Any failure gives ``(None,
+    None)``; reflections are then written from the problem alone.
+    """
+    match = CODEFORCES_PROBLEM_URL.search(problem_url or "")
+    if not match:
+        return None, None
+    contest_id, letter = match.group(1), match.group(2).upper()
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    for item in os.getenv("CODEFORCES_COOKIES", "").split(";"):
+        key, sep, value = item.strip().partition("=")
+        if sep:
+            session.cookies.set(key, value)
+
+    try:
+        response = session.get(
+            f"https://codeforces.com/contest/{contest_id}",
+            timeout=EDITORIAL_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        link = BeautifulSoup(response.text, "html.parser").find(
+            "a", href=re.compile(r"/blog/entry/\d+")
+        )
+        if not link:
+            return None, None
+        editorial_url = f"https://codeforces.com{link['href']}"
+
+        response = session.get(editorial_url, timeout=EDITORIAL_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        content = BeautifulSoup(response.text, "html.parser").find(
+            "div", {"class": "ttypography"}
+        )
+        if not content:
+            return None, editorial_url
+    except requests.RequestException as e:
+        print(f"Error fetching editorial for {problem_url}: {e}")
+        return None, None
+
+    text = content.get_text(separator="\n", strip=True)
+    return _problem_section(text, letter)[:EDITORIAL_MAX_CHARS], editorial_url
+
+
+def _problem_section(text: str, letter: str) -> str:
+    """The part of a contest-wide editorial about problem ``letter``, if marked."""
+    start = re.compile(rf"^(?:{letter}[.\s]|Problem\s+{letter}\b)", re.IGNORECASE)
+    next_letter = chr(ord(letter[0]) + 1)
+    end = re.compile(rf"^(?:{next_letter}[.\s]|Problem\s+{next_letter}\b)", re.IGNORECASE)
+
+    section = []
+    for line in text.split("\n"):
+        if not section:
+            if start.match(line):
+                section.append(line)
+        elif end.match(line):
+            break
+        else:
+            section.append(line)
+    return "\n".join(section) if section else text
@@ -0,0 +1,174 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from app.metrics import Counter
+
+# Entries are served for this long before the model is asked again
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# Entries kept in the per-process LRU tier
+LLM_CACHE_SIZE = 1024
+# Tags that make it into a stats signature
+SIGNATURE_TOP_TAGS = 3
+
+LLM_CACHE_LOOKUPS = Counter(
+    "llm_cache_lookups_total",
+    "LLM response cache lookups by result (memory_hit, db_hit, miss)",
+    ["result"],
+)
+LLM_CACHE_ERRORS = Counter(
+    "llm_cache_errors_total",
+    "LLM cache tier operations that failed and were treated as misses or dropped",
+    ["operation"],
+)
+
+
+def stats_signature(
+    kind: str,
+    user_stats: Dict[str, int],
+    level: Optional[int] = None,
+    solved_count: Optional[int] = None,
+) -> str:
+    """
+    Cache key for a prompt built from ``user_stats``.
+
+    Only the top SIGNATURE_TOP_TAGS tags count, and each tag's solved count
+    is bucketed by powers of four (1-3, 4-15, 16-63, ...), so users whose
+    profiles differ by a few problems share an entry. The level is bucketed
+    in fives, matching the title tiers in contests._user_title.
+    """
+    top = sorted(
+        ((tag, count) for tag, count in user_stats.items() if count > 0),
+        key=lambda item: (-item[1], item[0]),
+    )[:SIGNATURE_TOP_TAGS]
+    buckets = sorted(f"{tag}:{(count.bit_length() + 1) // 2}" for tag, count in top)
+    parts = [kind, *buckets]
+    if level is not None:
+        parts.append(f"level:{level // 5}")
+    if solved_count is not None:
+        parts.append(f"solved:{solved_count}")
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Two-tier cache for LLM responses: a per-process LRU in front of the
+    llm_cache table, which is shared by every worker and survives restarts.
+
+    Without a ``session_factory`` only the LRU tier is used. DB errors are
+    logged and treated as misses so a cache outage never fails a request.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        size: int = LLM_CACHE_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.size = size
+        self._lru: "OrderedDict[str, Tuple[str, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "db_hits": 0, "misses": 0, "writes": 0}
+
+    def get(self, key: str) -> Optional[str]:
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and entry[1] > now:
+                self._lru.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                LLM_CACHE_LOOKUPS.inc(result="memory_hit")
+                return entry[0]
+
+        entry = self._db_get(key, now)
+        with self._lock:
+            if entry is None:
+                self.counters["misses"] += 1
+                LLM_CACHE_LOOKUPS.inc(result="miss")
+                return None
+            self.counters["db_hits"] += 1
+            LLM_CACHE_LOOKUPS.inc(result="db_hit")
+            self._remember(key, entry)
+        return entry[0]
+
+    def put(self, key: str, kind: str, value: str) -> None:
+        expires_at = datetime.utcnow() + self.ttl
+        with self._lock:
+            self.counters["writes"] += 1
+            self._remember(key, (value, expires_at))
+        self._db_put(key, kind, value, expires_at)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            counters = dict(self.counters)
+            counters["entries_in_memory"] = len(self._lru)
+        lookups = counters["memory_hits"] + counters["db_hits"] + counters["misses"]
+        hits = counters["memory_hits"] + counters["db_hits"]
+        counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return counters
+
+    def _remember(self, key: str, entry: Tuple[str, datetime]) -> None:
+        # Caller holds self._lock
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    def _db_get(self, key: str, now: datetime) -> Optional[Tuple[str, datetime]]:
+        if self.session_factory is None:
+            return None
+        # Imported here: app.models needs a configured database, and the
+        # generator (and with it this module) is also used DB-less by scripts
+        from app.models import LLMCacheEntry
+
+        db = self.session_factory()
+        try:
+            row = (
+                db.query(LLMCacheEntry.value, LLMCacheEntry.expires_at)
+                .filter(LLMCacheEntry.key == key, LLMCacheEntry.expires_at > now)
+                .first()
+            )
+            return (row.value, row.expires_at) if row else None
+        except Exception as e:
+            print(f"Error reading LLM cache: {e}")
+            LLM_CACHE_ERRORS.inc(operation="read")
+            return None
+        finally:
+            db.close()
+
+    def _db_put(self, key: str, kind: str, value: str, expires_at: datetime) -> None:
+        if self.session_factory is None:
+            return
+        from app.database import dialect_insert
+        from app.models import LLMCacheEntry
+
+        db = self.session_factory()
+        try:
+            # Workers racing on the same key each overwrite the entry, so
+            # the unique key never turns a concurrent write into an error
+            now = datetime.utcnow()
+            stmt = dialect_insert(db)(LLMCacheEntry).values(
+                key=key, kind=kind, value=value, created_at=now, expires_at=expires_at
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LLMCacheEntry.key],
+                set_={
+                    "kind": stmt.excluded.kind,
+                    "value": stmt.excluded.value,
+                    "created_at": stmt.excluded.created_at,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+            )
+            db.execute(stmt)
+            db.commit()
+        except Exception as e:
+            print(f"Error writing LLM cache: {e}")
+            LLM_CACHE_ERRORS.inc(operation="write")
+            db.rollback()
+        finally:
+            db.close()
@@ -0,0 +1,132 @@
+import os
+import time
+from typing import Optional
+
+from google.genai import types
+
+from app.metrics import Counter, Histogram
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# USD per million tokens, for the llm_cost_usd_total estimate; set these to
+# the configured model's list price (thinking tokens bill as output)
+LLM_PRICE_INPUT_PER_MTOK = float(os.getenv("LLM_PRICE_INPUT_PER_MTOK", "0.15"))
+LLM_PRICE_OUTPUT_PER_MTOK = float(os.getenv("LLM_PRICE_OUTPUT_PER_MTOK", "0.60"))
+
+# Purposes whose callers wait on the answer within a deadline. Only their
+# latency feeds the breaker's p95 check; pool refills and reflections run in
+# the background and are slower by design
+LATENCY_CHECKED_PURPOSES = frozenset({"title", "traits"})
+
+LLM_CALLS = Counter(
+    "llm_calls_total",
+    "Model calls by purpose and outcome (ok, error, rejected by the breaker)",
+    ["purpose", "outcome"],
+)
+LLM_SECONDS = Histogram(
+    "llm_request_seconds",
+    "Wall time of model calls that reached the API, successful or not",
+    ["purpose"],
+)
+LLM_PROMPT_CHARS = Counter(
+    "llm_prompt_chars_total", "Characters sent in prompts", ["purpose"]
+)
+LLM_RESPONSE_CHARS = Counter(
+    "llm_response_chars_total", "Characters received in responses", ["purpose"]
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by the API (prompt, output, thinking)",
+    ["purpose", "type"],
+)
+LLM_COST = Counter(
+    "llm_cost_usd_total",
+    "Estimated spend from reported token usage and LLM_PRICE_*",
+    ["purpose"],
+)
+LLM_FALLBACKS = Counter(
+    "llm_fallbacks_total",
+    "Times a static fallback was served instead of model output",
+    ["purpose"],
+)
+
+
+class LLMClient:
+    """
+    The one place model calls go through.
+
+    Wraps the genai client with the circuit breaker and records, per call
+    purpose, latency, prompt/response size, token usage and estimated cost,
+    so LLM time and spend show up on /metrics separately from request
+    latency. Cache hits are counted by LLMCache and fallbacks by the
+    callers that serve them (see ``LLM_FALLBACKS``).
+    """
+
+    def __init__(self, client, model: str, breaker: Optional[CircuitBreaker] = None):
+        self.client = client
+        self.model = model
+        # Fails model calls fast while the API is erroring or slow, so callers
+        # go straight to their fallbacks instead of waiting out the timeout
+        self.breaker = breaker or CircuitBreaker("gemini")
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    def available(self) -> bool:
+        """Whether a call made now would reach the model: configured and not rejected."""
+        return self.enabled and self.breaker.allows_calls()
+
+    def generate(
+        self, prompt: str, purpose: str, max_output_tokens: int, temperature: float
+    ) -> str:
+        """
+        Model text for ``prompt`` (empty if the model returned none). Raises
+        CircuitOpenError while the breaker is open, RuntimeError without a
+        client, and whatever the API raised otherwise.
+        """
+        if self.client is None:
+            raise RuntimeError("Gemini client is not configured")
+        LLM_PROMPT_CHARS.inc(len(prompt), purpose=purpose)
+        t0 = time.perf_counter()
+        try:
+            response = self.breaker.call(
+                lambda: self.client.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        max_output_tokens=max_output_tokens,
+                        temperature=temperature,
+                    ),
+                ),
+                check_latency=purpose in LATENCY_CHECKED_PURPOSES,
+            )
+        except CircuitOpenError:
+            LLM_CALLS.inc(purpose=purpose, outcome="rejected")
+            raise
+        except Exception:
+            LLM_SECONDS.observe(time.perf_counter() - t0, purpose=purpose)
+            LLM_CALLS.inc(purpose=purpose, outcome="error")
+            raise
+        LLM_SECONDS.observe(time.perf_counter() - t0, purpose=purpose)
+        LLM_CALLS.inc(purpose=purpose, outcome="ok")
+
+        text = response.text or ""
+        LLM_RESPONSE_CHARS.inc(len(text), purpose=purpose)
+        self._record_usage(purpose, response.usage_metadata)
+        return text
+
+    @staticmethod
+    def _record_usage(purpose: str, usage) -> None:
+        if usage is None:
+            return
+        prompt_tokens = usage.prompt_token_count or 0
+        output_tokens = usage.candidates_token_count or 0
+        thinking_tokens = usage.thoughts_token_count or 0
+        LLM_TOKENS.inc(prompt_tokens, purpose=purpose, type="prompt")
+        LLM_TOKENS.inc(output_tokens, purpose=purpose, type="output")
+        LLM_TOKENS.inc(thinking_tokens, purpose=purpose, type="thinking")
+        cost = (
+            prompt_tokens * LLM_PRICE_INPUT_PER_MTOK
+            + (output_tokens + thinking_tokens) * LLM_PRICE_OUTPUT_PER_MTOK
+        ) / 1_000_000
+        LLM_COST.inc(cost, purpose=purpose)
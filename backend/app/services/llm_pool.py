@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from app.metrics import Counter, Gauge, Histogram
+
+T = TypeVar("T")
+
+# Levels per band (matching the title tiers in contests._user_title)
+LEVEL_BAND_SIZE = 5
+# Highest band; every level above it shares the top band's pool
+MAX_LEVEL_BAND = 10
+# Items kept per band, and the depth at which a refill is started
+POOL_TARGET_DEPTH = int(os.getenv("LLM_POOL_TARGET_DEPTH", "20"))
+POOL_LOW_WATER = int(os.getenv("LLM_POOL_LOW_WATER", "5"))
+# After a failed refill, a band isn't retried for this many seconds
+POOL_RETRY_SECONDS = 30
+
+POOL_DEPTH = Gauge(
+    "llm_pool_depth",
+    "Pre-generated LLM items currently pooled",
+    ["kind", "band"],
+)
+POOL_REFILL_SECONDS = Histogram(
+    "llm_pool_refill_seconds",
+    "Latency of one batched pool refill call",
+    ["kind"],
+)
+POOL_REFILL_FAILURES = Counter(
+    "llm_pool_refill_failures_total",
+    "Pool refills that raised or returned nothing",
+    ["kind"],
+)
+POOL_DRAWS = Counter(
+    "llm_pool_draws_total",
+    "Pool draws, by whether an item was available",
+    ["kind", "result"],
+)
+
+_pools: List["LLMPool"] = []
+
+
+def level_band(level: int) -> int:
+    return min(max(level, 0) // LEVEL_BAND_SIZE, MAX_LEVEL_BAND)
+
+
+class LLMPool(Generic[T]):
+    """
+    Per-level-band queues of pre-generated LLM output.
+
+    ``draw()`` pops one item in O(1) and never calls the model. When a band
+    falls to POOL_LOW_WATER items a refill is queued on ``executor``; the
+    refill makes one batched ``fetch(band, n)`` call for all the missing
+    items. At most one refill per band is in flight at a time.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        fetch: Callable[[int, int], List[T]],
+        executor: Executor,
+        target_depth: int = POOL_TARGET_DEPTH,
+        low_water: int = POOL_LOW_WATER,
+    ):
+        self.kind = kind
+        self.fetch = fetch
+        self.executor = executor
+        self.target_depth = target_depth
+        self.low_water = low_water
+        self.enabled = True
+        self._items: Dict[int, deque] = {
+            band: deque() for band in range(MAX_LEVEL_BAND + 1)
+        }
+        self._refilling: set = set()
+        self._retry_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        _pools.append(self)
+
+    def draw(self, band: int) -> Optional[T]:
+        with self._lock:
+            items = self._items[band]
+            item = items.popleft() if items else None
+            low = len(items) <= self.low_water
+        POOL_DRAWS.inc(kind=self.kind, result="hit" if item is not None else "empty")
+        if low:
+            self.refill(band)
+        return item
+
+    def depth(self, band: int) -> int:
+        return len(self._items[band])
+
+    def refill(self, band: int) -> None:
+        """Queue a background refill of ``band`` unless one is already running."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if band in self._refilling:
+                return
+            if time.monotonic() < self._retry_at.get(band, 0):
+                return
+            self._refilling.add(band)
+        self.executor.submit(self._refill, band)
+
+    def prefill(self) -> None:
+        for band in self._items:
+            self.refill(band)
+
+    def _refill(self, band: int) -> None:
+        try:
+            wanted = self.target_depth - self.depth(band)
+            if wanted <= 0:
+                return
+            t0 = time.perf_counter()
+            try:
+                items = self.fetch(band, wanted)
+            except Exception as e:
+                print(f"Error refilling {self.kind} pool (band {band}): {e}")
+                items = []
+            POOL_REFILL_SECONDS.observe(time.perf_counter() - t0, kind=self.kind)
+            if not items:
+                POOL_REFILL_FAILURES.inc(kind=self.kind)
+                self._retry_at[band] = time.monotonic() + POOL_RETRY_SECONDS
+                return
+            with self._lock:
+                self._items[band].extend(items[:wanted])
+        finally:
+            with self._lock:
+                self._refilling.discard(band)
+
+
+def _pool_depths() -> Dict[Tuple[str, ...], float]:
+    depths: Dict[Tuple[str, ...], float] = {}
+    for pool in _pools:
+        for band in pool._items:
+            key = (pool.kind, str(band))
+            depths[key] = depths.get(key, 0) + pool.depth(band)
+    return depths
+
+
+POOL_DEPTH.callback = _pool_depths
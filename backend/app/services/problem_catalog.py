@@ -0,0 +1,439 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Internal ratings live on the 1-100 scale produced by standardize_difficulty.py
+MAX_RATING = 100
+
+# Binary artifact layout: MAGIC, a little-endian u32 header length, a JSON
+# header (counts, vocabularies, section directory), then 8-byte aligned
+# native-order array sections that are mapped in place by ProblemCatalog.open.
+MAGIC = b"COICAT04"
+SECTION_ALIGN = 8
+
+# Variable-length string fields kept in the string heap, in record order
+STRING_FIELDS = ("id", "name", "url", "original_difficulty")
+# Term-list fields; every term is interned once in the shared vocabulary
+TERM_FIELDS = ("tags", "primary_skills", "secondary_skills")
+
+
+class ProblemCatalog:
+    """
+    Read-only, columnar problem table ordered by ``internal_rating``.
+
+    Problems are stored sorted by rating, so every rating range maps to one
+    contiguous ordinal slice ``[start, end)``. ``bucket_offsets[r]`` holds the
+    first ordinal whose rating is ``>= r``, which turns a range lookup into
+    two array reads instead of a scan over the whole catalog.
+
+    Nothing is kept per problem as a Python object: ratings, sources and
+    patterns are typed arrays, strings live in a single UTF-8 heap, and
+    tags/skills are ids into an interned vocabulary. ``problem()`` builds a
+    plain dict on demand for the handful of problems a contest actually uses.
+    The platform-specific ``extra`` payload is not retained.
+    """
+
+    def __init__(
+        self,
+        ratings,
+        bucket_offsets,
+        source_ids,
+        sources: List[str],
+        pattern_ids,
+        patterns: List[Optional[str]],
+        string_offsets,
+        string_heap,
+        term_offsets: Dict[str, object],
+        term_ids: Dict[str, object],
+        terms: List[str],
+        tag_counts,
+        topics: List[str],
+        topic_offsets,
+        topic_postings,
+        id_order,
+        version: str,
+    ):
+        self.ratings = ratings
+        self.bucket_offsets = bucket_offsets
+        self.source_ids = source_ids
+        self.sources = sources
+        self.pattern_ids = pattern_ids
+        self.patterns = patterns
+        self.string_offsets = string_offsets
+        self.string_heap = string_heap
+        self.term_offsets = term_offsets
+        self.term_ids = term_ids
+        self.terms = terms
+        self.tag_counts = tag_counts
+        self.topics = topics
+        self.topic_offsets = topic_offsets
+        self.topic_postings = topic_postings
+        self.id_order = id_order
+        self.version = version
+        self._mmap = None
+        self._postings_view = memoryview(topic_postings)
+        self.topic_index: Dict[str, int] = {topic: i for i, topic in enumerate(topics)}
+
+        # Tag vocabulary: term id <-> tag, plus the sorted tag list and an ETag
+        # for it, derived once so tag lookups never touch the problem rows
+        self.term_index: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.tags: List[str] = sorted(t for i, t in enumerate(terms) if tag_counts[i])
+        digest = hashlib.sha1()
+        for tag in self.tags:
+            digest.update(f"{tag}\t{self.tag_count(tag)}\n".encode("utf-8"))
+        self.tags_etag = f'"{digest.hexdigest()[:20]}"'
+
+    @classmethod
+    def from_problems(cls, problems: Iterable[Dict]) -> "ProblemCatalog":
+        problems = list(problems)
+        order = sorted(
+            range(len(problems)),
+            key=lambda i: _clamp_rating(problems[i].get("internal_rating", 0)),
+        )
+
+        ratings = array("H")
+        source_ids = array("B")
+        pattern_ids = array("H")
+        string_offsets = array("I", [0])
+        heap = bytearray()
+        term_offsets = {field: array("I", [0]) for field in TERM_FIELDS}
+        term_ids = {field: array("H") for field in TERM_FIELDS}
+
+        sources: List[str] = []
+        source_index: Dict[str, int] = {}
+        patterns: List[Optional[str]] = [None]
+        pattern_index: Dict[Optional[str], int] = {None: 0}
+        terms: List[str] = []
+        term_index: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+
+        for ordinal, i in enumerate(order):
+            p = problems[i]
+            ratings.append(_clamp_rating(p.get("internal_rating", 0)))
+            source_ids.append(_intern(p.get("source") or "unknown", sources, source_index))
+            pattern_ids.append(_intern(p.get("pattern_id"), patterns, pattern_index))
+
+            for field in STRING_FIELDS:
+                heap += (p.get(field) or "").encode("utf-8")
+                string_offsets.append(len(heap))
+
+            for field in TERM_FIELDS:
+                ids = term_ids[field]
+                ids.extend(_intern(t, terms, term_index) for t in p.get(field) or [])
+                term_offsets[field].append(len(ids))
+
+            topic_keys = set(p.get("tags") or []) | set(p.get("primary_skills") or [])
+            if p.get("pattern_id"):
+                topic_keys.add(p["pattern_id"])
+            for key in topic_keys:
+                postings.setdefault(key, []).append(ordinal)
+
+        # Inverted topic index over tags, primary skills and pattern ids. Ordinals
+        # are appended in rating order, so each posting list is rating-sorted.
+        topics = sorted(postings)
+        topic_offsets = array("I", [0])
+        topic_postings = array("I")
+        for topic in topics:
+            topic_postings.extend(postings[topic])
+            topic_offsets.append(len(topic_postings))
+
+        # Ordinals sorted by problem id, for id -> ordinal lookups by bisection
+        ids = [problems[i].get("id") or "" for i in order]
+        id_order = array("I", sorted(range(len(ids)), key=ids.__getitem__))
+
+        # Ordinals are only meaningful within one build; anything persisted
+        # against them (e.g. per-user seen sets) is keyed on this version
+        version = hashlib.sha1(string_offsets.tobytes() + heap).hexdigest()[:16]
+
+        tag_counts = array("I", [0] * len(terms))
+        for start, end in zip(term_offsets["tags"], term_offsets["tags"][1:]):
+            for term_id in set(term_ids["tags"][start:end]):
+                tag_counts[term_id] += 1
+
+        bucket_offsets = array(
+            "I", (bisect_left(ratings, r) for r in range(MAX_RATING + 2))
+        )
+
+        return cls(
+            ratings=ratings,
+            bucket_offsets=bucket_offsets,
+            source_ids=source_ids,
+            sources=sources,
+            pattern_ids=pattern_ids,
+            patterns=patterns,
+            string_offsets=string_offsets,
+            string_heap=bytes(heap),
+            term_offsets=term_offsets,
+            term_ids=term_ids,
+            terms=terms,
+            tag_counts=tag_counts,
+            topics=topics,
+            topic_offsets=topic_offsets,
+            topic_postings=topic_postings,
+            id_order=id_order,
+            version=version,
+        )
+
+    # ── Binary artifact ──────────────────────────────────────────────────────
+
+    def _sections(self) -> Dict[str, Tuple[str, object]]:
+        sections = {
+            "ratings": ("H", self.ratings),
+            "bucket_offsets": ("I", self.bucket_offsets),
+            "source_ids": ("B", self.source_ids),
+            "pattern_ids": ("H", self.pattern_ids),
+            "string_offsets": ("I", self.string_offsets),
+            "string_heap": ("B", self.string_heap),
+            "tag_counts": ("I", self.tag_counts),
+            "topic_offsets": ("I", self.topic_offsets),
+            "topic_postings": ("I", self.topic_postings),
+            "id_order": ("I", self.id_order),
+        }
+        for field in TERM_FIELDS:
+            sections[f"term_offsets.{field}"] = ("I", self.term_offsets[field])
+            sections[f"term_ids.{field}"] = ("H", self.term_ids[field])
+        return sections
+
+    def save(self, path: str) -> None:
+        """Write the catalog as a binary artifact that ``open`` can map."""
+        payloads = []
+        directory = {}
+        offset = 0
+        for name, (typecode, column) in self._sections().items():
+            data = bytes(column) if typecode == "B" else column.tobytes()
+            offset = _align(offset)
+            directory[name] = [typecode, offset, len(data)]
+            payloads.append((offset, data))
+            offset += len(data)
+
+        header = json.dumps(
+            {
+                "count": len(self),
+                "version": self.version,
+                "byteorder": sys.byteorder,
+                "sources": self.sources,
+                "patterns": self.patterns,
+                "terms": self.terms,
+                "topics": self.topics,
+                "sections": directory,
+            }
+        ).encode("utf-8")
+        base = _align(len(MAGIC) + 4 + len(header))
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for section_offset, data in payloads:
+                f.seek(base + section_offset)
+                f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, path: str) -> "ProblemCatalog":
+        """
+        Map a binary artifact written by ``save``.
+
+        Columns are memoryviews over a shared read-only mapping, so opening is
+        independent of catalog size and every worker process mapping the same
+        file shares its pages through the OS page cache.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if mapped[: len(MAGIC)] != MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a problem catalog artifact")
+        (header_len,) = struct.unpack_from("<I", mapped, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(mapped[header_start : header_start + header_len])
+        if header["byteorder"] != sys.byteorder:
+            mapped.close()
+            raise ValueError(f"{path} was written on a {header['byteorder']}-endian host")
+
+        base = _align(header_start + header_len)
+        view = memoryview(mapped)
+        columns = {}
+        for name, (typecode, offset, length) in header["sections"].items():
+            columns[name] = view[base + offset : base + offset + length].cast(typecode)
+
+        catalog = cls(
+            ratings=columns["ratings"],
+            bucket_offsets=columns["bucket_offsets"],
+            source_ids=columns["source_ids"],
+            sources=header["sources"],
+            pattern_ids=columns["pattern_ids"],
+            patterns=header["patterns"],
+            string_offsets=columns["string_offsets"],
+            string_heap=columns["string_heap"],
+            term_offsets={f: columns[f"term_offsets.{f}"] for f in TERM_FIELDS},
+            term_ids={f: columns[f"term_ids.{f}"] for f in TERM_FIELDS},
+            terms=header["terms"],
+            tag_counts=columns["tag_counts"],
+            topics=header["topics"],
+            topic_offsets=columns["topic_offsets"],
+            topic_postings=columns["topic_postings"],
+            id_order=columns["id_order"],
+            version=header["version"],
+        )
+        catalog._mmap = mapped
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+    # ── Rating index ─────────────────────────────────────────────────────────
+
+    def rating_range(self, min_rating: int, max_rating: int) -> Tuple[int, int]:
+        """Return the ordinal slice ``[start, end)`` covering the inclusive range."""
+        if min_rating > max_rating or max_rating < 0 or min_rating > MAX_RATING:
+            return 0, 0
+        lo = _clamp_rating(min_rating)
+        hi = _clamp_rating(max_rating)
+        return self.bucket_offsets[lo], self.bucket_offsets[hi + 1]
+
+    def bucket(self, rating: int) -> Tuple[int, int]:
+        """Ordinal slice holding exactly the problems rated ``rating``."""
+        return self.rating_range(rating, rating)
+
+    def count_in_rating_range(self, min_rating: int, max_rating: int) -> int:
+        start, end = self.rating_range(min_rating, max_rating)
+        return end - start
+
+    # ── Topic index ──────────────────────────────────────────────────────────
+
+    def postings(self, topic: str):
+        """Rating-ordered ordinals of problems indexed under ``topic``."""
+        idx = self.topic_index.get(topic)
+        if idx is None:
+            return self._postings_view[0:0]
+        return self._postings_view[self.topic_offsets[idx] : self.topic_offsets[idx + 1]]
+
+    def topic_in_rating_range(self, topic: str, min_rating: int, max_rating: int):
+        """Ordinals for ``topic`` restricted to the inclusive rating range."""
+        postings = self.postings(topic)
+        start, end = self.rating_range(min_rating, max_rating)
+        return postings[bisect_left(postings, start) : bisect_left(postings, end)]
+
+    # ── Column access ────────────────────────────────────────────────────────
+
+    def string_at(self, ordinal: int, field: str) -> str:
+        k = ordinal * len(STRING_FIELDS) + STRING_FIELDS.index(field)
+        start, end = self.string_offsets[k], self.string_offsets[k + 1]
+        return bytes(self.string_heap[start:end]).decode("utf-8")
+
+    def term_ids_at(self, ordinal: int, field: str = "tags"):
+        offsets = self.term_offsets[field]
+        return self.term_ids[field][offsets[ordinal] : offsets[ordinal + 1]]
+
+    def terms_at(self, ordinal: int, field: str = "tags") -> List[str]:
+        return [self.terms[t] for t in self.term_ids_at(ordinal, field)]
+
+    def tag_id(self, tag: str) -> Optional[int]:
+        return self.term_index.get(tag)
+
+    def tag_count(self, tag: str) -> int:
+        """Number of problems carrying ``tag`` in their tag list."""
+        term_id = self.term_index.get(tag)
+        return self.tag_counts[term_id] if term_id is not None else 0
+
+    def problem_id_at(self, ordinal: int) -> str:
+        return self.string_at(ordinal, "id")
+
+    def ordinals_of(self, problem_id: str) -> List[int]:
+        """Every ordinal whose id is ``problem_id`` (USACO ids can repeat)."""
+        pos = bisect_left(self.id_order, problem_id, key=self.problem_id_at)
+        ordinals = []
+        while pos < len(self.id_order):
+            ordinal = self.id_order[pos]
+            if self.problem_id_at(ordinal) != problem_id:
+                break
+            ordinals.append(ordinal)
+            pos += 1
+        return ordinals
+
+    def problem(self, ordinal: int) -> Dict:
+        """Build the dict form of one problem (without ``extra``)."""
+        strings = {field: self.string_at(ordinal, field) for field in STRING_FIELDS}
+        return {
+            "id": strings["id"],
+            "name": strings["name"],
+            "url": strings["url"],
+            "source": self.sources[self.source_ids[ordinal]],
+            "original_difficulty": strings["original_difficulty"] or None,
+            "internal_rating": self.ratings[ordinal],
+            "primary_skills": self.terms_at(ordinal, "primary_skills"),
+            "secondary_skills": self.terms_at(ordinal, "secondary_skills"),
+            "pattern_id": self.patterns[self.pattern_ids[ordinal]],
+            "tags": self.terms_at(ordinal, "tags"),
+        }
+
+    def problems_between(self, start: int, end: int) -> List[Dict]:
+        return [self.problem(i) for i in range(start, end)]
+
+
+class SeenSet:
+    """
+    Set of catalog ordinals backed by a little-endian bitmap.
+
+    Membership is a single byte lookup and counting the seen problems inside
+    a rating slice only touches that slice's bytes, so both stay flat no
+    matter how many problems the user has already played.
+    """
+
+    def __init__(self, data: bytes = b""):
+        self.data = bytearray(data)
+
+    def __contains__(self, ordinal: int) -> bool:
+        byte = ordinal >> 3
+        return byte < len(self.data) and bool(self.data[byte] >> (ordinal & 7) & 1)
+
+    def __len__(self) -> int:
+        return int.from_bytes(self.data, "little").bit_count()
+
+    def add(self, ordinal: int) -> None:
+        byte = ordinal >> 3
+        if byte >= len(self.data):
+            self.data.extend(bytes(byte + 1 - len(self.data)))
+        self.data[byte] |= 1 << (ordinal & 7)
+
+    def count_in(self, start: int, end: int) -> int:
+        """Number of seen ordinals in ``[start, end)``."""
+        if end <= start:
+            return 0
+        window = int.from_bytes(self.data[start >> 3 : (end + 7) >> 3], "little")
+        window >>= start & 7
+        return (window & ((1 << (end - start)) - 1)).bit_count()
+
+    def to_bytes(self, size: int) -> bytes:
+        """Serialize as exactly ``ceil(size / 8)`` bytes for a catalog of ``size``."""
+        length = (size + 7) >> 3
+        return bytes(self.data[:length]).ljust(length, b"\0")
+
+
+def _align(offset: int) -> int:
+    return (offset + SECTION_ALIGN - 1) // SECTION_ALIGN * SECTION_ALIGN
+
+
+def _intern(value, table: list, index: dict) -> int:
+    idx = index.get(value)
+    if idx is None:
+        idx = len(table)
+        table.append(value)
+        index[value] = idx
+    return idx
+
+
+def _clamp_rating(rating) -> int:
+    try:
+        rating = int(rating)
+    except (TypeError, ValueError):
+        return 0
+    return min(max(rating, 0), MAX_RATING)
@@ -0,0 +1,216 @@
+import base64
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.problem_catalog import ProblemCatalog
+
+# Name search is trigram-indexed, so shorter substrings aren't supported
+MIN_QUERY_LENGTH = 3
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ProblemSearchIndex:
+    """
+    Filter/browse index over one ProblemCatalog.
+
+    Every posting list holds ordinals in ascending order, and ordinals are
+    rating-sorted, so a rating window is a bisect on any list and keyset
+    pagination is "ordinals after the cursor". Three families of lists are
+    kept: per source, per tag (from the tag column, so counts agree with
+    /api/problems/tags), and per (tag, source). A filter without a name
+    query therefore resolves to one list, and both its page and its total
+    cost a bisect. Name substrings go through a trigram index on the
+    lowercased UTF-8 names: the query trigram rarest within the rating
+    window provides candidates, which are checked against the name, the
+    source column and a per-problem tag bitmap.
+
+    Like the catalog, nothing is kept per problem as a Python object: the
+    lowercased names are one heap with an offsets array, the tag bitmap is
+    one bytes object, and the trigram postings are one array addressed
+    through a sorted array of trigrams.
+    """
+
+    def __init__(self, catalog: ProblemCatalog):
+        self.catalog = catalog
+
+        by_source: Dict[int, List[int]] = {}
+        by_tag: Dict[int, List[int]] = {}
+        by_tag_source: Dict[Tuple[int, int], List[int]] = {}
+        tag_offsets = catalog.term_offsets["tags"]
+        tag_ids = catalog.term_ids["tags"]
+
+        # Per-problem tag bitmap, one row of tag_bits_width bytes per ordinal,
+        # for checking name-query candidates against a tag filter
+        self.tag_bit = {
+            term_id: i
+            for i, term_id in enumerate(catalog.term_index[tag] for tag in catalog.tags)
+        }
+        self.tag_bits_width = (len(self.tag_bit) + 7) // 8
+        tag_bits = bytearray(self.tag_bits_width * len(catalog))
+
+        name_heap = bytearray()
+        self.name_offsets = array("I", [0])
+        # (trigram, ordinal) pairs, in ordinal order
+        pair_grams = array("I")
+        pair_ordinals = array("I")
+
+        for ordinal in range(len(catalog)):
+            source_id = catalog.source_ids[ordinal]
+            by_source.setdefault(source_id, []).append(ordinal)
+            for term_id in set(tag_ids[tag_offsets[ordinal] : tag_offsets[ordinal + 1]]):
+                by_tag.setdefault(term_id, []).append(ordinal)
+                by_tag_source.setdefault((term_id, source_id), []).append(ordinal)
+                byte, bit = divmod(self.tag_bit[term_id], 8)
+                tag_bits[ordinal * self.tag_bits_width + byte] |= 1 << bit
+            name = catalog.string_at(ordinal, "name").lower().encode("utf-8")
+            name_heap += name
+            self.name_offsets.append(len(name_heap))
+            grams = _trigrams(name)
+            pair_grams.extend(grams)
+            pair_ordinals.extend([ordinal] * len(grams))
+
+        self.by_source = {k: array("I", v) for k, v in by_source.items()}
+        self.by_tag = {k: array("I", v) for k, v in by_tag.items()}
+        self.by_tag_source = {k: array("I", v) for k, v in by_tag_source.items()}
+        self.name_heap = bytes(name_heap)
+        self.tag_bits = bytes(tag_bits)
+
+        # Trigram postings in CSR form: a counting sort of the pairs by
+        # trigram, which keeps each trigram's ordinals in ascending order
+        gram_counts = Counter(pair_grams)
+        self.grams = array("I", sorted(gram_counts))
+        self.gram_offsets = array("I", [0])
+        next_slot: Dict[int, int] = {}
+        for gram in self.grams:
+            next_slot[gram] = self.gram_offsets[-1]
+            self.gram_offsets.append(self.gram_offsets[-1] + gram_counts[gram])
+        gram_postings = array("I", bytes(4 * len(pair_grams)))
+        for gram, ordinal in zip(pair_grams, pair_ordinals):
+            gram_postings[next_slot[gram]] = ordinal
+            next_slot[gram] += 1
+        self.gram_postings = gram_postings
+
+    def _gram_bounds(self, gram: int) -> Optional[Tuple[int, int]]:
+        """The trigram's slice of gram_postings, or None if no name has it."""
+        i = bisect_left(self.grams, gram)
+        if i == len(self.grams) or self.grams[i] != gram:
+            return None
+        return self.gram_offsets[i], self.gram_offsets[i + 1]
+
+    def search(
+        self,
+        min_rating: int = 0,
+        max_rating: int = 100,
+        source: Optional[str] = None,
+        tag: Optional[str] = None,
+        query: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[int], int, Optional[str]]:
+        """
+        Return ``(ordinals, total, next_cursor)`` for one page of problems
+        matching every given filter, in rating order. ``total`` counts all
+        matches, not just this page; ``next_cursor`` is None on the last page.
+        """
+        catalog = self.catalog
+        start, end = catalog.rating_range(min_rating, max_rating)
+        after = self._decode_cursor(cursor) if cursor else -1
+
+        source_id = catalog.sources.index(source) if source in catalog.sources else None
+        tag_id = catalog.tag_id(tag) if tag else None
+        if (source and source_id is None) or (tag and tag_id is None):
+            return [], 0, None
+
+        postings: Sequence[int]
+        if tag_id is not None and source_id is not None:
+            postings = self.by_tag_source.get((tag_id, source_id), ())
+        elif tag_id is not None:
+            postings = self.by_tag.get(tag_id, ())
+        elif source_id is not None:
+            postings = self.by_source.get(source_id, ())
+        else:
+            postings = range(len(catalog))
+        lo, hi = bisect_left(postings, start), bisect_left(postings, end)
+
+        if not query:
+            first = max(lo, bisect_right(postings, after))
+            page = list(postings[first : min(hi, first + limit)])
+            more = first + limit < hi
+            return page, hi - lo, self._encode_cursor(page[-1]) if more else None
+
+        needle = query.lower().encode("utf-8")
+        if len(query) < MIN_QUERY_LENGTH:
+            return [], 0, None
+        bounds = [self._gram_bounds(g) for g in _trigrams(needle)]
+        if any(b is None for b in bounds):
+            return [], 0, None
+        # The rarest trigram within the rating window provides the candidates
+        grams = self.gram_postings
+        gram_lo, gram_hi = min(
+            (
+                (bisect_left(grams, start, first, last), bisect_left(grams, end, first, last))
+                for first, last in bounds
+            ),
+            key=lambda r: r[1] - r[0],
+        )
+
+        heap, offsets = self.name_heap, self.name_offsets
+        if hi - lo < gram_hi - gram_lo:
+            # The source/tag filter is the narrower list: check names against it
+            matches = [
+                o
+                for o in postings[lo:hi]
+                if heap.find(needle, offsets[o], offsets[o + 1]) >= 0
+            ]
+        else:
+            matches = grams[gram_lo:gram_hi]
+            if len(needle) > 3:
+                # A single trigram's postings are exact; longer needles need checking
+                matches = [
+                    o for o in matches if heap.find(needle, offsets[o], offsets[o + 1]) >= 0
+                ]
+            if source_id is not None:
+                source_ids = catalog.source_ids
+                matches = [o for o in matches if source_ids[o] == source_id]
+            if tag_id is not None:
+                bits, width = self.tag_bits, self.tag_bits_width
+                byte, mask = divmod(self.tag_bit[tag_id], 8)
+                mask = 1 << mask
+                matches = [o for o in matches if bits[o * width + byte] & mask]
+
+        first = bisect_right(matches, after)
+        page = matches[first : first + limit]
+        more = first + limit < len(matches)
+        return page, len(matches), self._encode_cursor(page[-1]) if more else None
+
+    # Cursors carry the catalog version: ordinals are meaningless across reloads
+
+    def _encode_cursor(self, ordinal: int) -> str:
+        raw = f"{self.catalog.version}:{ordinal}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self, cursor: str) -> int:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            version, _, ordinal = raw.decode("ascii").partition(":")
+            after = int(ordinal)
+        except ValueError:
+            raise InvalidCursor("Malformed cursor")
+        if version != self.catalog.version:
+            raise InvalidCursor(
+                "Cursor is from an older catalog; start from the first page"
+            )
+        return after
+
+
+def _trigrams(name: bytes) -> List[int]:
+    """Distinct byte trigrams of a UTF-8 name, each packed into an int."""
+    return list(
+        {name[i] << 16 | name[i + 1] << 8 | name[i + 2] for i in range(len(name) - 2)}
+    )
+
@@ -0,0 +1,183 @@
+from datetime import datetime
+from types import SimpleNamespace
+from typing import NamedTuple, Optional
+
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models import (
+    Contest,
+    ContestProblem,
+    ContestStatus,
+    ProblemHistory,
+    SubmissionStatus,
+    User,
+    UserStats,
+    UserTopicRating,
+)
+from app.services.user_stats import set_topic_count
+
+
+class SolvedProblem(NamedTuple):
+    problem_id: str
+    topic: str
+    solved_count: int
+    total_questions: int
+    # True the first time the user has ever solved this problem
+    first_solve: bool
+
+
+def mark_solved(db: Session, user_id: int, problem_id: str) -> Optional[SolvedProblem]:
+    """
+    Mark ``problem_id`` solved in the user's active contest and bump every
+    counter that depends on it, including the user_stats topic counts; the
+    caller commits.
+
+    Returns None, touching nothing, when the problem isn't an unsolved
+    problem of the user's active contest. The status change is a guarded
+    UPDATE, so a concurrent duplicate request can't count a solve twice,
+    and the counters are ``x = x + 1`` updates and ON CONFLICT upserts
+    rather than reads followed by writes.
+
+    On PostgreSQL all six writes go out as one statement (data-modifying
+    CTEs); elsewhere they run one after another, one round trip each.
+    """
+    now = datetime.utcnow()
+    solved = (
+        update(ContestProblem)
+        .where(
+            ContestProblem.contest_id.in_(
+                select(Contest.id).where(
+                    Contest.user_id == user_id, Contest.status == ContestStatus.ACTIVE
+                )
+            ),
+            ContestProblem.problem_id == problem_id,
+            ContestProblem.status != SubmissionStatus.SOLVED,
+        )
+        .values(
+            status=SubmissionStatus.SOLVED,
+            submitted_at=now,
+            attempts=func.coalesce(ContestProblem.attempts, 0) + 1,
+        )
+        .returning(
+            literal(user_id).label("user_id"),
+            ContestProblem.contest_id,
+            ContestProblem.problem_id,
+            ContestProblem.topic,
+        )
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        src = solved.cte("solved")
+        contest, user, topic, history = _counter_writes(db, src.c, now)
+        contest = contest.cte("contest")
+        history = history.cte("history")
+        topic = topic.cte("topic_counts")
+        stats = _topic_stats_write("postgresql", topic.c)
+        row = db.execute(
+            select(
+                src.c.problem_id,
+                src.c.topic,
+                contest.c.problems_solved,
+                contest.c.num_problems,
+                history.c.times_solved,
+            ).add_cte(user.cte("user_counts"), stats.cte("user_stats_topics"))
+        ).first()
+        if row is None:
+            return None
+        return SolvedProblem(
+            row.problem_id,
+            row.topic,
+            row.problems_solved,
+            row.num_problems or 0,
+            row.times_solved == 1,
+        )
+
+    row = db.execute(solved).first()
+    if row is None:
+        return None
+    src = SimpleNamespace(**{key: literal(value) for key, value in row._mapping.items()})
+    contest, user, topic, history = _counter_writes(db, src, now)
+    counts = db.execute(contest).first()
+    db.execute(user)
+    topic_row = db.execute(topic).first()
+    db.execute(
+        _topic_stats_write(
+            db.get_bind().dialect.name,
+            SimpleNamespace(**{k: literal(v) for k, v in topic_row._mapping.items()}),
+        )
+    )
+    times_solved = db.execute(history).scalar_one()
+    return SolvedProblem(
+        row.problem_id,
+        row.topic,
+        counts.problems_solved,
+        counts.num_problems or 0,
+        times_solved == 1,
+    )
+
+
+def _counter_writes(db: Session, src, now: datetime):
+    """
+    The contest, user, topic and history updates for one solve. ``src``
+    holds the solved row's user_id, contest_id, problem_id and topic, either
+    as columns of the ``solved`` CTE or as literals.
+    """
+    insert = dialect_insert(db)
+
+    contest = (
+        update(Contest)
+        .where(Contest.id == src.contest_id)
+        .values(problems_solved=func.coalesce(Contest.problems_solved, 0) + 1)
+        .returning(Contest.problems_solved, Contest.num_problems)
+    )
+    user = (
+        update(User)
+        .where(User.id == src.user_id)
+        .values(
+            total_problems_solved=func.coalesce(User.total_problems_solved, 0) + 1,
+            total_problems_attempted=func.coalesce(User.total_problems_attempted, 0) + 1,
+            updated_at=now,
+        )
+    )
+
+    topic = insert(UserTopicRating).from_select(
+        ["user_id", "topic", "rating", "problems_solved", "problems_attempted",
+         "created_at", "updated_at"],
+        select(src.user_id, src.topic, literal(0), literal(1), literal(1),
+               literal(now), literal(now)),
+    )
+    topic = topic.on_conflict_do_update(
+        index_elements=[UserTopicRating.user_id, UserTopicRating.topic],
+        set_={
+            "problems_solved": func.coalesce(UserTopicRating.problems_solved, 0) + 1,
+            "updated_at": now,
+        },
+    ).returning(
+        UserTopicRating.user_id, UserTopicRating.topic, UserTopicRating.problems_solved
+    )
+
+    history = insert(ProblemHistory).from_select(
+        ["user_id", "problem_id", "last_attempted_at", "times_attempted", "times_solved"],
+        select(src.user_id, src.problem_id, literal(now), literal(1), literal(1)),
+    )
+    history = history.on_conflict_do_update(
+        index_elements=[ProblemHistory.user_id, ProblemHistory.problem_id],
+        set_={
+            "times_solved": func.coalesce(ProblemHistory.times_solved, 0) + 1,
+            "times_attempted": func.coalesce(ProblemHistory.times_attempted, 0) + 1,
+            "last_attempted_at": now,
+        },
+    ).returning(ProblemHistory.times_solved)
+
+    return contest, user, topic, history
+
+
+def _topic_stats_write(dialect_name: str, src):
+    """Copy the topic's new solved count (``src``, from topic_counts) into user_stats."""
+    return (
+        update(UserStats)
+        .where(UserStats.user_id == src.user_id)
+        .values(topic_stats=set_topic_count(dialect_name, src.topic, src.problems_solved))
+    )
@@ -0,0 +1,380 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.metrics import Counter, Histogram
+from app.models import (
+    Contest,
+    ContestProblem,
+    ProblemBrief,
+    ProblemReflection,
+    SubmissionStatus,
+)
+from app.services.contest_generator import (
+    GEMINI_MODEL,
+    contest_generator,
+    strip_code_fence,
+)
+from app.services.editorials import fetch_editorial
+
+# Threads writing reflections; they share the problem-level briefs below
+REFLECTION_WORKERS = int(os.getenv("REFLECTION_WORKERS", "4"))
+# Finished briefs kept in memory in front of the problem_briefs table
+BRIEF_MEMO_SIZE = 512
+# A failed reflection is retried after this long, doubling with each further
+# failure up to the max
+REFLECTION_RETRY_SECONDS = int(os.getenv("REFLECTION_RETRY_SECONDS", "60"))
+REFLECTION_RETRY_MAX_SECONDS = int(os.getenv("REFLECTION_RETRY_MAX_SECONDS", "3600"))
+
+REFLECTION_BRIEFS = Counter(
+    "reflection_briefs_total",
+    "Problem briefs used by reflection jobs, by where they came from",
+    ["source"],
+)
+REFLECTION_JOBS = Counter(
+    "reflection_jobs_total",
+    "Finished reflection jobs, by outcome",
+    ["result"],
+)
+REFLECTION_SECONDS = Histogram(
+    "reflection_job_seconds",
+    "Time to write one reflection, including any brief it had to build",
+)
+
+# (prompt, max_output_tokens, temperature, purpose=...) -> text
+GenerateText = Callable[..., str]
+FetchEditorial = Callable[[Optional[str]], Tuple[Optional[str], Optional[str]]]
+
+
+def build_brief(
+    problem: Dict, generate_text: GenerateText, editorial: Tuple[Optional[str], Optional[str]]
+) -> Dict:
+    """Ask the model for the problem-level analysis every reflection reuses."""
+    editorial_text, editorial_url = editorial
+    prompt = f"""You are an expert competitive programming coach.
+
+Problem: {problem["problem_name"]}
+Topic: {problem["topic"]}
+Difficulty: {problem["difficulty"]}/100
+URL: {problem["problem_url"] or "Unknown"}
+
+Editorial:
+{editorial_text or "Not available; rely on your own knowledge of the problem."}
+
+Summarize the intended solution for players who just attempted this problem.
+
+Return ONLY valid JSON in this exact format, no markdown, no explanation:
+{{"key_insight": "the one observation that unlocks the problem", "master_approach": "the intended solution in 3-6 sentences, with its complexity"}}"""
+
+    result = json.loads(strip_code_fence(generate_text(prompt, 400, 0.4, purpose="reflection_brief")))
+    if not result.get("master_approach"):
+        raise ValueError("Model response has no master_approach")
+    return {
+        "editorial_text": editorial_text,
+        "editorial_url": editorial_url,
+        "key_insight": result.get("key_insight"),
+        "master_approach": result.get("master_approach"),
+    }
+
+
+def build_reflection(
+    problem: Dict, attempt: Dict, brief: Dict, generate_text: GenerateText
+) -> Tuple[Dict, str]:
+    """Ask the model for one user's reflection; returns ``(fields, raw_text)``."""
+    minutes = (attempt["time_taken_seconds"] or 0) // 60
+    prompt = f"""You are a competitive programming coach writing a short reflection for a player.
+
+Problem: {problem["problem_name"]} ({problem["topic"]}, difficulty {problem["difficulty"]}/100)
+Key insight: {brief["key_insight"] or "Unknown"}
+Intended approach: {brief["master_approach"] or "Unknown"}
+
+Player:
+- Rating: {attempt["user_rating"]}
+- Outcome: {"solved" if attempt["solved"] else "not solved"}
+- Time spent: {f"{minutes} minutes" if minutes else "unknown"}
+- Their approach: {attempt["user_approach"] or "Not provided"}
+
+Write the reflection for this player specifically, comparing their attempt to the intended approach.
+
+Return ONLY valid JSON in this exact format, no markdown, no explanation:
+{{"pivot_sentence": "the one sentence that would have changed the outcome", "tips": "2-3 short, concrete tips", "what_to_improve": "the skill to practice next"}}"""
+
+    text = strip_code_fence(generate_text(prompt, 400, 0.7, purpose="reflection"))
+    result = json.loads(text)
+    if not result.get("pivot_sentence"):
+        raise ValueError("Model response has no pivot_sentence")
+    fields = {
+        "pivot_sentence": result.get("pivot_sentence"),
+        "tips": result.get("tips"),
+        "what_to_improve": result.get("what_to_improve"),
+    }
+    return fields, text
+
+
+def retry_due(reflection: ProblemReflection, now: datetime) -> bool:
+    """Whether a failed reflection has waited out its backoff and may be redone."""
+    if reflection.generated_at is None:
+        return True
+    attempts = max(1, reflection.generation_attempts or 0)
+    delay = min(
+        REFLECTION_RETRY_MAX_SECONDS, REFLECTION_RETRY_SECONDS * 2 ** (attempts - 1)
+    )
+    return now >= reflection.generated_at + timedelta(seconds=delay)
+
+
+class ReflectionPipeline:
+    """
+    Writes per-problem reflections for finished contests in the background.
+
+    A reflection has a problem-level half (editorial fetch plus the model's
+    key insight and intended approach) and a user-level half (the player's
+    outcome, time and approach measured against it). The problem-level half
+    is built once per problem_id and stored in problem_briefs: concurrent
+    jobs for the same problem wait on a single in-flight build, and later
+    jobs read it from memory or the table. Only the short user-level prompt
+    is sent per user.
+
+    Nothing is queued while ``model_available`` says the model can't be
+    called (no client configured, or the circuit breaker is open), and the
+    editorial is only fetched once the model call can go ahead, so retries
+    during an outage cost neither model calls nor Codeforces requests.
+
+    ``generate_text``, ``fetch_editorial`` and ``model_available`` are
+    injectable, so the pipeline runs against a fake model (or
+    scripts/stub_llm_server.py) without network access.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        generate_text: GenerateText,
+        fetch_editorial: FetchEditorial = fetch_editorial,
+        model_name: str = GEMINI_MODEL,
+        workers: int = REFLECTION_WORKERS,
+        model_available: Callable[[], bool] = lambda: True,
+    ):
+        self.session_factory = session_factory
+        self.generate_text = generate_text
+        self.fetch_editorial = fetch_editorial
+        self.model_available = model_available
+        self.model_name = model_name
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="reflections"
+        )
+        # problem_id -> Future of its brief; in-flight builds and a memo of
+        # finished ones, oldest first
+        self._briefs: "OrderedDict[str, Future]" = OrderedDict()
+        self._in_flight: set = set()
+        self._lock = threading.Lock()
+
+    def enqueue(self, contest_problem_ids: Iterable[int]) -> int:
+        """
+        Queue reflections for these contest problems; already-queued ones are
+        skipped, and nothing is queued while the model is unavailable.
+        """
+        if not self.model_available():
+            return 0
+        queued = 0
+        for cp_id in contest_problem_ids:
+            with self._lock:
+                if cp_id in self._in_flight:
+                    continue
+                self._in_flight.add(cp_id)
+            self._executor.submit(self._run, cp_id)
+            queued += 1
+        return queued
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the workers; ``wait`` finishes queued jobs instead of dropping them."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _run(self, cp_id: int) -> None:
+        t0 = time.perf_counter()
+        try:
+            loaded = self._load(cp_id)
+            if loaded is None:
+                return
+            problem, attempt = loaded
+            brief: Dict = {}
+            fields: Dict = {}
+            text: Optional[str] = None
+            error: Optional[str] = None
+            try:
+                brief = self._brief(problem)
+                fields, text = build_reflection(
+                    problem, attempt, brief, self.generate_text
+                )
+            except Exception as e:
+                print(f"Error generating reflection for contest problem {cp_id}: {e}")
+                error = str(e)
+            self._save(cp_id, brief, fields, text, error)
+            REFLECTION_JOBS.inc(result="error" if error else "ok")
+            REFLECTION_SECONDS.observe(time.perf_counter() - t0)
+        finally:
+            with self._lock:
+                self._in_flight.discard(cp_id)
+
+    def _load(self, cp_id: int) -> Optional[Tuple[Dict, Dict]]:
+        db = self.session_factory()
+        try:
+            row = (
+                db.query(ContestProblem, Contest.rating_at_start)
+                .join(Contest, Contest.id == ContestProblem.contest_id)
+                .filter(ContestProblem.id == cp_id)
+                .first()
+            )
+            if row is None:
+                return None
+            # Failed reflections are kept (with generation_error) but redone
+            done = (
+                db.query(ProblemReflection.id)
+                .filter(
+                    ProblemReflection.contest_problem_id == cp_id,
+                    ProblemReflection.generation_error.is_(None),
+                )
+                .first()
+            )
+            if done:
+                return None
+            cp, user_rating = row
+            problem = {
+                "problem_id": cp.problem_id,
+                "problem_name": cp.problem_name,
+                "problem_url": cp.problem_url,
+                "topic": cp.topic,
+                "difficulty": cp.difficulty,
+            }
+            attempt = {
+                "solved": cp.status == SubmissionStatus.SOLVED,
+                "time_taken_seconds": cp.time_taken_seconds,
+                "user_approach": cp.user_approach,
+                "user_rating": user_rating,
+            }
+            return problem, attempt
+        finally:
+            db.close()
+
+    def _brief(self, problem: Dict) -> Dict:
+        problem_id = problem["problem_id"]
+        with self._lock:
+            future = self._briefs.get(problem_id)
+            owner = future is None
+            if owner:
+                future = self._briefs[problem_id] = Future()
+            else:
+                self._briefs.move_to_end(problem_id)
+        if not owner:
+            REFLECTION_BRIEFS.inc(source="memory")
+            return future.result()
+
+        try:
+            brief = self._load_brief(problem_id)
+            if brief is not None:
+                REFLECTION_BRIEFS.inc(source="db")
+            else:
+                if not self.model_available():
+                    raise RuntimeError("Model unavailable; editorial not fetched")
+                editorial = self.fetch_editorial(problem["problem_url"])
+                brief = build_brief(problem, self.generate_text, editorial)
+                self._save_brief(problem_id, brief)
+                REFLECTION_BRIEFS.inc(source="generated")
+        except Exception as e:
+            # Don't memoize failures; the next job for the problem retries
+            with self._lock:
+                self._briefs.pop(problem_id, None)
+            future.set_exception(e)
+            raise
+        future.set_result(brief)
+        with self._lock:
+            while len(self._briefs) > BRIEF_MEMO_SIZE:
+                oldest = next(iter(self._briefs))
+                if not self._briefs[oldest].done():
+                    break
+                self._briefs.popitem(last=False)
+        return brief
+
+    def _load_brief(self, problem_id: str) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            row = (
+                db.query(ProblemBrief).filter(ProblemBrief.problem_id == problem_id).first()
+            )
+            if row is None:
+                return None
+            return {
+                "editorial_text": row.editorial_text,
+                "editorial_url": row.editorial_url,
+                "key_insight": row.key_insight,
+                "master_approach": row.master_approach,
+            }
+        finally:
+            db.close()
+
+    def _save_brief(self, problem_id: str, brief: Dict) -> None:
+        db = self.session_factory()
+        try:
+            db.add(ProblemBrief(problem_id=problem_id, model_used=self.model_name, **brief))
+            db.commit()
+        except IntegrityError:
+            # Another process built it first; either copy is fine
+            db.rollback()
+        finally:
+            db.close()
+
+    def _save(
+        self,
+        cp_id: int,
+        brief: Dict,
+        fields: Dict,
+        text: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        values = {
+            "editorial_text": brief.get("editorial_text"),
+            "editorial_url": brief.get("editorial_url"),
+            "master_approach": brief.get("master_approach"),
+            "pivot_sentence": fields.get("pivot_sentence"),
+            "tips": fields.get("tips"),
+            "what_to_improve": fields.get("what_to_improve"),
+            "full_response": text,
+            "model_used": self.model_name if error is None else None,
+            "generated_at": datetime.utcnow(),
+            "generation_error": error,
+        }
+        db = self.session_factory()
+        try:
+            reflection = (
+                db.query(ProblemReflection)
+                .filter(ProblemReflection.contest_problem_id == cp_id)
+                .first()
+            )
+            if reflection is None:
+                reflection = ProblemReflection(
+                    contest_problem_id=cp_id, generation_attempts=0
+                )
+                db.add(reflection)
+            attempts = reflection.generation_attempts or 0
+            values["generation_attempts"] = attempts + 1 if error else 0
+            for key, value in values.items():
+                setattr(reflection, key, value)
+            db.commit()
+        except Exception as e:
+            print(f"Error saving reflection for contest problem {cp_id}: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+
+reflection_pipeline = ReflectionPipeline(
+    SessionLocal,
+    contest_generator.generate_text,
+    model_available=contest_generator.llm.available,
+)
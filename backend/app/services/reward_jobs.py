@@ -0,0 +1,135 @@
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List
+
+from app.database import SessionLocal
+from app.metrics import Histogram
+from app.models import RewardJob, UserTopicRating
+from app.services.contest_generator import ContestGenerator, contest_generator
+
+# Threads generating rewards; none of them holds a DB connection while the
+# model is being called
+REWARD_JOB_WORKERS = int(os.getenv("REWARD_JOB_WORKERS", "4"))
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+REWARD_JOB_SECONDS = Histogram(
+    "reward_job_seconds",
+    "Time from /complete accepting a reward job to the job finishing",
+    ["status"],
+)
+
+
+class RewardQueue:
+    """
+    Generates traits/titles for completed contests off the request path.
+
+    /complete inserts a pending reward_jobs row in the same transaction as
+    the rating update and calls ``enqueue`` once that has committed. A
+    worker thread then reads the user's topic stats, asks the generator and
+    stores the result on the row, where /api/contests/{id}/rewards serves
+    it. Jobs live in the database, so ``resume_pending()`` at startup picks
+    up any a previous process accepted but never finished.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        generator: ContestGenerator,
+        workers: int = REWARD_JOB_WORKERS,
+    ):
+        self.session_factory = session_factory
+        self.generator = generator
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="rewards"
+        )
+
+    @staticmethod
+    def new_job_id() -> str:
+        return uuid.uuid4().hex
+
+    def enqueue(self, job_id: str) -> None:
+        self._executor.submit(self._run, job_id)
+
+    def resume_pending(self) -> int:
+        db = self.session_factory()
+        try:
+            job_ids = [
+                row.id
+                for row in db.query(RewardJob.id).filter(RewardJob.status == PENDING)
+            ]
+        except Exception as e:
+            print(f"Error loading pending reward jobs: {e}")
+            job_ids = []
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self.enqueue(job_id)
+        return len(job_ids)
+
+    def shutdown(self) -> None:
+        # Unstarted jobs stay pending in the table and resume on next startup
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job_id: str) -> None:
+        db = self.session_factory()
+        try:
+            job = db.get(RewardJob, job_id)
+            if job is None or job.status != PENDING:
+                return
+            user_stats = {
+                topic: solved or 0
+                for topic, solved in db.query(
+                    UserTopicRating.topic, UserTopicRating.problems_solved
+                ).filter(UserTopicRating.user_id == job.user_id)
+            }
+            level, solved_count, created_at = job.level, job.solved_count, job.created_at
+        finally:
+            db.close()
+
+        try:
+            traits, title = self.generator.generate_traits_and_title(
+                user_stats=user_stats,
+                current_level=level,
+                current_traits=[],
+                solved_count=solved_count,
+            )
+            values = {
+                RewardJob.status: READY,
+                RewardJob.traits: json.dumps(traits),
+                RewardJob.title: title,
+            }
+        except Exception as e:
+            print(f"Error generating rewards for job {job_id}: {e}")
+            values = {RewardJob.status: FAILED}
+        completed_at = datetime.utcnow()
+        values[RewardJob.completed_at] = completed_at
+
+        db = self.session_factory()
+        try:
+            # Another process may have resumed the same job; first one wins
+            db.query(RewardJob).filter(
+                RewardJob.id == job_id, RewardJob.status == PENDING
+            ).update(values)
+            db.commit()
+        except Exception as e:
+            print(f"Error saving rewards for job {job_id}: {e}")
+            db.rollback()
+            return
+        finally:
+            db.close()
+        REWARD_JOB_SECONDS.observe(
+            (completed_at - created_at).total_seconds(), status=values[RewardJob.status]
+        )
+
+
+def job_traits(job: RewardJob) -> List[str]:
+    return json.loads(job.traits) if job.traits else []
+
+
+reward_queue = RewardQueue(SessionLocal, contest_generator)
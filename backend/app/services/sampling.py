@@ -0,0 +1,448 @@
+import random
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.services.problem_catalog import MAX_RATING, ProblemCatalog
+
+# Topic used for problems without tags (matches the contest_problems default)
+DEFAULT_TOPIC = "general"
+
+# Weak topics are drawn this many times more often than an unpracticed topic
+WEAK_TOPIC_WEIGHT = 3.0
+# Every PRACTICE_HALF_LIFE solved problems in a topic halves its weight
+PRACTICE_HALF_LIFE = 10
+# Floor so heavily practiced topics still show up occasionally
+MIN_TOPIC_WEIGHT = 0.1
+
+ALIAS_CACHE_SIZE = 256
+
+
+def topic_weights(
+    user_stats: Dict[str, int], weak_topics: Iterable[str] = ()
+) -> Dict[str, float]:
+    """
+    Per-topic sampling weights from the user's topic stats and weak topics.
+
+    Topics missing from the result weigh 1.0. Practiced topics decay towards
+    MIN_TOPIC_WEIGHT so contests lean on what the user has done least, and
+    active weak topics are boosted by WEAK_TOPIC_WEIGHT.
+    """
+    weights = {
+        topic: max(MIN_TOPIC_WEIGHT, 0.5 ** (solved / PRACTICE_HALF_LIFE))
+        for topic, solved in user_stats.items()
+        if solved
+    }
+    for topic in weak_topics:
+        weights[topic] = weights.get(topic, 1.0) * WEAK_TOPIC_WEIGHT
+    return weights
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted draw."""
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, rng: random.Random = random) -> int:
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class BucketCells:
+    """
+    Ordinals of every rating bucket grouped by an integer key per problem.
+
+    Cells are laid out bucket by bucket and, within a bucket, by key; cell
+    ``c`` holds ``ordinals[offsets[c]:offsets[c + 1]]``, all rated
+    ``cell_ratings[c]`` and keyed ``cell_keys[c]``. ``bucket_cells[r]`` is
+    the first cell of rating ``r``, mirroring ProblemCatalog.bucket_offsets,
+    so the cells of a rating window are one contiguous cell range.
+    """
+
+    def __init__(self, catalog: ProblemCatalog, keys: Sequence[int]):
+        grouped: Dict[Tuple[int, int], List[int]] = {}
+        for ordinal in range(len(catalog)):
+            grouped.setdefault((catalog.ratings[ordinal], keys[ordinal]), []).append(
+                ordinal
+            )
+
+        self.ordinals = array("I")
+        self.offsets = array("I", [0])
+        self.cell_keys = array("i")
+        self.cell_ratings = array("H")
+        for rating, key in sorted(grouped):
+            self.ordinals.extend(grouped[(rating, key)])
+            self.offsets.append(len(self.ordinals))
+            self.cell_keys.append(key)
+            self.cell_ratings.append(rating)
+        self.bucket_cells = array(
+            "I", (bisect_left(self.cell_ratings, r) for r in range(MAX_RATING + 2))
+        )
+
+    def window(self, min_rating: int, max_rating: int) -> Tuple[int, int]:
+        """Cell range ``[first, last)`` covering the inclusive rating range."""
+        if min_rating > max_rating or max_rating < 0 or min_rating > MAX_RATING:
+            return 0, 0
+        lo = min(max(min_rating, 0), MAX_RATING)
+        hi = min(max(max_rating, 0), MAX_RATING)
+        return self.bucket_cells[lo], self.bucket_cells[hi + 1]
+
+    def size(self, cell: int) -> int:
+        return self.offsets[cell + 1] - self.offsets[cell]
+
+    def random_ordinal(self, cell: int) -> int:
+        return self.ordinals[self.offsets[cell] + random.randrange(self.size(cell))]
+
+    def cell_members(self, cell: int):
+        return self.ordinals[self.offsets[cell] : self.offsets[cell + 1]]
+
+
+class WeightedSampler:
+    """
+    Topic-weighted problem sampling over one ProblemCatalog.
+
+    At construction every rating bucket is split into per-topic cells
+    (ordinals grouped by the problem's primary topic, i.e. its first tag,
+    which is what contest_problems.topic and user_topic_ratings record).
+    A request builds an alias table over the cells of its rating window,
+    weighted by cell size x topic weight, and caches it, so drawing k
+    problems costs O(k) instead of a pass over every candidate.
+    """
+
+    def __init__(self, catalog: ProblemCatalog):
+        self.catalog = catalog
+
+        tag_offsets = catalog.term_offsets["tags"]
+        tag_ids = catalog.term_ids["tags"]
+        primary_topics = array(
+            "i",
+            (
+                tag_ids[tag_offsets[o]] if tag_offsets[o] < tag_offsets[o + 1] else -1
+                for o in range(len(catalog))
+            ),
+        )
+        self.cells = BucketCells(catalog, primary_topics)
+        self.cell_topics = [
+            catalog.terms[key] if key >= 0 else DEFAULT_TOPIC
+            for key in self.cells.cell_keys
+        ]
+
+        self._alias_cache: "OrderedDict[tuple, Optional[AliasTable]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _alias_for(
+        self, first_cell: int, last_cell: int, weights: Dict[str, float]
+    ) -> Optional[AliasTable]:
+        key = (first_cell, last_cell, frozenset(weights.items()))
+        with self._lock:
+            if key in self._alias_cache:
+                self._alias_cache.move_to_end(key)
+                return self._alias_cache[key]
+
+        cell_weights = [
+            self.cells.size(c) * weights.get(self.cell_topics[c], 1.0)
+            for c in range(first_cell, last_cell)
+        ]
+        table = AliasTable(cell_weights) if sum(cell_weights) > 0 else None
+
+        with self._lock:
+            self._alias_cache[key] = table
+            while len(self._alias_cache) > ALIAS_CACHE_SIZE:
+                self._alias_cache.popitem(last=False)
+        return table
+
+    def sample(
+        self,
+        min_rating: int,
+        max_rating: int,
+        weights: Dict[str, float],
+        k: int,
+        skip: Callable[[int], bool],
+    ) -> List[int]:
+        """
+        Draw up to ``k`` distinct ordinals rated within the inclusive range,
+        with probability proportional to their topic weight. Ordinals for
+        which ``skip`` is true are redrawn a bounded number of times; the
+        caller tops up any shortfall.
+        """
+        first_cell, last_cell = self.cells.window(min_rating, max_rating)
+        if k <= 0 or last_cell <= first_cell:
+            return []
+
+        table = self._alias_for(first_cell, last_cell, weights)
+        if table is None:
+            return []
+
+        picked: List[int] = []
+        for _ in range(8 * k + 8):
+            if len(picked) == k:
+                break
+            ordinal = self.cells.random_ordinal(first_cell + table.draw())
+            if ordinal not in picked and not skip(ordinal):
+                picked.append(ordinal)
+        return picked
+
+
+class _Selection:
+    """
+    Problems picked so far for one contest and the constraints on the next.
+
+    While ``distinct_patterns`` holds, a pattern_id already in the contest
+    is rejected. While ``cap_sources`` holds, each source in the mix is
+    capped at its quota, and a source outside it is only taken while slots
+    not reserved by the mix remain.
+    """
+
+    def __init__(
+        self,
+        catalog: ProblemCatalog,
+        size: int,
+        skip: Callable[[int], bool],
+        taken: Sequence[int] = (),
+        source_mix: Optional[Dict[str, int]] = None,
+    ):
+        self.catalog = catalog
+        self.skip = skip
+        self.taken = set(taken)
+        self.picked: List[int] = []
+        self.distinct_patterns = True
+        self.cap_sources = True
+        self.used_patterns = {catalog.pattern_ids[o] for o in taken} - {0}
+        self.quotas = {
+            catalog.sources.index(source): quota
+            for source, quota in (source_mix or {}).items()
+            if source in catalog.sources
+        }
+        self.free_slots = size - sum(self.quotas.values())
+        self.source_counts: Dict[int, int] = {}
+        for o in taken:
+            self._count_source(catalog.source_ids[o])
+
+    def _count_source(self, source_id: int) -> None:
+        self.source_counts[source_id] = self.source_counts.get(source_id, 0) + 1
+        if source_id not in self.quotas or (
+            self.source_counts[source_id] > self.quotas[source_id]
+        ):
+            self.free_slots -= 1
+
+    def accept(self, o: int) -> bool:
+        catalog = self.catalog
+        pattern = catalog.pattern_ids[o]
+        source_id = catalog.source_ids[o]
+        if o in self.taken or o in self.picked or self.skip(o):
+            return False
+        if self.distinct_patterns and pattern and pattern in self.used_patterns:
+            return False
+        if self.cap_sources:
+            if source_id in self.quotas:
+                if self.source_counts.get(source_id, 0) >= self.quotas[source_id]:
+                    return False
+            elif self.free_slots <= 0:
+                return False
+        self.picked.append(o)
+        if pattern:
+            self.used_patterns.add(pattern)
+        self._count_source(source_id)
+        return True
+
+
+class DiversitySelector:
+    """
+    Contest selection with distinct pattern_ids and an optional source mix.
+
+    Uses per-(rating bucket, source) cells to fill source quotas and
+    per-(rating bucket, pattern) cells to draw a not-yet-used pattern first
+    and then a problem from it, so the constraints are met by construction
+    instead of by rejection sampling over the rating window. Problems
+    without a pattern_id (e.g. all AtCoder problems) never conflict.
+    """
+
+    def __init__(self, catalog: ProblemCatalog):
+        self.catalog = catalog
+        self.by_pattern = BucketCells(catalog, catalog.pattern_ids)
+        self.by_source = BucketCells(catalog, catalog.source_ids)
+        self._window_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _patterns_in(
+        self, first_cell: int, last_cell: int
+    ) -> Tuple[List[int], List[List[int]], List[int]]:
+        """Patterns in a cell window with their cells and problem counts (cached)."""
+        key = (first_cell, last_cell)
+        with self._lock:
+            if key in self._window_cache:
+                self._window_cache.move_to_end(key)
+                return self._window_cache[key]
+
+        grouped: Dict[int, List[int]] = {}
+        for c in range(first_cell, last_cell):
+            grouped.setdefault(self.by_pattern.cell_keys[c], []).append(c)
+        patterns = list(grouped)
+        cells = [grouped[p] for p in patterns]
+        sizes = [sum(self.by_pattern.size(c) for c in group) for group in cells]
+        entry = (patterns, cells, sizes)
+
+        with self._lock:
+            self._window_cache[key] = entry
+            while len(self._window_cache) > ALIAS_CACHE_SIZE:
+                self._window_cache.popitem(last=False)
+        return entry
+
+    def select(
+        self,
+        min_rating: int,
+        max_rating: int,
+        k: int,
+        skip: Callable[[int], bool],
+        taken: Sequence[int] = (),
+        source_mix: Optional[Dict[str, int]] = None,
+        relaxed_skip: Optional[Callable[[int], bool]] = None,
+    ) -> List[int]:
+        """
+        Pick up to ``k`` ordinals in the inclusive rating range whose patterns
+        differ from each other and from ``taken``. ``source_mix`` maps source
+        -> number of problems wanted from it (counting ``taken``); those
+        sources are capped at that number, and slots not covered by the mix
+        may come from any other source.
+
+        When the window can't supply ``k`` such problems the constraints are
+        relaxed in turn: ``skip`` gives way to ``relaxed_skip`` (e.g. allowing
+        already played problems), then patterns may repeat, and finally the
+        source caps are dropped.
+        """
+        selection = _Selection(self.catalog, len(taken) + k, skip, taken, source_mix)
+        self._fill(selection, min_rating, max_rating, k)
+        if len(selection.picked) < k and relaxed_skip is not None:
+            selection.skip = relaxed_skip
+            self._fill(selection, min_rating, max_rating, k)
+        if len(selection.picked) < k:
+            selection.distinct_patterns = False
+            self._fill(selection, min_rating, max_rating, k)
+        if len(selection.picked) < k:
+            selection.cap_sources = False
+            self._fill(selection, min_rating, max_rating, k)
+        return selection.picked
+
+    def select_from(
+        self,
+        candidates: Sequence[int],
+        k: int,
+        size: int,
+        skip: Callable[[int], bool],
+        taken: Sequence[int] = (),
+        source_mix: Optional[Dict[str, int]] = None,
+    ) -> List[int]:
+        """
+        Pick up to ``k`` of ``candidates`` (e.g. a topic's postings) under the
+        same pattern and source rules as select(), for a contest of ``size``
+        problems. The constraints are not relaxed; the caller fills any
+        shortfall through select().
+        """
+        selection = _Selection(self.catalog, size, skip, taken, source_mix)
+        n = len(candidates)
+        if k <= 0 or n == 0:
+            return []
+        for _ in range(4 * k + 8):
+            if len(selection.picked) == k:
+                return selection.picked
+            selection.accept(candidates[random.randrange(n)])
+        offset = random.randrange(n)
+        for i in range(n):
+            if len(selection.picked) == k:
+                break
+            selection.accept(candidates[(offset + i) % n])
+        return selection.picked
+
+    def _fill(
+        self, selection: _Selection, min_rating: int, max_rating: int, k: int
+    ) -> None:
+        # Source quotas first: they are the tighter constraint
+        first, last = self.by_source.window(min_rating, max_rating)
+        for source_id, quota in selection.quotas.items():
+            cells = [
+                c for c in range(first, last) if self.by_source.cell_keys[c] == source_id
+            ]
+            while (
+                len(selection.picked) < k
+                and selection.source_counts.get(source_id, 0) < quota
+            ):
+                if not _draw(self.by_source, cells, selection.accept):
+                    break
+
+        # While the mix caps its sources, the slots it leaves over can only
+        # come from the other sources' cells
+        if selection.quotas and selection.cap_sources:
+            others = [
+                c
+                for c in range(first, last)
+                if self.by_source.cell_keys[c] not in selection.quotas
+            ]
+            while len(selection.picked) < k and selection.free_slots > 0:
+                if not _draw(self.by_source, others, selection.accept):
+                    break
+            return
+
+        # Remaining slots: choose an unused pattern by availability, then a problem
+        first, last = self.by_pattern.window(min_rating, max_rating)
+        patterns, pattern_cells, sizes = self._patterns_in(first, last)
+        used = selection.used_patterns if selection.distinct_patterns else set()
+        exhausted = set()
+        while len(selection.picked) < k:
+            open_patterns = [
+                i
+                for i, p in enumerate(patterns)
+                if i not in exhausted and (p == 0 or p not in used)
+            ]
+            if not open_patterns:
+                break
+            weights = [sizes[j] for j in open_patterns]
+            i = random.choices(open_patterns, weights=weights)[0]
+            if not _draw(self.by_pattern, pattern_cells[i], selection.accept):
+                # Nothing eligible left under this pattern
+                exhausted.add(i)
+
+
+def _draw(index: BucketCells, cells: List[int], accept: Callable[[int], bool]) -> bool:
+    """
+    Accept one ordinal from ``cells``, chosen proportionally to cell size.
+
+    A few random probes cover the usual case; if all are rejected the cells
+    are walked once, which is bounded by this key's share of the window.
+    """
+    if not cells:
+        return False
+    sizes = [index.size(c) for c in cells]
+    for cell in random.choices(cells, weights=sizes, k=8):
+        if accept(index.random_ordinal(cell)):
+            return True
+    for cell in random.sample(cells, len(cells)):
+        members = index.cell_members(cell)
+        offset = random.randrange(len(members))
+        for i in range(len(members)):
+            if accept(members[(offset + i) % len(members)]):
+                return True
+    return False
@@ -0,0 +1,101 @@
+from typing import Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models import ProblemHistory, UserSeenSet
+from app.services.problem_catalog import ProblemCatalog, SeenSet
+
+# Attempts at a compare-and-swap write before record_seen gives up; each
+# retry means another request changed the row between our read and write
+RECORD_SEEN_ATTEMPTS = 5
+
+
+def load_seen_set(db: Session, user_id: int, catalog: ProblemCatalog) -> SeenSet:
+    """
+    Return the user's seen set for ``catalog``.
+
+    The persisted bitmap is used as-is when it was built for this catalog
+    version; otherwise it is rebuilt once from problem_history and saved.
+    """
+    row = _read(db, user_id)
+    if row is not None and row.catalog_version == catalog.version:
+        return SeenSet(row.bitmap)
+    seen = _rebuild(db, user_id, catalog)
+    # Losing this write to a concurrent one is fine: that writer saved a
+    # bitmap for the same catalog that is at least as complete
+    _store(db, user_id, catalog, seen, row)
+    return seen
+
+
+def record_seen(
+    db: Session, user_id: int, catalog: ProblemCatalog, problem_id: str
+) -> None:
+    """Add ``problem_id`` to the user's persisted seen set (caller commits)."""
+    for _ in range(RECORD_SEEN_ATTEMPTS):
+        row = _read(db, user_id)
+        if row is None or row.catalog_version != catalog.version:
+            seen = _rebuild(db, user_id, catalog, extra_ids=[problem_id])
+        else:
+            seen = SeenSet(row.bitmap)
+            for ordinal in catalog.ordinals_of(problem_id):
+                seen.add(ordinal)
+        if _store(db, user_id, catalog, seen, row):
+            return
+    print(f"Error recording seen problem {problem_id} for user {user_id}: too much contention")
+
+
+def _read(db: Session, user_id: int):
+    """The row's current bitmap and catalog_version, bypassing the identity map."""
+    return db.execute(
+        select(UserSeenSet.bitmap, UserSeenSet.catalog_version)
+        .where(UserSeenSet.user_id == user_id)
+    ).first()
+
+
+def _store(db: Session, user_id: int, catalog: ProblemCatalog, seen: SeenSet, old) -> bool:
+    """
+    Write ``seen`` only if the row still holds what ``old`` read: insert it
+    if there was no row, otherwise update it where the bitmap and version
+    are unchanged. Returns False when another writer got there first.
+    """
+    values = {"catalog_version": catalog.version, "bitmap": seen.to_bytes(len(catalog))}
+    if old is None:
+        stmt = (
+            dialect_insert(db)(UserSeenSet)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_nothing(index_elements=[UserSeenSet.user_id])
+        )
+    else:
+        stmt = (
+            update(UserSeenSet)
+            .where(
+                UserSeenSet.user_id == user_id,
+                UserSeenSet.catalog_version == old.catalog_version,
+                UserSeenSet.bitmap == old.bitmap,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    return db.execute(stmt).rowcount == 1
+
+
+def _rebuild(
+    db: Session,
+    user_id: int,
+    catalog: ProblemCatalog,
+    extra_ids: Iterable[str] = (),
+) -> SeenSet:
+    history_ids = [
+        ph.problem_id
+        for ph in db.query(ProblemHistory.problem_id)
+        .filter(ProblemHistory.user_id == user_id)
+        .all()
+    ]
+
+    seen = SeenSet()
+    for problem_id in [*history_ids, *extra_ids]:
+        for ordinal in catalog.ordinals_of(problem_id):
+            seen.add(ordinal)
+    return seen
@@ -0,0 +1,187 @@
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+from sqlalchemy import Text, and_, case, cast, func, update
+from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models import Contest, ContestStatus, User, UserStats, UserTopicRating
+
+# Users rebuilt per upsert by the reconciliation paths
+REBUILD_BATCH_SIZE = 1000
+
+FINISHED_CONTEST = Contest.status.in_([ContestStatus.COMPLETED, ContestStatus.ABANDONED])
+# A completed contest with every problem solved (a "victory"); an empty
+# contest isn't one, matching complete_contest
+SUCCESSFUL_CONTEST = and_(
+    Contest.status == ContestStatus.COMPLETED,
+    Contest.num_problems > 0,
+    Contest.problems_solved == Contest.num_problems,
+)
+
+_ROLLUP_COLUMNS = (
+    "total_contests",
+    "finished_contests",
+    "successful_contests",
+    "finished_problems_solved",
+    "active_contest_id",
+    "topic_stats",
+)
+
+
+def topic_stats(stats: UserStats) -> Dict[str, int]:
+    return json.loads(stats.topic_stats or "{}")
+
+
+def set_topic_count(dialect_name: str, topic, count):
+    """SQL for ``user_stats.topic_stats`` with ``topic`` set to ``count``."""
+    current = func.coalesce(UserStats.topic_stats, "{}")
+    if dialect_name == "postgresql":
+        return cast(
+            func.jsonb_set(cast(current, JSONB), array([topic]), func.to_jsonb(count)),
+            Text,
+        )
+    # json_set would need the topic spliced into a JSON path, which SQLite
+    # can't escape; json_object quotes it as an ordinary key instead
+    return func.json_patch(current, func.json_object(topic, count))
+
+
+def record_contest_started(db: Session, user_id: int, contest_id: int) -> None:
+    """Count a new active contest in the user's rollup (caller commits)."""
+    db.execute(
+        update(UserStats)
+        .where(UserStats.user_id == user_id)
+        .values(
+            total_contests=UserStats.total_contests + 1,
+            active_contest_id=contest_id,
+            updated_at=datetime.utcnow(),
+        )
+    )
+
+
+def record_contest_finished(
+    db: Session, user_id: int, problems_solved: int, successful: bool
+) -> None:
+    """Move the user's active contest into the finished totals (caller commits)."""
+    db.execute(
+        update(UserStats)
+        .where(UserStats.user_id == user_id)
+        .values(
+            finished_contests=UserStats.finished_contests + 1,
+            successful_contests=UserStats.successful_contests + (1 if successful else 0),
+            finished_problems_solved=UserStats.finished_problems_solved + problems_solved,
+            active_contest_id=None,
+            updated_at=datetime.utcnow(),
+        )
+    )
+
+
+def load_user_stats(db: Session, user_id: int) -> UserStats:
+    """
+    The user's rollup row. A user without one gets it computed from the
+    source tables but not saved, so read-only requests never write;
+    scripts/reconcile_user_stats.py stores the missing rows.
+    """
+    stats = db.get(UserStats, user_id)
+    if stats is None:
+        stats = UserStats(**compute_user_stats(db, [user_id])[user_id])
+    return stats
+
+
+def compute_user_stats(db: Session, user_ids: List[int]) -> Dict[int, Dict]:
+    """The rollup column values of ``user_ids``, from contests and user_topic_ratings."""
+    rollups = {
+        user_id: {
+            "user_id": user_id,
+            "total_contests": 0,
+            "finished_contests": 0,
+            "successful_contests": 0,
+            "finished_problems_solved": 0,
+            "active_contest_id": None,
+        }
+        for user_id in user_ids
+    }
+    contest_rows = (
+        db.query(
+            Contest.user_id,
+            func.count(Contest.id),
+            func.sum(case((FINISHED_CONTEST, 1), else_=0)),
+            func.sum(case((SUCCESSFUL_CONTEST, 1), else_=0)),
+            func.sum(case((FINISHED_CONTEST, func.coalesce(Contest.problems_solved, 0)), else_=0)),
+            func.max(case((Contest.status == ContestStatus.ACTIVE, Contest.id))),
+        )
+        .filter(Contest.user_id.in_(user_ids))
+        .group_by(Contest.user_id)
+    )
+    for user_id, total, finished, successful, solved, active_id in contest_rows:
+        rollups[user_id].update(
+            total_contests=total,
+            finished_contests=finished or 0,
+            successful_contests=successful or 0,
+            finished_problems_solved=solved or 0,
+            active_contest_id=active_id,
+        )
+    topics: Dict[int, Dict[str, int]] = defaultdict(dict)
+    for user_id, topic, solved in db.query(
+        UserTopicRating.user_id, UserTopicRating.topic, UserTopicRating.problems_solved
+    ).filter(UserTopicRating.user_id.in_(user_ids)):
+        topics[user_id][topic] = solved or 0
+    now = datetime.utcnow()
+    for user_id, rollup in rollups.items():
+        rollup["topic_stats"] = json.dumps(topics[user_id], sort_keys=True)
+        rollup["updated_at"] = now
+    return rollups
+
+
+def rebuild_user_stats(db: Session, user_ids: List[int]) -> int:
+    """
+    Recompute the rollups of ``user_ids`` from contests and
+    user_topic_ratings and upsert them (caller commits). Returns how many
+    existing rows held different values.
+    """
+    if not user_ids:
+        return 0
+    rollups = compute_user_stats(db, user_ids)
+
+    drifted = 0
+    for existing in db.query(UserStats).filter(UserStats.user_id.in_(user_ids)):
+        rollup = rollups[existing.user_id]
+        if any(
+            getattr(existing, column) != rollup[column]
+            for column in _ROLLUP_COLUMNS
+            if column != "topic_stats"
+        ) or topic_stats(existing) != json.loads(rollup["topic_stats"]):
+            drifted += 1
+
+    insert = dialect_insert(db)
+    stmt = insert(UserStats).values(list(rollups.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserStats.user_id],
+        set_={
+            column: stmt.excluded[column] for column in (*_ROLLUP_COLUMNS, "updated_at")
+        },
+    )
+    db.execute(stmt)
+    # The upsert bypassed the identity map
+    db.expire_all()
+    return drifted
+
+
+def user_id_batches(db: Session, batch_size: int = REBUILD_BATCH_SIZE) -> Iterator[List[int]]:
+    """Every user id, in ascending batches for rebuild_user_stats."""
+    last_id = 0
+    while True:
+        batch = [
+            user_id
+            for user_id, in db.query(User.id)
+            .filter(User.id > last_id)
+            .order_by(User.id)
+            .limit(batch_size)
+        ]
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Requests/sec of the contest routes with DATABASE_MODE=sync vs async.
+
+Seeds a SQLite database with --users users, each with an active contest
+and a few finished ones, then for each mode starts the app under uvicorn
+(one worker) and has --clients concurrent clients call /active, /profile
+and /history as fast as they can for --seconds. Reports successful
+requests/sec, errors (non-200s and requests over --timeout) and p50/p99
+latency.
+
+``--rtt-ms`` adds that much delay to every statement to stand in for the
+round trip to a hosted database: a blocking sleep in sync mode, where the
+thread waits on the socket, and an awaited one in async mode, where only
+the coroutine does. Both modes get a --pool-size connection pool, so in
+sync mode the threadpool (40 threads) is what caps concurrency.
+
+Usage:
+    python scripts/bench_async_db.py --clients 500 --rtt-ms 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ROUTES = [
+    "/api/contests/active",
+    # As the bundled frontend calls it
+    "/api/contests/profile?include_active=false",
+    "/api/contests/history",
+]
+TOPICS = ["greedy", "dp", "graphs", "math", "strings"]
+
+
+def serve(args):
+    """Run the app in this process (started by main() with the env set)."""
+    import uvicorn
+    from sqlalchemy import event
+    from sqlalchemy.util import await_only
+
+    from app.database import DATABASE_MODE, async_engine, engine
+    from app.main import app
+
+    delay = args.rtt_ms / 1000
+    if delay and DATABASE_MODE == "async":
+        @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+        def _async_rtt(*_):
+            await_only(asyncio.sleep(delay))
+    elif delay:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _rtt(*_):
+            time.sleep(delay)
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def seed(users: int):
+    """Users with an active contest and five finished ones; returns their tokens."""
+    from app.auth import create_access_token
+    from app.database import SessionLocal
+    from app.main import app  # noqa: F401 (creates and migrates the schema)
+    from app.models import (
+        Contest,
+        ContestProblem,
+        ContestStatus,
+        SubmissionStatus,
+        User,
+    )
+    from app.services.user_stats import rebuild_user_stats
+
+    db = SessionLocal()
+    started = datetime(2025, 1, 1)
+    user_ids = []
+    for u in range(users):
+        user = User(username=f"bench-async-{u}", password="x", rating=30)
+        db.add(user)
+        db.flush()
+        for c in range(6):
+            active = c == 5
+            contest = Contest(
+                user_id=user.id, title=f"Contest {c}", rating_at_start=30,
+                status=ContestStatus.ACTIVE if active else ContestStatus.COMPLETED,
+                num_problems=4, problems_solved=1, rating_change=0 if active else 2,
+                started_at=started + timedelta(days=c),
+                ended_at=None if active else started + timedelta(days=c, minutes=90),
+            )
+            db.add(contest)
+            db.flush()
+            for i in range(4):
+                db.add(ContestProblem(
+                    contest_id=contest.id, problem_id=f"p-{u}-{c}-{i}",
+                    problem_name=f"p-{u}-{c}-{i}", topic=TOPICS[i % len(TOPICS)],
+                    difficulty=30, source="codeforces", status=SubmissionStatus.PENDING,
+                ))
+        user_ids.append(user.id)
+    rebuild_user_stats(db, user_ids)
+    db.commit()
+    db.close()
+    return [create_access_token({"sub": str(user_id)}) for user_id in user_ids]
+
+
+async def _get(reader, writer, path: str, token: str) -> int:
+    """One keep-alive HTTP/1.1 GET; returns the status code."""
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: bench\r\nCookie: access_token={token}\r\n\r\n".encode()
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def load(args, tokens):
+    # A bare-bones client: the load generator shares the machine with the
+    # server, and a full HTTP client's per-request overhead at 500
+    # connections would be measured instead of the server
+    latencies, errors = [], 0
+    deadline = time.monotonic() + args.seconds
+
+    async def worker(n):
+        nonlocal errors
+        rng = random.Random(n)
+        token = tokens[n % len(tokens)]
+        reader, writer = await asyncio.open_connection("127.0.0.1", args.port)
+        try:
+            while time.monotonic() < deadline:
+                t0 = time.perf_counter()
+                try:
+                    status = await asyncio.wait_for(
+                        _get(reader, writer, rng.choice(ROUTES), token), args.timeout
+                    )
+                    ok = status == 200
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    # The connection is unusable mid-response; this client stops
+                    errors += 1
+                    break
+                if ok:
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                else:
+                    errors += 1
+        finally:
+            writer.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(args.clients)))
+    return latencies, errors, time.perf_counter() - t0
+
+
+def wait_until_up(port: int, timeout: float = 60) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    sys.exit(f"server on port {port} didn't start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=5.0, help="delay per statement")
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--modes", default="sync,async")
+    parser.add_argument("--timeout", type=float, default=10, help="seconds per request")
+    parser.add_argument("--port", type=int, default=8097)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    # The app's database module reads these at import time
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ["DATABASE_POOL_SIZE"] = str(args.pool_size)
+    os.environ["DATABASE_MAX_OVERFLOW"] = "0"
+    tokens = seed(args.users)
+
+    print("=" * 72)
+    print(f"{args.clients} clients, {args.seconds:g}s per mode, "
+          f"{args.rtt_ms} ms per statement, pool {args.pool_size}")
+    print("=" * 72)
+    for mode in args.modes.split(","):
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--serve", "--port", str(args.port),
+             "--rtt-ms", str(args.rtt_ms)],
+            env={**os.environ, "DATABASE_MODE": mode},
+            # Pool timeouts under overload would flood the report
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up(args.port)
+            latencies, errors, elapsed = asyncio.run(load(args, tokens))
+        finally:
+            # A graceful shutdown would wait out requests stuck on the pool
+            server.terminate()
+            try:
+                server.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+        if not latencies:
+            print(f"  {mode:<6} no successful requests, errors {errors}")
+            continue
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"  {mode:<6} {len(latencies) / elapsed:8.1f} req/s  errors {errors:<5} "
+              f"p50 {statistics.median(latencies):7.1f} ms  p99 {p99:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Measure generate_contest latency while the catalog is hot-reloaded.
+
+A background thread keeps reloading a synthetic binary catalog through
+CatalogHolder while the main thread generates contests; the p99 should
+stay close to the idle p99 because indexes are built before the swap.
+
+Usage:
+    python scripts/bench_catalog_reload.py --size 200000 --runs 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.contest_generator import ContestGenerator  # noqa: E402
+from app.services.problem_catalog import ProblemCatalog  # noqa: E402
+from bench_contest_generator import (  # noqa: E402
+    make_synthetic_problems,
+    summarize,
+    time_calls,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Catalog hot-reload benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "problems.bin")
+        ProblemCatalog.from_problems(make_synthetic_problems(args.size)).save(path)
+
+        generator = ContestGenerator(problems=[])
+        generator.holder.loader = lambda: ProblemCatalog.open(path)
+        generator.holder.reload()
+
+        def run():
+            generator.generate_contest(
+                "bench", random.randint(20, 60), {}, strategy="weighted"
+            )
+
+        print(f"\n{args.size:,} problems")
+        print(f"  idle         : {summarize(time_calls(run, args.runs))}")
+
+        stop = threading.Event()
+        reloads = 0
+
+        def reloader():
+            nonlocal reloads
+            while not stop.is_set():
+                generator.holder.reload()
+                reloads += 1
+
+        thread = threading.Thread(target=reloader, daemon=True)
+        thread.start()
+        samples = time_calls(run, args.runs)
+        stop.set()
+        thread.join()
+        print(f"  while reload : {summarize(samples)}   [{reloads} swaps]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: JSON catalog parse vs. mapping the binary artifact.
+
+Writes synthetic standardized_problems.json / .bin pairs to a temp directory
+and times how long ContestGenerator would take to get a usable catalog.
+
+Usage:
+    python scripts/bench_catalog_startup.py --sizes 20000,200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.problem_catalog import ProblemCatalog  # noqa: E402
+from bench_contest_generator import make_synthetic_problems  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="20000,200000")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Catalog cold-start benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [int(s) for s in args.sizes.split(",")]:
+            problems = make_synthetic_problems(size)
+            json_path = os.path.join(tmp, f"problems_{size}.json")
+            bin_path = os.path.join(tmp, f"problems_{size}.bin")
+            with open(json_path, "w") as f:
+                json.dump({"problems": problems}, f, indent=2)
+            ProblemCatalog.from_problems(problems).save(bin_path)
+            del problems
+
+            t0 = time.perf_counter()
+            with open(json_path, "r") as f:
+                ProblemCatalog.from_problems(json.load(f)["problems"])
+            json_ms = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            catalog = ProblemCatalog.open(bin_path)
+            catalog.rating_range(30, 40)
+            mmap_ms = (time.perf_counter() - t0) * 1000
+
+            print(f"\n{size:,} problems")
+            print(f"  JSON parse + build : {json_ms:10.1f} ms "
+                  f"({os.path.getsize(json_path) / (1024 * 1024):.1f} MB)")
+            print(f"  mmap artifact      : {mmap_ms:10.3f} ms "
+                  f"({os.path.getsize(bin_path) / (1024 * 1024):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for ContestGenerator.generate_contest against catalog size.
+
+Builds synthetic catalogs (20k, 200k and 2M problems by default) and compares
+the rating-indexed generator with the previous linear-scan selection.
+
+Usage:
+    python scripts/bench_contest_generator.py
+    python scripts/bench_contest_generator.py --sizes 20000,200000 --runs 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.contest_generator import ContestGenerator  # noqa: E402
+from app.services.problem_catalog import SeenSet  # noqa: E402
+
+SOURCES = ["codeforces", "atcoder", "usaco_guide"]
+TAGS = [
+    "dp",
+    "greedy",
+    "math",
+    "graphs",
+    "binary search",
+    "implementation",
+    "strings",
+    "trees",
+    "number theory",
+    "sortings",
+]
+# Distinct pattern_ids per leading tag
+PATTERN_VARIANTS = 4
+# Problem names are 2-4 of these words, like "Lucky Array Queries"
+NAME_WORDS = (
+    "array string tree graph path game queries sum xor permutation subsequence "
+    "matrix grid robot candies coins lucky beautiful minimum maximum balanced "
+    "binary segments intervals towers cities roads friends teams party shop "
+    "secret magic dragon knight palindrome divisors primes fractions painting "
+    "cards dice chess stones walls bridges rivers islands gifts birthday garden "
+    "circle triangle square polygon points lines cows farmer milk fence barn"
+).split()
+
+
+def make_synthetic_problems(count: int, seed: int = 42) -> List[Dict]:
+    """Generate problems shaped like standardized_problems.json entries."""
+    rng = random.Random(seed)
+    problems = []
+    for i in range(count):
+        tags = rng.sample(TAGS, rng.randint(1, 3))
+        rating = rng.randint(1, 100)
+        source = rng.choice(SOURCES)
+        name = " ".join(rng.sample(NAME_WORDS, rng.randint(2, 4))).title()
+        # AtCoder problems carry no tags upstream, hence no pattern
+        pattern_id = (
+            None
+            if source == "atcoder"
+            else f"{tags[0].replace(' ', '_')}_{rng.randint(1, PATTERN_VARIANTS)}"
+        )
+        problems.append(
+            {
+                "id": f"syn-{i}",
+                "name": name,
+                "url": f"https://example.com/problem/{i}",
+                "source": source,
+                "original_difficulty": str(800 + rating * 22),
+                "internal_rating": rating,
+                "primary_skills": tags[:1],
+                "secondary_skills": tags[1:],
+                "pattern_id": pattern_id,
+                "tags": tags,
+                "extra": {
+                    "contestId": 1000 + i // 6,
+                    "index": "ABCDEF"[i % 6],
+                    "type": "PROGRAMMING",
+                    "solvedCount": rng.randint(0, 50000),
+                },
+            }
+        )
+    return problems
+
+
+def legacy_select(problems: List[Dict], user_rating: int, count: int = 4) -> List[Dict]:
+    """The pre-index selection: a full scan per lookup, repeated when widening."""
+
+    def in_range(lo, hi):
+        return [p for p in problems if lo <= p.get("internal_rating", 0) <= hi]
+
+    eligible = in_range(user_rating, user_rating + 10)
+    if len(eligible) < count:
+        eligible = in_range(max(1, user_rating - 5), user_rating + 15)
+    if len(eligible) < count:
+        return eligible
+    return random.sample(eligible, count)
+
+
+def time_calls(fn, runs: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def summarize(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {p50:9.3f} ms   p99 {p99:9.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="20000,200000,2000000")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--legacy-runs", type=int, default=10)
+    parser.add_argument(
+        "--history",
+        default="0,1000,5000",
+        help="seen-set sizes (problems already played near the user's rating)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ContestGenerator.generate_contest benchmark")
+    print("=" * 60)
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        problems = make_synthetic_problems(size)
+
+        t0 = time.perf_counter()
+        generator = ContestGenerator(problems=problems)
+        generator.client = None  # keep the LLM out of the measurement
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        ratings = [random.randint(1, 95) for _ in range(args.runs)]
+        it = iter(ratings)
+        indexed = time_calls(
+            lambda: generator.generate_contest("bench", next(it), {}), args.runs
+        )
+        legacy = time_calls(
+            lambda: legacy_select(problems, random.randint(1, 95)), args.legacy_runs
+        )
+
+        print(f"\n{size:,} problems (index build {build_ms:.0f} ms)")
+        print(f"  indexed generate : {summarize(indexed)}")
+        print(f"  legacy scan      : {summarize(legacy)}")
+
+        # Seen problems are concentrated around the user's rating (40 here)
+        start, end = generator.catalog.rating_range(25, 55)
+        for history in [int(h) for h in args.history.split(",")]:
+            seen = SeenSet()
+            for ordinal in random.sample(range(start, end), min(history, end - start)):
+                seen.add(ordinal)
+            excluded = time_calls(
+                lambda: generator.generate_contest("bench", 40, {}, seen=seen), args.runs
+            )
+            print(f"  seen={history:<6}      : {summarize(excluded)}")
+
+        del generator, problems
+
+
+if __name__ == "__main__":
+    main()
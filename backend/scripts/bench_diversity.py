@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark diversity-constrained selection against rejection sampling.
+
+The baseline redraws a uniform contest from the rating window until no
+pattern_id repeats and each source in the mix has exactly its quota;
+strategy="diverse" builds the contest from per-(bucket, pattern) and
+per-(bucket, source) cells.
+
+Usage:
+    python scripts/bench_diversity.py --sizes 20000,200000 --runs 500
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.contest_generator import ContestGenerator  # noqa: E402
+from bench_contest_generator import (  # noqa: E402
+    make_synthetic_problems,
+    summarize,
+    time_calls,
+)
+
+SOURCE_MIX = {"codeforces": 2, "atcoder": 1}
+MAX_ATTEMPTS = 1000
+
+
+def rejection_select(generator, user_rating, count=4):
+    """Redraw uniformly until the contest satisfies the constraints."""
+    snapshot = generator.snapshot
+    catalog = snapshot.catalog
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        ordinals = generator._select_random_ordinals(snapshot, user_rating, count)
+        patterns = [catalog.pattern_ids[o] for o in ordinals if catalog.pattern_ids[o]]
+        sources = Counter(catalog.sources[catalog.source_ids[o]] for o in ordinals)
+        if len(patterns) == len(set(patterns)) and all(
+            sources[s] == n for s, n in SOURCE_MIX.items()
+        ):
+            return ordinals, attempt
+    return ordinals, MAX_ATTEMPTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="20000,200000")
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Diversity-constrained selection benchmark")
+    print(f"Source mix: {SOURCE_MIX}, distinct pattern_id")
+    print("=" * 60)
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        generator = ContestGenerator(problems=make_synthetic_problems(size))
+
+        t0 = time.perf_counter()
+        generator.diversity_selector
+        build_ms = (time.perf_counter() - t0) * 1000
+        print(f"\n{size:,} problems (pattern/source cells built in {build_ms:.0f} ms)")
+
+        attempts = []
+        samples = time_calls(
+            lambda: attempts.append(
+                rejection_select(generator, random.randint(20, 60))[1]
+            ),
+            args.runs,
+        )
+        print(f"  rejection: {summarize(samples)}   "
+              f"[{sum(attempts) / len(attempts):.1f} draws/contest]")
+
+        samples = time_calls(
+            lambda: generator._select_random_ordinals(
+                generator.snapshot,
+                random.randint(20, 60),
+                4,
+                strategy="diverse",
+                source_mix=SOURCE_MIX,
+            ),
+            args.runs,
+        )
+        print(f"  diverse  : {summarize(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Show the Gemini circuit breaker tripping and recovering against the stub LLM.
+
+Runs title generation through three phases: a healthy model, an outage
+(every call slow and failing), and recovery. Reports per-phase latency,
+how many calls reached the model and the breaker state at the end of each
+phase.
+
+Usage:
+    python scripts/bench_llm_breaker.py --outage-latency 2.0 --calls 40
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stub_llm_server import StubHandler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--outage-latency", type=float, default=2.0)
+    parser.add_argument("--calls", type=int, default=40, help="calls per phase")
+    parser.add_argument("--cooldown", type=float, default=3.0)
+    parser.add_argument("--window", type=float, default=60.0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The generator modules read these at import time
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["LLM_BREAKER_COOLDOWN_SECONDS"] = str(args.cooldown)
+    os.environ["LLM_BREAKER_WINDOW_SECONDS"] = str(args.window)
+    from app.services.contest_generator import ContestGenerator
+    from bench_contest_generator import make_synthetic_problems, summarize
+
+    generator = ContestGenerator(problems=make_synthetic_problems(1000))
+    generator.title_pool.enabled = generator.traits_pool.enabled = False
+
+    print("=" * 60)
+    print(f"Circuit breaker benchmark (outage latency {args.outage_latency}s, "
+          f"window {args.window}s, cooldown {args.cooldown}s)")
+    print("=" * 60)
+
+    phases = [
+        ("healthy", args.latency, 0.0),
+        ("outage", args.outage_latency, 1.0),
+        ("recovery", args.latency, 0.0),
+    ]
+    call_id = 0
+    for name, latency, fail_rate in phases:
+        StubHandler.latency, StubHandler.fail_rate = latency, fail_rate
+        if name == "recovery":
+            time.sleep(args.cooldown)
+        calls_before = StubHandler.calls
+        samples = []
+        for _ in range(args.calls):
+            call_id += 1
+            t0 = time.perf_counter()
+            # Distinct stats so the LLM cache never answers
+            generator.generate_title({f"tag{call_id}": 1})
+            samples.append((time.perf_counter() - t0) * 1000)
+        stats = generator.llm.breaker.stats()
+        print(f"  {name:<8} : {summarize(samples)}")
+        print(f"             model calls {StubHandler.calls - calls_before}/{args.calls}, "
+              f"breaker {stats['state']}, rejected so far {stats['rejected']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Measure the LLM response cache on a synthetic user population.
+
+Generates titles for users with randomly drawn tag stats through the stub
+LLM server (in-process), with and without the cache, and reports latency,
+hit rate and how many model calls were made.
+
+Usage:
+    python scripts/bench_llm_cache.py --users 500 --latency 0.3
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stub_llm_server import StubHandler  # noqa: E402
+
+TAG_POPULARITY = {
+    "implementation": 8,
+    "math": 6,
+    "greedy": 6,
+    "dp": 4,
+    "graphs": 3,
+    "strings": 2,
+    "trees": 2,
+    "binary search": 2,
+    "number theory": 1,
+    "sortings": 1,
+}
+
+
+def random_stats(rng: random.Random) -> dict:
+    """Tag -> solved count for a user, skewed towards popular tags."""
+    solved = int(rng.paretovariate(1.2) * 5)
+    tags = rng.choices(list(TAG_POPULARITY), weights=TAG_POPULARITY.values(), k=solved)
+    stats = {}
+    for tag in tags:
+        stats[tag] = stats.get(tag, 0) + 1
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The generator module reads these at import time
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    from app.services.contest_generator import ContestGenerator
+    from app.services.llm_cache import LLMCache
+    from bench_contest_generator import summarize
+
+    generator = ContestGenerator(problems=[])
+    population = [random_stats(random.Random(i)) for i in range(args.users)]
+
+    print("=" * 60)
+    print(f"LLM cache benchmark ({args.users} users, LLM latency {args.latency}s)")
+    print("=" * 60)
+
+    for label, cache in [("no cache", LLMCache(size=0)), ("cached", LLMCache())]:
+        generator.llm_cache = cache
+        calls_before = StubHandler.calls
+        samples = []
+        for stats in population:
+            t0 = time.perf_counter()
+            generator.generate_title(stats)
+            samples.append((time.perf_counter() - t0) * 1000)
+        stats = cache.stats()
+        print(f"  {label:<9}: {summarize(samples)}   "
+              f"[model calls {StubHandler.calls - calls_before}, "
+              f"hit rate {stats['hit_rate']:.0%}]")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
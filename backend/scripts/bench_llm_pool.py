@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Measure title/traits serving from the pre-generated LLM pools.
+
+Starts scripts/stub_llm_server.py in-process, prefills the pools, then
+serves a stream of title and traits requests for random levels at a fixed
+rate. Reports per-draw latency, the share served from the pool (the rest
+take the bounded on-demand path), and model calls per item served.
+
+Usage:
+    python scripts/bench_llm_pool.py --latency 1.5 --rate 50 --seconds 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stub_llm_server import StubHandler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=1.5)
+    parser.add_argument("--rate", type=float, default=50, help="requests per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--low-water", type=int, default=5)
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The generator modules read these at import time
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["LLM_POOL_TARGET_DEPTH"] = str(args.depth)
+    os.environ["LLM_POOL_LOW_WATER"] = str(args.low_water)
+    from app.services.contest_generator import LLM_POOL_WORKERS, ContestGenerator
+    from app.services.llm_pool import MAX_LEVEL_BAND, POOL_DRAWS
+    from bench_contest_generator import make_synthetic_problems, summarize
+
+    generator = ContestGenerator(problems=make_synthetic_problems(1000))
+
+    print("=" * 60)
+    print(f"LLM pool benchmark (LLM {args.latency}s, {args.rate:g} req/s, "
+          f"depth {args.depth}, low water {args.low_water})")
+    print("=" * 60)
+
+    generator.prefill_pools()
+    # One refill per band and pool, LLM_POOL_WORKERS at a time
+    refills = 2 * (MAX_LEVEL_BAND + 1)
+    time.sleep(args.latency * -(-refills // LLM_POOL_WORKERS) + 0.5)
+    prefill_calls = StubHandler.calls
+
+    rng = random.Random(7)
+    title_ms, traits_ms = [], []
+    served = 0
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        level = rng.randint(1, 60)
+        t0 = time.perf_counter()
+        generator.start_title({"dp": 3}, level=level).result()
+        title_ms.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        generator.generate_traits_and_title({"dp": 3}, level, [], 4)
+        traits_ms.append((time.perf_counter() - t0) * 1000)
+        served += 2
+        time.sleep(1 / args.rate)
+
+    for kind in ("title", "traits"):
+        hits = POOL_DRAWS.value(kind=kind, result="hit")
+        empty = POOL_DRAWS.value(kind=kind, result="empty")
+        print(f"  {kind:<6} pool hits : {hits:.0f}/{hits + empty:.0f}")
+    print(f"  start_title      : {summarize(title_ms)}")
+    print(f"  traits           : {summarize(traits_ms)}")
+    calls = StubHandler.calls - prefill_calls
+    print(f"  model calls      : {prefill_calls} prefill, {calls} while serving "
+          f"{served} items ({calls / served:.2f} per item)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Compare the old and new /mark-solved write paths.
+
+Gives a synthetic user population one active contest each, with problems
+from a small shared pool so some users have solved them before. It then
+marks every problem solved, first with the previous read-modify-write
+implementation and then with app.services.progress.mark_solved, and
+reports statements per call (counted at the cursor), commits and latency.
+``--rtt-ms`` adds that much sleep per statement to stand in for the
+network round trip to a hosted database.
+
+Uses its own SQLite database unless DATABASE_URL is set. On PostgreSQL the
+new path's writes go out as a single statement.
+
+Usage:
+    python scripts/bench_mark_solved.py --users 300 --rtt-ms 2
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_contest_generator import make_synthetic_problems  # noqa: E402
+
+TOPICS = ["greedy", "dp", "graphs", "math", "strings"]
+
+
+def old_mark_solved(db, user_id, problem_id, catalog):
+    """The pre-upsert implementation, less the HTTP layer."""
+    from app.models import (
+        Contest,
+        ContestProblem,
+        ContestStatus,
+        ProblemHistory,
+        SubmissionStatus,
+        User,
+        UserTopicRating,
+    )
+    from app.services.seen_set import record_seen
+
+    current_user = db.query(User).filter(User.id == user_id).first()
+    active = (
+        db.query(Contest)
+        .filter(Contest.user_id == user_id, Contest.status == ContestStatus.ACTIVE)
+        .first()
+    )
+    cp = (
+        db.query(ContestProblem)
+        .filter(
+            ContestProblem.contest_id == active.id,
+            ContestProblem.problem_id == problem_id,
+        )
+        .first()
+    )
+    cp.status = SubmissionStatus.SOLVED
+    cp.submitted_at = datetime.utcnow()
+    cp.attempts = (cp.attempts or 0) + 1
+    db.flush()
+    active.problems_solved = (
+        db.query(ContestProblem)
+        .filter(
+            ContestProblem.contest_id == active.id,
+            ContestProblem.status == SubmissionStatus.SOLVED,
+        )
+        .count()
+    )
+    topic_row = (
+        db.query(UserTopicRating)
+        .filter(UserTopicRating.user_id == user_id, UserTopicRating.topic == cp.topic)
+        .first()
+    )
+    if topic_row:
+        topic_row.problems_solved = (topic_row.problems_solved or 0) + 1
+        topic_row.updated_at = datetime.utcnow()
+    else:
+        db.add(UserTopicRating(
+            user_id=user_id, topic=cp.topic, rating=0,
+            problems_solved=1, problems_attempted=1,
+        ))
+    ph = (
+        db.query(ProblemHistory)
+        .filter(ProblemHistory.user_id == user_id, ProblemHistory.problem_id == problem_id)
+        .first()
+    )
+    if ph:
+        ph.times_solved = (ph.times_solved or 0) + 1
+        ph.times_attempted = (ph.times_attempted or 0) + 1
+        ph.last_attempted_at = datetime.utcnow()
+    else:
+        db.add(ProblemHistory(
+            user_id=user_id, problem_id=problem_id, times_solved=1, times_attempted=1,
+        ))
+        record_seen(db, user_id, catalog, problem_id)
+    current_user.total_problems_solved = (current_user.total_problems_solved or 0) + 1
+    current_user.total_problems_attempted = (current_user.total_problems_attempted or 0) + 1
+    current_user.updated_at = datetime.utcnow()
+    db.commit()
+
+
+def new_mark_solved(db, user_id, problem_id, catalog):
+    """The route body after this change."""
+    from app.services.progress import mark_solved
+    from app.services.seen_set import record_seen
+
+    solved = mark_solved(db, user_id, problem_id)
+    if solved.first_solve:
+        record_seen(db, user_id, catalog, solved.problem_id)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--pool", type=int, default=40, help="distinct problems")
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="sleep per statement")
+    args = parser.parse_args()
+
+    # The app's database module reads this at import time
+    tmpdir = tempfile.mkdtemp()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmpdir}/bench.db")
+    from sqlalchemy import event
+
+    from app.database import Base, SessionLocal, engine
+    from app.models import (
+        Contest,
+        ContestProblem,
+        ContestStatus,
+        ProblemHistory,
+        SubmissionStatus,
+        User,
+    )
+    from app.services.problem_catalog import ProblemCatalog
+
+    Base.metadata.create_all(bind=engine)
+    problems = make_synthetic_problems(2000)
+    catalog = ProblemCatalog.from_problems(problems)
+    pool = [p["id"] for p in problems[: args.pool]]
+    rng = random.Random(7)
+
+    def populate(label):
+        """One active contest per user; returns [(user_id, problem_ids)]."""
+        db = SessionLocal()
+        work = []
+        for u in range(args.users):
+            user = User(username=f"bench-solve-{label}-{u}", password="x", rating=30)
+            db.add(user)
+            db.flush()
+            contest = Contest(
+                user_id=user.id, status=ContestStatus.ACTIVE, rating_at_start=30,
+                num_problems=4, problems_solved=0,
+            )
+            db.add(contest)
+            db.flush()
+            picked = rng.sample(pool, 4)
+            for i, problem_id in enumerate(picked):
+                db.add(ContestProblem(
+                    contest_id=contest.id, problem_id=problem_id,
+                    problem_name=problem_id, topic=TOPICS[i % len(TOPICS)],
+                    difficulty=30, source="codeforces", status=SubmissionStatus.PENDING,
+                ))
+                if rng.random() < 0.3:
+                    db.add(ProblemHistory(
+                        user_id=user.id, problem_id=problem_id,
+                        times_attempted=1, times_solved=1,
+                    ))
+            work.append((user.id, picked))
+        db.commit()
+        db.close()
+        return work
+
+    counts = {"statements": 0, "commits": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _statement(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+        if args.rtt_ms:
+            time.sleep(args.rtt_ms / 1000)
+
+    @event.listens_for(engine, "commit")
+    def _commit(conn):
+        counts["commits"] += 1
+        if args.rtt_ms:
+            time.sleep(args.rtt_ms / 1000)
+
+    def run(label, fn):
+        work = populate(label)
+        counts.update(statements=0, commits=0)
+        latencies = []
+        db = SessionLocal()
+        for user_id, picked in work:
+            for problem_id in picked:
+                t0 = time.perf_counter()
+                fn(db, user_id, problem_id, catalog)
+                latencies.append((time.perf_counter() - t0) * 1000)
+        db.close()
+        calls = len(latencies)
+        latencies.sort()
+        p99 = latencies[min(calls - 1, int(calls * 0.99))]
+        print(f"  {label:<4} statements/call {counts['statements'] / calls:5.2f}  "
+              f"commits/call {counts['commits'] / calls:4.2f}  "
+              f"p50 {statistics.median(latencies):6.2f} ms  p99 {p99:6.2f} ms")
+
+    print("=" * 72)
+    print(f"mark-solved benchmark ({args.users} users x 4 problems, "
+          f"{engine.dialect.name}, {args.rtt_ms} ms per round trip)")
+    print("=" * 72)
+    run("old", old_mark_solved)
+    run("new", new_mark_solved)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/problems filtering against a scan of the problem dicts.
+
+Runs a mix of browse queries (rating window, source, tag, name substring
+and their combinations, first pages and follow-up pages) through
+ProblemSearchIndex and through a filter over the parsed problem list.
+
+Usage:
+    python scripts/bench_problem_search.py --sizes 20000,200000 --runs 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.problem_catalog import ProblemCatalog  # noqa: E402
+from app.services.problem_search import ProblemSearchIndex  # noqa: E402
+from bench_contest_generator import (  # noqa: E402
+    NAME_WORDS,
+    SOURCES,
+    TAGS,
+    make_synthetic_problems,
+    summarize,
+    time_calls,
+)
+
+PAGE_SIZE = 50
+
+
+def random_query(rng: random.Random) -> dict:
+    low = rng.randint(0, 90)
+    query = {"min_rating": low, "max_rating": low + rng.choice([5, 10, 100])}
+    if rng.random() < 0.4:
+        query["source"] = rng.choice(SOURCES)
+    if rng.random() < 0.4:
+        query["tag"] = rng.choice(TAGS)
+    if rng.random() < 0.4:
+        word = rng.choice(NAME_WORDS)
+        start = rng.randrange(max(1, len(word) - 3))
+        query["query"] = word[start : start + rng.randint(3, 6)]
+    return query
+
+
+def scan(problems, min_rating, max_rating, source=None, tag=None, query=None):
+    """The straightforward version: filter every problem, sort, take a page."""
+    needle = query.lower() if query else None
+    matches = [
+        p
+        for p in problems
+        if min_rating <= p["internal_rating"] <= max_rating
+        and (source is None or p["source"] == source)
+        and (tag is None or tag in p["tags"])
+        and (needle is None or needle in p["name"].lower())
+    ]
+    matches.sort(key=lambda p: p["internal_rating"])
+    return matches[:PAGE_SIZE], len(matches)
+
+
+def retained_size(obj, exclude=()):
+    """
+    Bytes and Python objects held by ``obj`` and the containers it
+    references, not counting ``exclude``.
+    """
+    seen = {id(o) for o in exclude}
+    total = 0
+    objects = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        objects += 1
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__"):
+            stack.append(vars(o))
+    return total, objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="20000,200000")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--scan-runs", type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Problem browse/search benchmark")
+    print("=" * 60)
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        problems = make_synthetic_problems(size)
+        catalog = ProblemCatalog.from_problems(problems)
+
+        t0 = time.perf_counter()
+        index = ProblemSearchIndex(catalog)
+        build_ms = (time.perf_counter() - t0) * 1000
+        retained, objects = retained_size(index, exclude=(catalog,))
+        print(f"\n{size:,} problems (search index built in {build_ms:.0f} ms, "
+              f"{retained / 2**20:.1f} MB in {objects:,} objects)")
+
+        rng = random.Random(7)
+        samples = time_calls(
+            lambda: scan(problems, **random_query(rng)), args.scan_runs
+        )
+        print(f"  scan            : {summarize(samples)}")
+
+        rng = random.Random(7)
+
+        def first_page():
+            ordinals, _total, _cursor = index.search(
+                **random_query(rng), limit=PAGE_SIZE
+            )
+            [catalog.problem(o) for o in ordinals]
+
+        print(f"  index, page 1   : {summarize(time_calls(first_page, args.runs))}")
+
+        rng = random.Random(7)
+
+        def later_page():
+            query = random_query(rng)
+            _ordinals, _total, cursor = index.search(**query, limit=PAGE_SIZE)
+            if cursor:
+                ordinals, _total, _cursor = index.search(
+                    **query, limit=PAGE_SIZE, cursor=cursor
+                )
+                [catalog.problem(o) for o in ordinals]
+
+        print(f"  index, page 1+2 : {summarize(time_calls(later_page, args.runs))}")
+
+
+if __name__ == "__main__":
+    main()
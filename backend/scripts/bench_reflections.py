@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Measure the reflection pipeline's per-problem work sharing.
+
+Creates completed contests for a synthetic user population whose problems
+are drawn from a small shared pool, runs every contest problem through
+ReflectionPipeline against an in-process fake LLM and fake editorial
+fetcher, and reports model calls, editorial fetches, prompt volume and
+wall time next to the one-brief-per-job baseline.
+
+Uses its own SQLite database unless DATABASE_URL is set.
+
+Usage:
+    python scripts/bench_reflections.py --users 200 --pool 40 --latency 0.05
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stub_llm_server import BRIEF, REFLECTION  # noqa: E402
+
+
+class FakeLLM:
+    """Counts calls and prompt characters; answers like the stub server."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, prompt: str, max_output_tokens: int, temperature: float, purpose: str = ""
+    ) -> str:
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+        time.sleep(self.latency)
+        return json.dumps(REFLECTION if "pivot_sentence" in prompt else BRIEF)
+
+
+class FakeEditorials:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.fetches = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, problem_url):
+        with self._lock:
+            self.fetches += 1
+        time.sleep(self.latency)
+        return "Sort, then sweep once. " * 200, f"{problem_url}/editorial"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--pool", type=int, default=40, help="distinct problems")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per call")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    # The app's database module reads this at import time
+    tmpdir = tempfile.mkdtemp()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmpdir}/bench.db")
+    from app.database import Base, SessionLocal, engine
+    from app.models import (
+        Contest,
+        ContestProblem,
+        ContestStatus,
+        ProblemBrief,
+        ProblemReflection,
+        SubmissionStatus,
+        User,
+    )
+    from app.services.reflections import REFLECTION_BRIEFS, ReflectionPipeline
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    db = SessionLocal()
+    cp_ids = []
+    for u in range(args.users):
+        user = User(username=f"bench-reflect-{u}-{rng.random()}", password="x", rating=30)
+        db.add(user)
+        db.flush()
+        contest = Contest(
+            user_id=user.id, status=ContestStatus.COMPLETED, rating_at_start=30
+        )
+        db.add(contest)
+        db.flush()
+        for p in rng.sample(range(args.pool), 4):
+            cp = ContestProblem(
+                contest_id=contest.id,
+                problem_id=f"bench-{p}",
+                problem_name=f"Bench Problem {p}",
+                problem_url=f"https://codeforces.com/problemset/problem/{1000 + p}/A",
+                topic="sortings",
+                difficulty=30,
+                source="codeforces",
+                status=rng.choice([SubmissionStatus.SOLVED, SubmissionStatus.PENDING]),
+                time_taken_seconds=rng.randint(60, 3600),
+            )
+            db.add(cp)
+            db.flush()
+            cp_ids.append(cp.id)
+    db.commit()
+    db.close()
+
+    llm, editorials = FakeLLM(args.latency), FakeEditorials(args.latency)
+    pipeline = ReflectionPipeline(
+        SessionLocal, llm, fetch_editorial=editorials, workers=args.workers
+    )
+
+    print("=" * 60)
+    print(f"Reflection pipeline benchmark ({args.users} users, {len(cp_ids)} jobs, "
+          f"{args.pool} distinct problems, {args.latency}s per call)")
+    print("=" * 60)
+
+    t0 = time.perf_counter()
+    pipeline.enqueue(cp_ids)
+    pipeline.shutdown(wait=True)
+    elapsed = time.perf_counter() - t0
+
+    db = SessionLocal()
+    written = (
+        db.query(ProblemReflection)
+        .filter(ProblemReflection.contest_problem_id.in_(cp_ids))
+        .filter(ProblemReflection.generation_error.is_(None))
+        .count()
+    )
+    briefs = db.query(ProblemBrief).filter(ProblemBrief.problem_id.like("bench-%")).count()
+    db.close()
+
+    jobs = len(cp_ids)
+    print(f"  reflections written : {written}/{jobs}, briefs stored: {briefs}")
+    sources = ("generated", "memory", "db")
+    print("  briefs by source    : " + ", ".join(
+        f"{s} {REFLECTION_BRIEFS.value(source=s):.0f}" for s in sources))
+    print(f"  model calls         : {llm.calls} (one brief per job: {2 * jobs})")
+    print(f"  editorial fetches   : {editorials.fetches} (one per job: {jobs})")
+    print(f"  prompt volume       : {llm.prompt_chars / 1000:.0f}k chars")
+    print(f"  wall time           : {elapsed:.2f}s with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
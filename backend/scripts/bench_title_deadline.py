@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measure generate_contest latency with a slow LLM behind the title deadline.
+
+Starts scripts/stub_llm_server.py in-process with the given latency, points
+the Gemini client at it and times generate_contest, reporting how often the
+fallback title was used and how many late titles arrived afterwards.
+
+Usage:
+    python scripts/bench_title_deadline.py --latency 2.0 --deadline 0.8 --runs 50
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stub_llm_server import StubHandler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=2.0)
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--deadline", type=float, default=0.8)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.jitter = args.jitter
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # The generator module reads these at import time
+    os.environ["GEMINI_API_KEY"] = "stub"
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["TITLE_DEADLINE_SECONDS"] = str(args.deadline)
+    from app.services.contest_generator import ContestGenerator
+    from bench_contest_generator import make_synthetic_problems, summarize
+
+    generator = ContestGenerator(problems=make_synthetic_problems(20000))
+
+    print("=" * 60)
+    print(f"Title deadline benchmark (LLM {args.latency}s +/- {args.jitter}s, "
+          f"deadline {args.deadline}s)")
+    print("=" * 60)
+
+    samples, fallbacks, late = [], 0, []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        contest = generator.generate_contest("bench", 40, {"dp": 3})
+        samples.append((time.perf_counter() - t0) * 1000)
+        if contest["pendingTitle"] is not None:
+            fallbacks += 1
+            contest["pendingTitle"].on_ready(late.append)
+
+    time.sleep(args.latency + args.jitter + 0.5)
+    print(f"  generate_contest : {summarize(samples)}")
+    print(f"  fallback titles  : {fallbacks}/{args.runs}, "
+          f"late titles delivered: {len(late)}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Report resident memory per problem for the in-memory problem catalog.
+
+Compares the previous representation (every problem from
+standardized_problems.json kept as a parsed dict) with the columnar
+ProblemCatalog. Uses output/standardized_problems.json when present,
+otherwise a synthetic catalog.
+
+Usage:
+    python scripts/catalog_memory_report.py
+    python scripts/catalog_memory_report.py --synthetic 200000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.contest_generator import PROBLEMS_FILE  # noqa: E402
+from app.services.problem_catalog import ProblemCatalog  # noqa: E402
+from bench_contest_generator import make_synthetic_problems  # noqa: E402
+
+
+def measure(build):
+    """Return (object, bytes still allocated by build() once it returns)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic or not os.path.exists(PROBLEMS_FILE):
+        count = args.synthetic or 20000
+        source = f"synthetic ({count:,} problems)"
+        raw = json.dumps({"problems": make_synthetic_problems(count)})
+    else:
+        source = os.path.abspath(PROBLEMS_FILE)
+        with open(PROBLEMS_FILE, "r") as f:
+            raw = f.read()
+
+    print("=" * 60)
+    print("Problem catalog memory report")
+    print("=" * 60)
+    print(f"Source: {source}")
+
+    problems, dict_bytes = measure(lambda: json.loads(raw)["problems"])
+    catalog, catalog_bytes = measure(lambda: ProblemCatalog.from_problems(problems))
+    n = max(1, len(catalog))
+
+    print(f"\nProblems: {len(catalog):,}")
+    print(f"  Before (parsed dicts): {dict_bytes / n:8.1f} bytes/problem "
+          f"({dict_bytes / (1024 * 1024):.1f} MB)")
+    print(f"  After  (columnar)    : {catalog_bytes / n:8.1f} bytes/problem "
+          f"({catalog_bytes / (1024 * 1024):.1f} MB)")
+    print(f"  Reduction            : {dict_bytes / max(1, catalog_bytes):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Pin the number of queries and rows each contest route fetches.
+
+Seeds a user with --contests finished contests (four problems each), then
+walks the contest routes through FastAPI's TestClient: generate, active,
+profile, history, list, detail, mark-solved, complete, reflections and
+abandon. Statements and the rows read back from the cursor are counted per
+request, leaving out the background reward/reflection workers, and
+compared with EXPECTED. A change in either number (a loader option lost,
+a JOIN multiplying rows, a new N+1) fails the check; when the change is
+intended, update EXPECTED.
+
+Uses its own SQLite database; the pinned counts are for the default
+--contests and page size.
+
+Usage:
+    python scripts/check_query_counts.py
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_contest_generator import make_synthetic_problems  # noqa: E402
+
+TOPICS = ["greedy", "dp", "graphs", "math", "strings"]
+# Threads whose statements aren't part of the request being measured
+BACKGROUND_THREADS = ("rewards", "reflections", "llm", "catalog")
+
+# route -> (queries, rows fetched) for the default --contests
+EXPECTED = {
+    "GET /generate": (12, 11),
+    "GET /active": (2, 5),
+    "GET /profile": (2, 5),
+    "GET /profile?include_active=false": (1, 1),
+    "GET /history": (2, 22),
+    "GET /": (3, 23),
+    "GET /{id}": (3, 6),
+    "POST /mark-solved": (8, 5),
+    "POST /complete": (6, 6),
+    "GET /{id}/reflections": (4, 6),
+    "POST /abandon": (5, 2),
+}
+
+counts = {"queries": 0, "rows": 0}
+
+
+def _measured() -> bool:
+    return not threading.current_thread().name.startswith(BACKGROUND_THREADS)
+
+
+class CountingCursor(sqlite3.Cursor):
+    """Counts the rows SQLAlchemy reads back from each statement."""
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None and _measured():
+            counts["rows"] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if _measured():
+            counts["rows"] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        if _measured():
+            counts["rows"] += len(rows)
+        return rows
+
+
+class CountingConnection(sqlite3.Connection):
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contests", type=int, default=30, help="finished contests to seed")
+    args = parser.parse_args()
+
+    # The app's database module reads this at import time
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/counts.db"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.auth import create_access_token
+    from app.database import SessionLocal, engine
+    from app.main import app
+    from app.models import (
+        Contest,
+        ContestProblem,
+        ContestStatus,
+        SubmissionStatus,
+        User,
+    )
+    from app.services.contest_generator import contest_generator
+    from app.services.problem_catalog import ProblemCatalog
+    from app.services.user_stats import rebuild_user_stats
+
+    contest_generator.holder.publish(ProblemCatalog.from_problems(make_synthetic_problems(5000)))
+
+    db = SessionLocal()
+    user = User(username="query-counts", password="x", rating=30)
+    db.add(user)
+    db.flush()
+    started = datetime(2025, 1, 1)
+    for c in range(args.contests):
+        contest = Contest(
+            user_id=user.id, title=f"Contest {c}", status=ContestStatus.COMPLETED,
+            rating_at_start=30, rating_change=2, num_problems=4, problems_solved=1,
+            started_at=started + timedelta(days=c),
+            ended_at=started + timedelta(days=c, minutes=90),
+        )
+        db.add(contest)
+        db.flush()
+        for i in range(4):
+            db.add(ContestProblem(
+                contest_id=contest.id, problem_id=f"seed-{c}-{i}", problem_name=f"seed-{c}-{i}",
+                topic=TOPICS[i % len(TOPICS)], difficulty=30, source="codeforces",
+                status=SubmissionStatus.SOLVED if i == 0 else SubmissionStatus.PENDING,
+            ))
+    rebuild_user_stats(db, [user.id])
+    db.commit()
+    user_id, finished_id = user.id, contest.id
+    db.close()
+
+    @event.listens_for(engine, "do_connect")
+    def _connect(dialect, conn_rec, cargs, cparams):
+        cparams["factory"] = CountingConnection
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _statement(conn, cursor, statement, parameters, context, executemany):
+        if _measured():
+            counts["queries"] += 1
+
+    # Pooled connections were opened before the factory was installed
+    engine.dispose()
+
+    client = TestClient(app)
+    client.cookies.set("access_token", create_access_token({"sub": str(user_id)}))
+    measured = {}
+
+    def call(name, method, path, **kwargs):
+        counts.update(queries=0, rows=0)
+        response = client.request(method, f"/api/contests{path}", **kwargs)
+        if response.status_code != 200:
+            sys.exit(f"{name} returned {response.status_code}: {response.text}")
+        measured[name] = (counts["queries"], counts["rows"])
+        return response.json()
+
+    contest = call("GET /generate", "GET", "/generate")
+    call("GET /active", "GET", "/active")
+    call("GET /profile", "GET", "/profile")
+    call("GET /profile?include_active=false", "GET", "/profile?include_active=false")
+    call("GET /history", "GET", "/history")
+    call("GET /", "GET", "/")
+    call("GET /{id}", "GET", f"/{finished_id}")
+    call("POST /mark-solved", "POST", "/mark-solved",
+         json={"questionId": contest["questions"][0]["id"]})
+    call("POST /complete", "POST", "/complete")
+    call("GET /{id}/reflections", "GET", f"/{finished_id}/reflections")
+    call("GET /generate", "GET", "/generate")
+    call("POST /abandon", "POST", "/abandon")
+
+    print(f"{'route':<36}{'queries':>9}{'rows':>7}   expected")
+    failed = []
+    for name, (queries, rows) in measured.items():
+        expected = EXPECTED.get(name)
+        ok = expected == (queries, rows)
+        if not ok:
+            failed.append(name)
+        print(f"{name:<36}{queries:>9}{rows:>7}   {expected}{'' if ok else '  <-- changed'}")
+    if failed:
+        sys.exit(f"\n{len(failed)} route(s) changed; update EXPECTED if that was intended")
+    print("\nAll routes match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Check that the contest routes' queries are served by indexes.
+
+Builds the schema without the migration-managed indexes, loads a synthetic
+dataset (a million contests by default), runs app.migrations on it, then
+EXPLAINs each hot-path query from app/routers/contests.py and fails if the
+plan doesn't use the index it's meant to.
+
+Uses a throwaway SQLite database unless --database-url is given; point
+that at an empty PostgreSQL database, never a real one.
+
+Usage:
+    python scripts/check_query_plans.py --contests 1000000
+    python scripts/check_query_plans.py --database-url postgresql://localhost/plans
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TOPICS = ["greedy", "dp", "graphs", "math", "strings", "implementation", "sortings"]
+BATCH = 50_000
+# How a primary-key lookup shows in a SQLite or PostgreSQL plan; it's not
+# migration-managed, so it's never dropped
+PRIMARY_KEY = ("INTEGER PRIMARY KEY", "_pkey")
+
+
+def load_dataset(engine, users: int, contests: int, per_contest: int) -> None:
+    """Insert the synthetic rows; every user's newest contest is active."""
+    from app.models import (
+        Contest,
+        ContestProblem,
+        ContestStatus,
+        ProblemHistory,
+        SubmissionStatus,
+        User,
+        UserTopicRating,
+        WeakTopic,
+    )
+
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+
+    def insert(table, rows):
+        with engine.begin() as conn:
+            for i in range(0, len(rows), BATCH):
+                conn.execute(table.insert(), rows[i:i + BATCH])
+
+    insert(User.__table__, [
+        {"id": u, "username": f"plan-{u}", "password": "x", "rating": 30}
+        for u in range(1, users + 1)
+    ])
+    insert(UserTopicRating.__table__, [
+        {"user_id": u, "topic": t, "rating": 0, "problems_solved": 1, "problems_attempted": 1}
+        for u in range(1, users + 1) for t in TOPICS
+    ])
+    insert(WeakTopic.__table__, [
+        {"user_id": u, "topic": rng.choice(TOPICS), "is_active": True}
+        for u in range(1, users + 1)
+    ])
+
+    contest_id = 0
+    rows, problem_rows, history_rows = [], [], []
+    # (user, problem) pairs already in history, as the unique index requires
+    seen = set()
+    for c in range(contests):
+        contest_id += 1
+        user_id = c % users + 1
+        active = c >= contests - users
+        started = start + timedelta(minutes=c)
+        rows.append({
+            "id": contest_id,
+            "user_id": user_id,
+            "status": ContestStatus.ACTIVE if active else rng.choice(
+                [ContestStatus.COMPLETED, ContestStatus.ABANDONED]
+            ),
+            "rating_at_start": 30,
+            "num_problems": per_contest,
+            "target_difficulty": 30,
+            "started_at": started,
+            "ended_at": None if active else started + timedelta(minutes=90),
+            "problems_solved": 0,
+        })
+        for p in range(per_contest):
+            ordinal = rng.randrange(100_000)
+            problem_id = f"p-{ordinal}"
+            problem_rows.append({
+                "contest_id": contest_id,
+                "problem_id": problem_id,
+                "problem_name": problem_id,
+                "topic": TOPICS[p % len(TOPICS)],
+                "difficulty": 30,
+                "source": "codeforces",
+                "status": SubmissionStatus.PENDING,
+            })
+            if user_id * 100_000 + ordinal not in seen:
+                seen.add(user_id * 100_000 + ordinal)
+                history_rows.append({
+                    "user_id": user_id, "problem_id": problem_id,
+                    "times_attempted": 1, "times_solved": 0,
+                })
+        if len(rows) >= BATCH:
+            insert(Contest.__table__, rows)
+            insert(ContestProblem.__table__, problem_rows)
+            insert(ProblemHistory.__table__, history_rows)
+            rows, problem_rows, history_rows = [], [], []
+    insert(Contest.__table__, rows)
+    insert(ContestProblem.__table__, problem_rows)
+    insert(ProblemHistory.__table__, history_rows)
+
+
+def plan(conn, statement) -> str:
+    """The query plan for ``statement`` as text the index names can be found in."""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "postgresql":
+        result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        return json.dumps(result)
+    return "\n".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contests", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--problems-per-contest", type=int, default=4)
+    parser.add_argument("--database-url", help="empty database to build the dataset in")
+    args = parser.parse_args()
+
+    # The app's database module reads this at import time
+    os.environ["DATABASE_URL"] = args.database_url or (
+        f"sqlite:///{tempfile.mkdtemp()}/plans.db"
+    )
+    from sqlalchemy import text, tuple_
+    from sqlalchemy.orm import Session, joinedload, noload
+
+    from app.database import Base, engine
+    from app.migrations import run_migrations
+    from app.models import (
+        Contest,
+        ContestProblem,
+        ContestStatus,
+        ProblemHistory,
+        ProblemReflection,
+        UserStats,
+        UserTopicRating,
+        WeakTopic,
+    )
+
+    db = Session(bind=engine)
+    user_id = args.users // 2
+    # (name, query as the routes build it, indexes its plan must use; a
+    # tuple means any one of them)
+    checks = [
+        (
+            "active contest",
+            db.query(Contest)
+            .options(joinedload(Contest.problems))
+            .filter(Contest.user_id == user_id, Contest.status == ContestStatus.ACTIVE),
+            ["ix_contests_user_id_status", "ix_contest_problems_contest_id_problem_id"],
+        ),
+        (
+            "contest problem",
+            db.query(ContestProblem).filter(
+                ContestProblem.contest_id == 12345, ContestProblem.problem_id == "p-1"
+            ),
+            ["ix_contest_problems_contest_id_problem_id"],
+        ),
+        (
+            "history page",
+            db.query(Contest)
+            .options(noload(Contest.problems))
+            .filter(
+                Contest.user_id == user_id,
+                Contest.status.in_([ContestStatus.COMPLETED, ContestStatus.ABANDONED]),
+                tuple_(Contest.ended_at, Contest.id) < tuple_(datetime(2025, 1, 1), 10**9),
+            )
+            .order_by(Contest.ended_at.desc(), Contest.id.desc())
+            .limit(21),
+            ["ix_contests_user_id_ended_at_id"],
+        ),
+        (
+            "contest list page",
+            db.query(Contest)
+            .options(noload(Contest.problems))
+            .filter(
+                Contest.user_id == user_id,
+                tuple_(Contest.started_at, Contest.id) < tuple_(datetime(2025, 1, 1), 10**9),
+            )
+            .order_by(Contest.started_at.desc(), Contest.id.desc())
+            .limit(21),
+            ["ix_contests_user_id_started_at_id"],
+        ),
+        (
+            "user stats",
+            # History and profile totals come from the rollup row
+            db.query(UserStats).filter(UserStats.user_id == user_id),
+            [PRIMARY_KEY],
+        ),
+        (
+            "contest count",
+            db.query(Contest.id).filter(Contest.user_id == user_id),
+            # Any index leading with user_id serves it
+            [("ix_contests_user_id_status", "ix_contests_user_id_ended_at_id",
+              "ix_contests_user_id_started_at_id")],
+        ),
+        (
+            "topic stats",
+            db.query(UserTopicRating).filter(UserTopicRating.user_id == user_id),
+            ["uq_user_topic_ratings_user_id_topic"],
+        ),
+        (
+            "seen set rebuild",
+            db.query(ProblemHistory.problem_id).filter(ProblemHistory.user_id == user_id),
+            ["uq_problem_history_user_id_problem_id"],
+        ),
+        (
+            "weak topics",
+            db.query(WeakTopic.topic).filter(
+                WeakTopic.user_id == user_id, WeakTopic.is_active.is_(True)
+            ),
+            ["ix_weak_topics_user_id_is_active"],
+        ),
+        (
+            "reflections",
+            db.query(ProblemReflection).filter(
+                ProblemReflection.contest_problem_id.in_([1, 2, 3, 4])
+            ),
+            ["ix_problem_reflections_contest_problem_id"],
+        ),
+    ]
+
+    # Start from the pre-migration schema so the migrations build the indexes
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for name in sorted({
+            index
+            for _, _, indexes in checks
+            for option in indexes
+            if option is not PRIMARY_KEY
+            for index in ((option,) if isinstance(option, str) else option)
+        }):
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        conn.execute(text("DELETE FROM schema_migrations"))
+
+    print(f"Loading {args.contests:,} contests for {args.users:,} users "
+          f"into {engine.dialect.name}...")
+    t0 = time.perf_counter()
+    load_dataset(engine, args.users, args.contests, args.problems_per_contest)
+    print(f"  loaded in {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    applied = run_migrations(engine)
+    print(f"  migrations {applied} applied in {time.perf_counter() - t0:.1f}s")
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    # Fresh connections, so none plans against a schema cached before the migrations
+    engine.dispose()
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, query, indexes in checks:
+            text_plan = plan(conn, query.statement)
+            missing = [
+                option if isinstance(option, str) else " or ".join(option)
+                for option in indexes
+                if not any(
+                    index in text_plan
+                    for index in ((option,) if isinstance(option, str) else option)
+                )
+            ]
+            t0 = time.perf_counter()
+            query.with_session(Session(bind=conn)).all()
+            elapsed = (time.perf_counter() - t0) * 1000
+            status = "ok  " if not missing else "FAIL"
+            print(f"  {status} {name:<18} {elapsed:8.2f} ms")
+            if missing:
+                failures += 1
+                print(f"       missing {', '.join(missing)}; plan:")
+                for line in text_plan.splitlines():
+                    print(f"         {line}")
+    db.close()
+
+    if failures:
+        print(f"{failures} quer{'y' if failures == 1 else 'ies'} not using their index")
+        sys.exit(1)
+    print("All queries use their indexes")
+
+
+if __name__ == "__main__":
+    main()
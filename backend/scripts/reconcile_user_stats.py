@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Rebuild every user's user_stats rollup from the source tables.
+
+The routes keep user_stats in step with contests and user_topic_ratings
+transactionally, so this should find nothing to fix; run it after manual
+data changes, a restore, or to check for drift. It also stores the row of
+any user who has none, whose stats the routes otherwise recompute on every
+read. Users are processed in batches of --batch-size, each committed on its
+own. Reports how many rows differed from the recomputed values.
+
+Usage:
+    python scripts/reconcile_user_stats.py
+    python scripts/reconcile_user_stats.py --batch-size 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services.user_stats import (  # noqa: E402
+    REBUILD_BATCH_SIZE,
+    rebuild_user_stats,
+    user_id_batches,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    users = drifted = 0
+    db = SessionLocal()
+    try:
+        for user_ids in user_id_batches(db, args.batch_size):
+            drifted += rebuild_user_stats(db, user_ids)
+            db.commit()
+            users += len(user_ids)
+    finally:
+        db.close()
+
+    print(f"Rebuilt user_stats for {users} users in {time.perf_counter() - t0:.1f}s; "
+          f"{drifted} had drifted")
+
+
+if __name__ == "__main__":
+    main()
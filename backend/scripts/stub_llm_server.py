@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini generateContent API.
+
+Answers POST /{api_version}/models/{model}:generateContent after a
+configurable delay, so LLM latency handling can be exercised offline.
+Prompts that ask for JSON get a traits/title object (or, for reflection
+prompts, a brief or reflection object), everything else a short contest
+title; batch prompts ("a JSON array of N ...") get a JSON array of N
+titles or trait sets. Point the backend at it with:
+
+    GEMINI_BASE_URL=http://127.0.0.1:8089 GEMINI_API_KEY=stub uvicorn app.main:app
+
+Usage:
+    python scripts/stub_llm_server.py --port 8089 --latency 2.0 --jitter 0.5
+    python scripts/stub_llm_server.py --fail-rate 0.2
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TITLES = [
+    "Siege of the Segment Tree",
+    "The Greedy Lich Awakens",
+    "Trial of the Endless Graph",
+    "Rise of the Modular Hydra",
+]
+TRAITS = ["Binary Sage", "Loop Breaker", "Greedy Tactician", "Graph Walker"]
+BRIEF = {
+    "key_insight": "Sort first; the answer is then a single sweep.",
+    "master_approach": "Sort the input and sweep once, keeping a running best. O(n log n).",
+}
+REFLECTION = {
+    "pivot_sentence": "Sorting first turns the pairwise search into one pass.",
+    "tips": "Look for an order that makes the check monotone.",
+    "what_to_improve": "Recognizing sort-then-sweep problems.",
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    jitter = 0.0
+    fail_rate = 0.0
+    calls = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if ":generateContent" not in self.path:
+            self.send_error(404)
+            return
+
+        StubHandler.calls += 1
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        if random.random() < self.fail_rate:
+            self._reply(503, {"error": {"code": 503, "message": "stub overloaded"}})
+            return
+
+        prompt = json.dumps(json.loads(body or b"{}"))
+        batch = re.search(r"a JSON array of (\d+) (strings|objects)", prompt)
+        if batch:
+            count, kind = int(batch.group(1)), batch.group(2)
+            make = self._title if kind == "strings" else self._traits
+            text = json.dumps([make() for _ in range(count)])
+        elif "pivot_sentence" in prompt:
+            text = json.dumps(REFLECTION)
+        elif "master_approach" in prompt:
+            text = json.dumps(BRIEF)
+        elif "JSON" in prompt:
+            text = json.dumps(self._traits())
+        else:
+            text = self._title()
+        self._reply(
+            200,
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": text}]},
+                        "finishReason": "STOP",
+                    }
+                ],
+                # Roughly four characters per token, like the real tokenizer
+                "usageMetadata": {
+                    "promptTokenCount": len(prompt) // 4,
+                    "candidatesTokenCount": len(text) // 4,
+                    "totalTokenCount": (len(prompt) + len(text)) // 4,
+                },
+            },
+        )
+
+    @staticmethod
+    def _title() -> str:
+        return random.choice(TITLES)
+
+    @staticmethod
+    def _traits() -> dict:
+        return {"traits": random.sample(TRAITS, 2), "title": random.choice(TITLES)}
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=2.0, help="seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.jitter = args.jitter
+    StubHandler.fail_rate = args.fail_rate
+
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Stub LLM listening on http://{args.host}:{args.port} "
+          f"(latency {args.latency}s +/- {args.jitter}s, fail rate {args.fail_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
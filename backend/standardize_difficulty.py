@@ -32,6 +32,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from app.services.problem_catalog import ProblemCatalog
+
 # =============================================================================
 # CONFIGURATION - EDIT THESE TO TUNE MAPPINGS
 # =============================================================================
@@ -875,6 +877,13 @@ def main():
     print(f"Saved: {output_path}")
     print(f"File size: {os.path.getsize(output_path) / (1024*1024):.2f} MB")
 
+    # Binary catalog mapped by the API workers at startup (no JSON parsing)
+    catalog_path = os.path.join(output_dir, "standardized_problems.bin")
+    ProblemCatalog.from_problems(output_data["problems"]).save(catalog_path)
+
+    print(f"Saved: {catalog_path}")
+    print(f"File size: {os.path.getsize(catalog_path) / (1024*1024):.2f} MB")
+
     print("\n" + "=" * 60)
     print("Done!")
     print("=" * 60)
@@ -1,9 +1,9 @@
 """
 Test script for the reflection service.
-Tests Gemini as primary, Groq as backup, and OpenRouter as last fallback.
+Runs one reflection through Gemini, or through the local stub server when
+GEMINI_BASE_URL points at scripts/stub_llm_server.py.
 """
 
-import asyncio
 import os
 
 from dotenv import load_dotenv
@@ -13,37 +13,38 @@ load_dotenv()
 
 # Check API keys
 gemini_key = os.getenv("GEMINI_API_KEY")
-groq_key = os.getenv("GROQ_API_KEY")
-openrouter_key = os.getenv("API_KEY")
+gemini_base_url = os.getenv("GEMINI_BASE_URL")
 
 print("=" * 60)
 print("API Key Status:")
-print(f"  GEMINI_API_KEY: {'✓ Set' if gemini_key else '✗ Not set'} (Primary)")
-print(f"  GROQ_API_KEY: {'✓ Set' if groq_key else '✗ Not set'} (Backup)")
-print(
-    f"  API_KEY (OpenRouter): {'✓ Set' if openrouter_key else '✗ Not set'} (Last Fallback)"
-)
+print(f"  GEMINI_API_KEY: {'✓ Set' if gemini_key else '✗ Not set'}")
+print(f"  GEMINI_BASE_URL: {gemini_base_url or 'default (Gemini API)'}")
 print("=" * 60)
 
 
-async def test_reflection():
+def test_reflection():
     """Test the reflection service with a mock problem."""
-    from app.services.openrouter_service import generate_reflection
+    from app.services.contest_generator import GEMINI_MODEL, contest_generator
+    from app.services.reflections import build_brief, build_reflection
 
     # Mock problem data
     mock_problem = {
+        "problem_id": "two-sum",
         "problem_name": "Two Sum",
         "problem_url": "https://leetcode.com/problems/two-sum/",
         "topic": "hash_map",
         "difficulty": 25,
+    }
+    mock_attempt = {
         "solved": False,
-        "partial": True,
         "time_taken_seconds": 1200,  # 20 minutes
-        "editorial_text": "Use a hash map to store seen numbers. For each number, check if target - num exists in the map.",
-        "editorial_url": None,
         "user_approach": "I tried using two nested loops to check all pairs, but it was too slow for large inputs. I knew there had to be a better way but couldn't think of using a hash map.",
         "user_rating": 30,
     }
+    editorial = (
+        "Use a hash map to store seen numbers. For each number, check if target - num exists in the map.",
+        None,
+    )
 
     print("\n" + "=" * 60)
     print("Testing Reflection Generation")
@@ -51,25 +52,19 @@ async def test_reflection():
     print(f"\nProblem: {mock_problem['problem_name']}")
     print(f"Topic: {mock_problem['topic']}")
     print(f"Difficulty: {mock_problem['difficulty']}/100")
-    print(f"Solved: {mock_problem['solved']}")
-    print(f"Partial: {mock_problem['partial']}")
-    print(f"Time: {mock_problem['time_taken_seconds'] // 60} minutes")
+    print(f"Solved: {mock_attempt['solved']}")
+    print(f"Time: {mock_attempt['time_taken_seconds'] // 60} minutes")
     print("\nGenerating reflection...")
     print("-" * 60)
 
-    result = await generate_reflection(
-        problem_name=mock_problem["problem_name"],
-        problem_url=mock_problem["problem_url"],
-        topic=mock_problem["topic"],
-        difficulty=mock_problem["difficulty"],
-        solved=mock_problem["solved"],
-        partial=mock_problem["partial"],
-        time_taken_seconds=mock_problem["time_taken_seconds"],
-        editorial_text=mock_problem["editorial_text"],
-        editorial_url=mock_problem["editorial_url"],
-        user_approach=mock_problem["user_approach"],
-        user_rating=mock_problem["user_rating"],
-    )
+    try:
+        brief = build_brief(mock_problem, contest_generator.generate_text, editorial)
+        fields, _ = build_reflection(
+            mock_problem, mock_attempt, brief, contest_generator.generate_text
+        )
+        result = {**brief, **fields, "model_used": GEMINI_MODEL}
+    except Exception as e:
+        result = {"error": str(e)}
 
     print("\n" + "=" * 60)
     print("RESULT")
@@ -101,12 +96,12 @@ async def test_reflection():
 
 
 if __name__ == "__main__":
-    if not gemini_key and not groq_key and not openrouter_key:
-        print("\n❌ No API keys configured!")
-        print("Please set GEMINI_API_KEY, GROQ_API_KEY, or API_KEY in your .env file")
+    if not gemini_key:
+        print("\n❌ No API key configured!")
+        print("Please set GEMINI_API_KEY in your .env file")
         exit(1)
 
-    result = asyncio.run(test_reflection())
+    result = test_reflection()
 
     # Exit with error code if failed
     if result.get("error"):
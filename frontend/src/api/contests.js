@@ -25,13 +25,19 @@ export const abandonContest = async () => {
   return response.data;
 };
 
-export const getContestHistory = async () => {
-  const response = await api.get('/api/contests/history');
+// Newest first; pass the previous page's nextCursor as cursor for more
+export const getContestHistory = async ({ limit, cursor } = {}) => {
+  const response = await api.get('/api/contests/history', {
+    params: { limit, cursor },
+  });
   return response.data;
 };
 
 export const getUserProfile = async () => {
-  const response = await api.get('/api/contests/profile');
+  // activeContest is read from /active; skip building it here
+  const response = await api.get('/api/contests/profile', {
+    params: { include_active: false },
+  });
   return response.data;
 };
 
@@ -39,3 +45,8 @@ export const getContest = async (contestId) => {
   const response = await api.get(`/api/contests/${contestId}`);
   return response.data;
 };
+
+export const getContestRewards = async (contestId) => {
+  const response = await api.get(`/api/contests/${contestId}/rewards`);
+  return response.data;
+};
@@ -13,6 +13,7 @@ const LevelSelectionPage = () => {
   const { user, refreshUser } = useAuth();
   const navigate = useNavigate();
   const [history, setHistory] = useState([]);
+  const [totals, setTotals] = useState({ total: 0, successfulContests: 0 });
   const [loading, setLoading] = useState(true);
   const [generating, setGenerating] = useState(false);
 
@@ -22,8 +23,12 @@ const LevelSelectionPage = () => {
 
   const loadData = async () => {
     try {
-      const historyData = await getContestHistory();
+      const historyData = await getContestHistory({ limit: 10 });
       setHistory(historyData.history || []);
+      setTotals({
+        total: historyData.total || 0,
+        successfulContests: historyData.successfulContests || 0,
+      });
     } catch (error) {
       console.error("Failed to load history:", error);
     } finally {
@@ -60,10 +65,8 @@ const LevelSelectionPage = () => {
     navigate("/");
   };
 
-  const totalContests = history.length;
-  const successfulContests = history.filter(
-    (c) => c.status === "completed" && c.solvedCount === c.totalQuestions,
-  ).length;
+  const totalContests = totals.total;
+  const successfulContests = totals.successfulContests;
 
   const statCards = [
     {
@@ -289,9 +292,9 @@ const LevelSelectionPage = () => {
         >
           <div className="flex items-center justify-between mb-4">
             <h2 className="text-lg font-semibold">History</h2>
-            {history.length > 0 && (
+            {totalContests > 0 && (
               <span className="text-sm text-text-muted">
-                {history.length} contest{history.length !== 1 ? "s" : ""}
+                {totalContests} contest{totalContests !== 1 ? "s" : ""}
               </span>
             )}
           </div>
@@ -315,7 +318,7 @@ const LevelSelectionPage = () => {
             </div>
           ) : (
             <div className="space-y-2">
-              {history.slice(0, 10).map((contest, index) => {
+              {history.map((contest, index) => {
                 const isFullSolve =
                   contest.solvedCount === contest.totalQuestions;
                 const ratingChange =
@@ -394,9 +397,9 @@ const LevelSelectionPage = () => {
                 );
               })}
 
-              {history.length > 10 && (
+              {totalContests > history.length && (
                 <p className="text-center text-xs text-text-muted py-4">
-                  Showing 10 of {history.length} contests
+                  Showing {history.length} of {totalContests} contests
                 </p>
               )}
             </div>
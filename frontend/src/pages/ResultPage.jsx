@@ -1,12 +1,55 @@
+import { useEffect, useState } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import { useAuth } from '../context/AuthContext';
+import { getContestRewards } from '../api/contests';
+
+// Traits/title are generated in the background after /complete
+const REWARDS_POLL_MS = 1000;
+const REWARDS_MAX_POLLS = 30;
 
 const ResultPage = () => {
   const location = useLocation();
   const navigate = useNavigate();
   const { user } = useAuth();
   const result = location.state?.result;
+  const [rewards, setRewards] = useState({
+    status: result?.rewardsStatus,
+    newTraits: result?.newTraits || [],
+    newTitle: result?.newTitle || null,
+  });
+
+  useEffect(() => {
+    if (result?.rewardsStatus !== 'pending') return;
+    let cancelled = false;
+    let polls = 0;
+    let timer;
+
+    const poll = async () => {
+      try {
+        const data = await getContestRewards(result.contestId);
+        if (cancelled) return;
+        if (data.status !== 'pending') {
+          setRewards(data);
+          return;
+        }
+      } catch (err) {
+        console.error('Failed to fetch rewards:', err);
+      }
+      if (cancelled) return;
+      if (++polls < REWARDS_MAX_POLLS) {
+        timer = setTimeout(poll, REWARDS_POLL_MS);
+      } else {
+        setRewards((r) => ({ ...r, status: 'failed' }));
+      }
+    };
+
+    timer = setTimeout(poll, REWARDS_POLL_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [result]);
 
   if (!result) {
     navigate('/levels');
@@ -133,21 +176,23 @@ const ResultPage = () => {
             <div className="flex flex-col gap-4 p-8 border border-zinc-800 bg-zinc-900/50 rounded-lg text-left">
               <div className="flex items-center justify-between">
                 <span className="text-[10px] font-bold uppercase tracking-widest text-zinc-500">
-                  {result.newTitle ? 'Designation' : 'Abilities'}
+                  {rewards.newTitle ? 'Designation' : 'Abilities'}
                 </span>
                 <span className="material-symbols-outlined text-sm opacity-40">
-                  {result.newTitle ? 'verified_user' : 'psychology'}
+                  {rewards.newTitle ? 'verified_user' : 'psychology'}
                 </span>
               </div>
               <div>
                 <p className="text-xs text-zinc-500 uppercase font-bold">
-                  {result.newTitle ? 'New Title' : 'New Traits'}
+                  {rewards.newTitle ? 'New Title' : 'New Traits'}
                 </p>
-                {result.newTitle ? (
-                  <p className="text-2xl font-black mt-1 leading-tight">{result.newTitle}</p>
-                ) : result.newTraits?.length > 0 ? (
+                {rewards.status === 'pending' ? (
+                  <p className="text-lg font-bold mt-1 text-zinc-500 animate-pulse">Forging rewards...</p>
+                ) : rewards.newTitle ? (
+                  <p className="text-2xl font-black mt-1 leading-tight">{rewards.newTitle}</p>
+                ) : rewards.newTraits?.length > 0 ? (
                   <div className="flex flex-wrap gap-2 mt-2">
-                    {result.newTraits.map((trait, i) => (
+                    {rewards.newTraits.map((trait, i) => (
                       <span key={i} className="px-2 py-1 bg-white/10 rounded text-sm font-bold">
                         {trait}
                       </span>